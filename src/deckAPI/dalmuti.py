@@ -0,0 +1,85 @@
+from itertools import count
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
+
+from the_great_dalmuti.table import Table
+
+router = APIRouter(prefix="/dalmuti")
+
+tables: dict[int, Table] = {}
+table_ids = count(1)
+
+
+class NewTable(BaseModel):
+    num_players: int = 4
+    num_games: int = 1
+    turn_timeout: float | None = 60
+
+    def to_json(self):
+        return {
+            "num_players": self.num_players,
+            "num_games": self.num_games,
+            "turn_timeout": self.turn_timeout,
+        }
+
+
+def table_info(table_id: int, table: Table):
+    return {
+        "table_id": table_id,
+        "players": [player.name for player in table.players if player is not None],
+        "num_players": table.num_players,
+        "started": table.started,
+        "finished": table.finished,
+    }
+
+
+@router.post("/tables")
+async def new_table(settings: NewTable):
+    if not 3 <= settings.num_players <= 8 or settings.num_games < 1:
+        raise HTTPException(status_code=400, detail="Tables have 3 to 8 players and play at least one game.")
+    # forget the tables that are done playing
+    for table_id in [table_id for table_id, table in tables.items() if table.finished]:
+        del tables[table_id]
+    table_id = next(table_ids)
+    tables[table_id] = Table(**settings.to_json())
+    return table_info(table_id, tables[table_id])
+
+
+@router.get("/tables")
+async def list_tables():
+    return [table_info(table_id, table) for table_id, table in tables.items()]
+
+
+@router.websocket("/tables/{table_id}/ws")
+async def play(websocket: WebSocket, table_id: int, name: str):
+    """
+    Seats `name` at the table. Clients send {"type": "start"} to fill the empty seats with bots and start the table,
+    and answer "give" and "turn" messages with {"cards": [...]}.
+    """
+    await websocket.accept()
+    table = tables.get(table_id)
+    if table is None:
+        await websocket.close(code=4404, reason="No such table.")
+        return
+    try:
+        player = table.join(name, websocket.send_json)
+    except ValueError as error:
+        await websocket.close(code=4400, reason=str(error))
+        return
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "message": "Messages must be JSON objects."})
+                continue
+            try:
+                if message.get("type") == "start":
+                    table.start()
+                else:
+                    table.submit(player, message)
+            except ValueError as error:
+                await websocket.send_json({"type": "error", "message": str(error)})
+    except WebSocketDisconnect:
+        table.leave(player)
@@ -3,7 +3,11 @@ from fastapi import FastAPI
 from pydantic import BaseModel
 import json
 
+# the app is served from src/deckAPI (`fastapi dev main.py`), so its routers are imported as top-level modules
+from dalmuti import router as dalmuti_router
+
 app = FastAPI()
+app.include_router(dalmuti_router)
 
 class Deck(BaseModel):
     deck: list[str]
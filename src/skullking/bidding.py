@@ -0,0 +1,184 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from skullking.cards import Card, card_numbers, card_suits, colors, deck
+from skullking.game import Game
+from skullking.player import CPU
+
+# the suits that only differ by name, black being trump
+PLAIN_SUITS = tuple(suit for suit, color in enumerate(colors) if color != 'black')
+
+
+def canonical_hand(hand: List[Card]) -> Tuple[int, ...]:
+    """
+    Key of a hand that is the same for every hand that plays the same way.
+
+    Args:
+        hand (List[Card]): Cards of the player
+
+    Returns:
+        Tuple[int, ...]: Sorted card ids, with the plain suits renamed so their cards come in a fixed order
+    """
+    by_suit = {suit: [] for suit in PLAIN_SUITS}
+    ids = []
+    for card in hand:
+        suit = card_suits[card.id]
+        if suit in by_suit:
+            by_suit[suit].append(card_numbers[card.id])
+        else:
+            ids.append(card.id)
+    # the suit with the most (then highest) cards is renamed to the first plain suit, and so on
+    groups = sorted((sorted(numbers, reverse=True) for numbers in by_suit.values()), key=lambda numbers: (-len(numbers), [-n for n in numbers]))
+    for suit, numbers in zip(PLAIN_SUITS, groups):
+        ids.extend(Card(f'{colors[suit]}-{number}').id for number in numbers)
+    return tuple(sorted(ids))
+
+
+def rollout(hand: List[Card], unseen: List[Card], number_of_players: int) -> int:
+    """
+    Deal the unseen cards at random to the other players and play the round out with `CPU` players.
+
+    Args:
+        hand (List[Card]): Cards of the player
+        unseen (List[Card]): Cards the other players may hold, shuffled in place
+        number_of_players (int): Number of players, the player sits in a random seat
+
+    Returns:
+        int: Number of tricks won by the player
+    """
+    random.shuffle(unseen)
+    seat = random.randrange(number_of_players)
+    num_cards = len(hand)
+    players = {}
+    dealt = 0
+    for s in range(number_of_players):
+        if s == seat:
+            cards = list(hand)
+        else:
+            cards = unseen[dealt:dealt + num_cards]
+            dealt += num_cards
+        players[str(s)] = CPU(str(s), cards)
+    game = Game(deck, players)
+    game.round = num_cards
+    tricks_won = 0
+    for _ in range(num_cards):
+        game.trump = ''
+        tricks_won += game.play_trick() == str(seat)
+    return tricks_won
+
+
+def rollout_tricks(hand: List[Card], number_of_players: int, rollouts: int | None, time_limit: float | None, seed: int) -> List[int]:
+    """
+    Roll a round out until the budget is spent, at least once.
+
+    Args:
+        hand (List[Card]): Cards of the player
+        number_of_players (int): Number of players
+        rollouts (int | None): Number of rollouts, None for as many as fit in the time limit
+        time_limit (float | None): Seconds to roll out for, None for no limit
+        seed (int): Seed of the rollouts
+
+    Returns:
+        List[int]: How many rollouts the player won t tricks in, for t from 0 to the size of the hand
+
+    The rollouts play with the global `random` functions like `CPU` does, so its state is put back afterwards
+    and the game the player sits in is not disturbed.
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        unseen = list(deck)
+        for card in hand:
+            unseen.remove(card)
+        counts = [0] * (len(hand) + 1)
+        deadline = time.perf_counter() + time_limit if time_limit else math.inf
+        done = 0
+        while not done or ((rollouts is None or done < rollouts) and time.perf_counter() < deadline):
+            counts[rollout(hand, unseen, number_of_players)] += 1
+            done += 1
+        return counts
+    finally:
+        random.setstate(state)
+
+
+def best_bet(counts: List[int], round_number: int) -> int:
+    """
+    The bet with the best expected score given how often each number of tricks was won.
+    """
+    return max(range(len(counts)), key=lambda bet: sum(count * Game.round_score(bet, tricks, round_number) for tricks, count in enumerate(counts)))
+
+
+class RolloutCPU(CPU):
+    def __init__(
+        self,
+        name: str,
+        cards: list[Card] | None = None,
+        rollouts: int | None = 200,
+        time_limit: float | None = None,
+        workers: int = 1,
+        max_entries: int = 100_000,
+        seed: int | None = None,
+    ) -> None:
+        """
+        A `CPU` player that bets by rolling the round out against random hands of the unseen cards.
+
+        Args:
+            name (str): Player's name
+            cards (list[Card], optional): Initial hand of cards. Defaults to empty list.
+            rollouts (int | None, optional): Rollouts per process and bet, None for as many as fit in the time limit. Defaults to 200.
+            time_limit (float | None, optional): Seconds per bet. Defaults to no limit.
+            workers (int, optional): Processes rolling out, above 1 the extra ones run on a pool until `close`. Defaults to 1.
+            max_entries (int, optional): Hands kept in the cache, it starts over when full. Defaults to 100,000.
+            seed (int | None, optional): Seed of the rollouts. Defaults to a random seed.
+
+        The trick counts of every hand are cached by `canonical_hand` and number of players, so a hand that comes
+        back is bet on without rolling out. The player's position at the table is not known when betting,
+        so the rollouts seat the player at random.
+        """
+        super().__init__(name, cards)
+        self.rollouts = rollouts
+        self.time_limit = time_limit
+        self.workers = workers
+        self.max_entries = max_entries
+        self._rng = random.Random(seed)
+        self._executor: ProcessPoolExecutor | None = None
+        self._cache: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def trick_counts(self, number_of_players: int) -> List[int]:
+        """
+        How many rollouts the hand won each number of tricks in, from the cache when the hand was seen before.
+        """
+        key = (number_of_players, canonical_hand(self.cards))
+        counts = self._cache.get(key)
+        if counts is None:
+            hand = list(self.cards)
+            futures = []
+            if self.workers > 1:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+                futures = [
+                    self._executor.submit(rollout_tricks, hand, number_of_players, self.rollouts, self.time_limit, self._rng.randrange(2 ** 32))
+                    for _ in range(self.workers - 1)
+                ]
+            counts = rollout_tricks(hand, number_of_players, self.rollouts, self.time_limit, self._rng.randrange(2 ** 32))
+            for future in futures:
+                counts = [a + b for a, b in zip(counts, future.result())]
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+            self._cache[key] = counts
+        return counts
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def bet(self, number_of_players: int) -> int:
+        counts = self.trick_counts(number_of_players)
+        bet = best_bet(counts, len(self.cards))
+        self.current_bet = bet
+        return bet
+
@@ -1,30 +1,66 @@
 from itertools import product
-from typing import Self, List
+from typing import Dict, Self, List, Tuple
 
 card_value_dict = {
     'skullking':17,
     'pirate': 16,
     'mermaid': 15,
 }
+
+# the interned cards by value, filled in below once the cards of the game are made
+_interned: Dict[str, 'Card'] = {}
+
+
 class Card(str):
+    """
+    A Skull King card, written as its color and number ("black-14") or the name of a special card ("pirate").
+
+    Cards are flyweights: the 63 kinds of cards of the game are made once, and `Card(value)` returns the same instance
+    for the same value instead of parsing the string again. Each of them knows its `id`, the index of the kind in
+    `available_cards`, which the card tables below are indexed by. Other values are parsed every time and have an `id` of -1.
+    """
     color: str
     number: int
+    id: int
 
     def __new__(cls, value: str) -> Self:
+        card = _interned.get(value)
+        if card is not None:
+            return card  # type: ignore
         obj = str.__new__(cls, value)
         color, *number = obj.split('-')
         number = ''.join(number)
         obj.color = color
         obj.number = int(number) if number else (card_value_dict[color] if color in card_value_dict else 0)
+        obj.id = -1
         return obj
 
-    def __init__(self, *args, **kwargs) -> None:
-        self.color = self.color
-        self.number = self.number
-
 
 colors = 'black', 'yellow', 'green', 'purple'
 numbers = tuple(range(14,0, -1))
+available_cards = ['skullking', 'pirate', 'mermaid', 'tigress'] + ['-'.join([color, str(number)]) for color, number in product(colors, numbers)] + ['pass', 'white_whale', 'kraken']
+available_cards = [Card(card) for card in available_cards]
+for card_id, card in enumerate(available_cards):
+    card.id = card_id
+    _interned[card] = card
+_interned[''] = Card('')
+deckDict = dict(zip(available_cards, range(len(available_cards))))
+
+# card tables indexed by card id
+cards_by_id: Tuple[Card, ...] = tuple(available_cards)
+card_colors: Tuple[str, ...] = tuple(card.color for card in available_cards)
+card_numbers: Tuple[int, ...] = tuple(card.number for card in available_cards)
+# the index of the suit in `colors` for numbered cards, -1 for special cards
+card_suits: Tuple[int, ...] = tuple(colors.index(card.color) if card.color in colors else -1 for card in available_cards)
+
+SKULLKING = Card('skullking')
+PIRATE = Card('pirate')
+MERMAID = Card('mermaid')
+TIGRESS = Card('tigress')
+PASS = Card('pass')
+WHITE_WHALE = Card('white_whale')
+KRAKEN = Card('kraken')
+
 winning_special = ['skullking'] + ['pirate']*5 + ['mermaid']*2 + ['tigress']
 winning_special = [Card(card) for card in winning_special]
 lossing_special = ['pass']*5+ ['white_whale'] + ['kraken'] + ['tigress']
@@ -34,9 +70,6 @@ special = winning_special + lossing_special
 special.remove(Card('tigress'))
 deck = special + ['-'.join([color, str(number)]) for color, number in product(colors, numbers)]
 deck = [Card(card) for card in deck]
-available_cards = ['skullking', 'pirate', 'mermaid', 'tigress'] + ['-'.join([color, str(number)]) for color, number in product(colors, numbers)] + ['pass', 'white_whale', 'kraken']
-available_cards = [Card(card) for card in available_cards]
-deckDict = dict(zip(available_cards, range(len(available_cards))))
 
 
 # num2card = {0: 'skullking-',1: 'pirate-',2: 'mermaid-',3: 'tigress-',4: 'black-14',5: 'black-13',6: 'black-12',7: 'black-11',8: 'black-10',9: 'black-9',10: 'black-8',11: 'black-7',12: 'black-6',13: 'black-5',14: 'black-4',15: 'black-3',16: 'black-2',17: 'black-1',18: 'yellow-14',19: 'yellow-13',20: 'yellow-12',21: 'yellow-11',22: 'yellow-10',23: 'yellow-9',24: 'yellow-8',25: 'yellow-7',26: 'yellow-6',27: 'yellow-5',28: 'yellow-4',29: 'yellow-3',30: 'yellow-2',31: 'yellow-1',32: 'green-14',33: 'green-13',34: 'green-12',35: 'green-11',36: 'green-10',37: 'green-9',38: 'green-8',39: 'green-7',40: 'green-6',41: 'green-5',42: 'green-4',43: 'green-3',44: 'green-2',45: 'green-1',46: 'purple-14',47: 'purple-13',48: 'purple-12',49: 'purple-11',50: 'purple-10',51: 'purple-9',52: 'purple-8',53: 'purple-7',54: 'purple-6',55: 'purple-5',56: 'purple-4',57: 'purple-3',58: 'purple-2',59: 'purple-1',60: 'pass-',61: 'white_whale-',62: 'kraken-',63: 'mermaid- (2)',64: 'pirate- (2)',65: 'pirate- (3)',66: 'pirate- (4)',67: 'pirate- (5)'}
@@ -0,0 +1,148 @@
+import time
+
+import click
+
+from skullking.bidding import RolloutCPU
+from skullking.ismcts import ISMCTS
+from skullking.player import CPU
+from skullking.simulate import run_simulation
+from skullking.tables import DEFAULT_PATH, MAX_ROUND, TableCPU, build_tables
+
+player_types = {
+    "cpu": CPU,
+    "rollout": RolloutCPU,
+    "table": TableCPU,
+    "ismcts": ISMCTS,
+}
+
+
+def parse_players(players, num_players):
+    """Turns 'name:type' definitions into (name, class) pairs. Without definitions, every player is a CPU."""
+    if not players:
+        return [(f"Player{i+1}", CPU) for i in range(num_players)]
+    player_defs = []
+    for player_def in players:
+        name, _, player_type = player_def.partition(":")
+        player_type = player_type.lower() or "cpu"
+        if player_type not in player_types:
+            raise click.BadParameter(f"Unknown player type {player_type}.", param_hint="'-p' / '--players'")
+        player_defs.append((name, player_types[player_type]))
+    return player_defs
+
+
+@click.group()
+def main():
+    """Skull King tools."""
+
+
+@main.command()
+@click.option(
+    "-n", "--num-players",
+    type=int,
+    default=4,
+    help="Number of CPU players when no player definitions are given (default: 4)."
+)
+@click.option(
+    "-p", "--players",
+    multiple=True,
+    help=f"Player definitions in format: name:type (e.g., 'Alice:cpu'). Type can be {', '.join(repr(name) for name in player_types)}."
+)
+@click.option(
+    "-g", "--num-games",
+    type=int,
+    default=10_000,
+    help="Number of games to play (default: 10000)."
+)
+@click.option(
+    "-o", "--output",
+    default="skullking.parquet",
+    help="File the rows of every player in every round are streamed to, Parquet or '.csv' (default: skullking.parquet)."
+)
+@click.option(
+    "-w", "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: one per CPU)."
+)
+@click.option(
+    "-c", "--chunk-size",
+    type=int,
+    default=100,
+    help="Games played by a worker before its results are written (default: 100)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=None,
+    help="Seed of the simulation, game g is played with seed + g (default: random)."
+)
+def simulate(num_players, players, num_games, output, workers, chunk_size, seed):
+    """Play many headless games in parallel and report scores, bet accuracy and special card frequencies."""
+    player_defs = parse_players(players, num_players)
+    names = [name for name, _ in player_defs]
+    if len(set(names)) != len(names):
+        raise click.BadParameter("Player names must be unique.", param_hint="'-p' / '--players'")
+    if not 2 <= len(names) <= 7:
+        raise click.BadParameter("Skull King is played by 2 to 7 players.", param_hint="'-p' / '--players'")
+
+    def show_progress(results, elapsed):
+        click.echo(f"\r{results.num_games}/{num_games} games ({results.num_games / elapsed:,.0f} games/sec)", nl=False)
+
+    try:
+        results, elapsed = run_simulation(player_defs, num_games, output, workers=workers, chunk_size=chunk_size, seed=seed, on_chunk=show_progress)
+    except ImportError as error:
+        raise click.BadParameter(str(error), param_hint="'-o' / '--output'")
+    click.echo()
+    click.echo(f"Played {results.num_games} games in {elapsed:.1f}s ({results.num_games / elapsed:,.0f} games/sec), rows written to {output}.")
+    click.echo("Final scores:")
+    for name in sorted(names, key=lambda name: -results.score_summary(name)["mean"]):
+        summary = results.score_summary(name)
+        click.echo(f"{name}: {summary['mean']:.1f} ± {summary['std']:.1f} | " + " | ".join(f"{key}: {summary[key]:.0f}" for key in ("min", "25%", "50%", "75%", "max")))
+    click.echo("Bets hit by round:")
+    for name in names:
+        click.echo(f"{name}: " + " ".join(f"{accuracy:.0%}" for accuracy in results.bet_accuracy(name)))
+    if results.num_tricks:
+        click.echo(
+            f"Kraken played in {results.krakens / results.num_tricks:.2%} of tricks, "
+            f"white whale in {results.white_whales / results.num_tricks:.2%}."
+        )
+
+
+@main.command()
+@click.option(
+    "-o", "--output",
+    default=DEFAULT_PATH,
+    help="File the tables are written to, where 'table' players look for them (default: trick_tables.npy in the skullking directory of the user's cache)."
+)
+@click.option(
+    "-r", "--rollouts",
+    type=int,
+    default=2_000,
+    help="Rounds played with every hand from every position and number of players (default: 2000)."
+)
+@click.option(
+    "-w", "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: one per CPU)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=0,
+    help="Seed of the simulation (default: 0)."
+)
+def tables(output, rollouts, workers, seed):
+    """Build the tables of trick probabilities that 'table' players bet with in the first rounds."""
+    start = time.perf_counter()
+
+    def show_progress(done, total):
+        click.echo(f"\r{done}/{total} tables", nl=False)
+
+    build_tables(output, rollouts=rollouts, workers=workers, seed=seed, on_table=show_progress)
+    click.echo()
+    click.echo(f"Simulated every hand of rounds 1 to {MAX_ROUND} in {time.perf_counter() - start:.1f}s, tables written to {output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from  pandas import DataFrame, Categorical
 from random import shuffle
-from skullking.cards import deck, Card
+from skullking.cards import deck, Card, WHITE_WHALE
+from skullking.trick import resolve_trick
 from numpy import array, nan
 from typing import *
 
@@ -12,12 +13,36 @@ class Game:
         self.trick = 1
         self.cards = deck
         self.playerDict = playerDict
-        self.number_of_players = len(self.playerNames)
         self.human_playing = human
+        self.last_trick: List[Card] = []
+
+    @property
+    def playerDict(self) -> Dict:
+        """
+        The players by name, in turn order starting with the player who plays first.
+        """
+        return {self.names[seat]: self.players[seat] for seat in self.orders[self.start]}
+
+    @playerDict.setter
+    def playerDict(self, playerDict: Dict) -> None:
+        """
+        Seat the players in the order of the dictionary, the first one playing first.
+
+        The seats never change: `players` and `names` are indexed by seat and the turn order is the seat order
+        rotated to start at seat `start`. `orders` holds every rotation, so moving the lead is a single assignment.
+        """
+        self.names: List[str] = list(playerDict)
+        self.players: List = list(playerDict.values())
+        self.seats: Dict[str, int] = {name: seat for seat, name in enumerate(self.names)}
+        self.number_of_players = len(self.players)
+        self.orders: List[Tuple[int, ...]] = [
+            tuple(range(start, self.number_of_players)) + tuple(range(start)) for start in range(self.number_of_players)
+        ]
+        self.start = 0
 
     @property
     def playerNames(self):
-        return list(self.playerDict.keys())
+        return [self.names[seat] for seat in self.orders[self.start]]
     
     def print_game(self, title: str, stats: Dict, message: str) -> None:
         stat_string = '\n'.join(f"{player_name}: {score}" for player_name, score in stats.items())
@@ -48,7 +73,7 @@ Player {title}:
         self.round = 1
         self.trick = 1
         self.cards = deck
-        for player in self.playerDict.values():
+        for player in self.players:
             player.cards = []
             player.current_bet = 0
             player.tricks_won = 0
@@ -65,9 +90,10 @@ Player {title}:
         """
         deck = self.cards.copy()
         shuffle(deck)
+        order = self.orders[self.start]
         for _ in range(n) if n else range(self.round):
-            for _, player in self.playerDict.items():
-                player.add_card(deck.pop())
+            for seat in order:
+                self.players[seat].add_card(deck.pop())
 
     def new_game(self) -> dict:
         """
@@ -83,15 +109,12 @@ Player {title}:
         4. Return final scores
         """
         self.reset()
-        scores = {name: 0 for name, player in self.playerDict.items()}
+        scores = {self.names[seat]: 0 for seat in self.orders[self.start]}
         while self.round <= 10:
             self.deal()
             bets = self.play_round()
             for name in scores:
-                if bets[name][0] == bets[name][1]:
-                    scores[name] += 20 * bets[name][0] if bets[name][0] else 10 * self.round
-                else:
-                    scores[name] -= 10 * abs(bets[name][0] - bets[name][1]) if bets[name][0] else 10 * self.round
+                scores[name] += self.round_score(*bets[name], self.round)
             if self.human_playing:
                 # print('_'*100)
                 # print(f'The Scores after round {self.round}:')
@@ -100,6 +123,31 @@ Player {title}:
             self.round += 1
         return scores
 
+    @staticmethod
+    def round_score(bet: int, tricks_won: int, round_number: int) -> int:
+        """
+        Score of a player at the end of a round.
+
+        Args:
+            bet (int): Number of tricks the player bet on
+            tricks_won (int): Number of tricks the player won
+            round_number (int): Round number, which is also the number of cards dealt
+
+        Returns:
+            int: 20 points per trick on a hit bet, -10 points per trick off otherwise.
+                 A bet of zero scores 10 points per card dealt if hit, -10 per card otherwise.
+        """
+        if bet == tricks_won:
+            return 20 * bet if bet else 10 * round_number
+        return -10 * abs(bet - tricks_won) if bet else -10 * round_number
+
+    def close(self) -> None:
+        """
+        Close every player once the games are over, see `Player.close`.
+        """
+        for player in self.players:
+            player.close()
+
     def play_round(self) -> dict:
         """
         Play a complete round of Skull King.
@@ -114,24 +162,26 @@ Player {title}:
         3. Track tricks won by each player
         4. Reorder players for next round
         """
-        bets = {name: [player.bet(len(self.playerDict)), 0] for name, player in self.playerDict.items()}
+        round_start = self.start
+        for position, seat in enumerate(self.orders[round_start]):
+            self.players[seat].position = position
+        bets = {self.names[seat]: [self.players[seat].bet(self.number_of_players), 0] for seat in self.orders[round_start]}
         if self.human_playing:
             
             self.print_game('Bets', bets, 'Beginning of the round')
             # print('_'*100)
             # print(f'The bets for round {self.round}:')
             # print(bets)
-        _ = next(playerIter := iter(self.playerDict))
-        next_player_name = next(playerIter)
         for _ in range(self.round):
             self.trump = ''
             winner = self.play_trick()
             if winner in bets:
                 bets[winner][1] += 1
-                self.playerDict[winner].tricks_won += 1
+                self.players[self.seats[winner]].tricks_won += 1
         if self.human_playing:
             self.print_game('Bets', bets, 'End of the round')
-        self.reorder_players(next_player_name)
+        # the player after the one who started this round starts the next one
+        self.start = (round_start + 1) % self.number_of_players
         return bets
 
     def play_trick(self) -> str:
@@ -139,54 +189,59 @@ Player {title}:
         Play a single trick in the current round.
         
         Returns:
-            str: Name of the winning player, or empty string if Kraken was played
+            str: Name of the winning player, or empty string if nobody wins the trick
         
         Trick flow:
         1. Each player plays a card in turn
         2. First card determines trump color
         3. Special handling for Kraken card
         4. Determine winner based on card hierarchy
-        5. Reorder players for next trick
+        5. Rotate the turn order so the winner starts the next trick
+        6. Show the trick to every player with `Player.observe_trick`
         """
         cards = []
         cards_dict = {}
-        for player_name, player in self.playerDict.items():
-            card = player.play(cards_dict, self.trump)
+        order = self.orders[self.start]
+        for seat in order:
+            card = self.players[seat].play(cards_dict, self.trump)
             cards.append(card)
-            cards_dict[player_name] = card
+            cards_dict[self.names[seat]] = card
             if not self.trump:
                 self.trump = self.get_trump_color(cards)
+        self.last_trick = cards
+        winner = ''
+        winner_index = resolve_trick(cards)
         if 'kraken' in cards:
-            kraken_index = cards.index('kraken')
-            first_player, *other_players = self.playerDict.keys()
-            other_players.append(first_player)
-            next_player = other_players[kraken_index]
-            self.reorder_players(next_player)
+            # the player after the one who played the kraken starts the next trick
+            self.start = order[(cards.index('kraken') + 1) % self.number_of_players]
+            next_player = self.names[self.start]
             if self.human_playing:
                 self.print_game('Cards', cards_dict, f'The Kraken was played. {next_player} will start the next round.')
                 # print(f'The Kraken was played. {next_player} will start the next round.')
-            return ''
+        elif winner_index is None:
+            # a white whale without numbered cards, nobody wins and the white whale starts the next trick
+            self.start = order[cards.index(WHITE_WHALE)]
+            next_player = self.names[self.start]
+            if self.human_playing:
+                self.print_game('Cards', cards_dict, f'Nobody wins the trick. {next_player} will start the next round.')
         else:
-            winner = self.playerNames[cards.index(self.winning_card(cards))]
-            self.reorder_players(winner)
+            self.start = order[winner_index]
+            winner = self.names[self.start]
             if self.human_playing:
-                # print(f'The winner of the round is {winner} by playing a {self.winning_card(cards)}')
-                self.print_game('Cards', cards_dict, f'The winner of the round is {winner} by playing a {self.winning_card(cards)}')
-            return winner
+                # print(f'The winner of the round is {winner} by playing a {cards[winner_index]}')
+                self.print_game('Cards', cards_dict, f'The winner of the round is {winner} by playing a {cards[winner_index]}')
+        for seat in order:
+            self.players[seat].observe_trick(cards_dict, winner)
+        return winner
 
     def reorder_players(self, starting_player_name: str) -> None:
         """
-        Reorder the player dictionary so the specified player goes first.
+        Rotate the turn order so the specified player goes first.
         
         Args:
             starting_player_name (str): Name of the player who should start next
-        
-        Reorders the playerDict so that the specified player becomes the first
-        in the turn order for subsequent tricks/rounds.
         """
-        playerList = list(self.playerDict.values())
-        starting_index = playerList.index(self.playerDict[starting_player_name])
-        self.playerDict = {player.name: player for player in playerList[starting_index:] + playerList[:starting_index]}
+        self.start = self.seats[starting_player_name]
 
     @staticmethod
     def get_trump_color(cards: Iterable[Card]) -> str:
@@ -218,28 +273,17 @@ Player {title}:
 
     @staticmethod
     def winning_card(cards: List[Card]) -> Card | None:
-        if len(cards) < 1:
-            return None
-        if 'white_whale' in cards:
-            return cards[array([card.number for card in cards if card.number <= 14]).argmax()]
-        elif 'kraken' in cards:
-            return None
-        elif 'skullking' in cards:
-            if 'mermaid' in cards and cards.index(Card('mermaid')) > cards.index(Card('skullking')):
-                return Card('mermaid')
-            return Card('skullking')
-        elif 'pirate' in cards:
-            return Card('pirate')
-        elif 'mermaid' in cards:
-            return Card('mermaid')
-        for card in cards:
-            if not (hasattr(card, 'color') and hasattr(card, 'number'))          :
-              print(card)
-            assert hasattr(card, 'color') and hasattr(card, 'number')
-        trump_color = 'black' if 'black' in ''.join(cards) else Game.get_trump_color(cards)
-        card_numbers = [card.number if card.color == trump_color else 0 for card in cards]
-        return cards[array(card_numbers).argmax()]
+        """
+        Find the card that wins a trick, see `skullking.trick.resolve_trick` for the rules.
+
+        Args:
+            cards (List[Card]): Cards of the trick in the order they were played
 
+        Returns:
+            Card | None: The winning card, or None if nobody wins the trick
+        """
+        winner = resolve_trick(cards)
+        return None if winner is None else cards[winner]
 
 
 import requests
@@ -276,7 +320,7 @@ class OnlineGame(Game):
         self.round = 1
         self.trick = 1
         self.new_deck(self.cards)
-        for player in self.playerDict.values():
+        for player in self.players:
             player.cards = []
             player.current_bet = 0
             player.tricks_won = 0
@@ -293,7 +337,8 @@ class OnlineGame(Game):
         """
         self.new_deck(self.cards)
         for _ in range(n) if n else range(self.round):
-            for _, player in self.playerDict.items():
+            for seat in self.orders[self.start]:
+                player = self.players[seat]
                 card = self.draw()['card']
                 if card is not None:
                     player.add_card(Card(card))
@@ -0,0 +1,63 @@
+from typing import Iterable, List
+
+from skullking.cards import Card, available_cards, card_suits, colors
+from skullking.trick import trump_codes
+
+# masks over card ids: bit `card.id` is set for every kind of card in the set
+SUIT_MASKS: List[int] = [sum(1 << card_id for card_id, suit in enumerate(card_suits) if suit == s) for s in range(len(colors))]
+SPECIAL_MASK = sum(1 << card_id for card_id, suit in enumerate(card_suits) if suit < 0)
+BLACK_MASK = SUIT_MASKS[colors.index('black')]
+ALL_MASK = (1 << len(available_cards)) - 1
+
+
+def card_mask(cards: Iterable[Card]) -> int:
+    """
+    Mask of the kinds of cards in `cards`.
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
+
+
+def trump_suit(cards: Iterable[Card]) -> int:
+    """
+    Suit of the trick that has to be followed, as an index in `colors`, or -1 if there is none.
+    Matches `Game.get_trump_color`: the first card that is not a pass or a tigress sets it, special cards set none.
+    """
+    for card in cards:
+        code = trump_codes[card.id] if card.id >= 0 else -1
+        if code >= 0:
+            return code if code < len(colors) else -1
+    return -1
+
+
+def legal_mask(hand: int, suit: int) -> int:
+    """
+    Mask of the kinds of cards of the `hand` mask that may be played on a trick of the given suit (-1 for none):
+    a player holding the suit has to play it, black or a special card, otherwise anything goes.
+    """
+    if suit >= 0 and hand & SUIT_MASKS[suit]:
+        return hand & (SUIT_MASKS[suit] | BLACK_MASK | SPECIAL_MASK)
+    return hand
+
+
+def legal_cards(hand: List[Card], trick: Iterable[Card]) -> List[Card]:
+    """
+    Find the cards of a hand that may be played on a trick, in the order of the hand.
+
+    Args:
+        hand (List[Card]): Cards of the player
+        trick (Iterable[Card]): Cards already played in the trick
+
+    Returns:
+        List[Card]: The legal cards, the hand itself when every card may be played
+    """
+    suit = trump_suit(trick)
+    if suit < 0:
+        return hand
+    mask = card_mask(hand)
+    legal = legal_mask(mask, suit)
+    if legal == mask:
+        return hand
+    return [card for card in hand if legal >> card.id & 1]
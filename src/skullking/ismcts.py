@@ -0,0 +1,372 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from skullking.cards import Card, card_suits, deck, KRAKEN, PASS, PIRATE, TIGRESS, WHITE_WHALE
+from skullking.game import Game
+from skullking.hand import legal_cards, trump_suit
+from skullking.player import CPU, Player
+from skullking.trick import BLACK, TrickState
+
+
+def legal_moves(hand: List[Card], trick: List[Card]) -> List[Card]:
+    """
+    The cards a hand may put on a trick, a tigress being played as a pirate or an escape.
+    Playing a pirate or an escape uses up the card itself before a tigress.
+    """
+    moves = set(legal_cards(hand, trick))
+    if TIGRESS in moves:
+        moves.discard(TIGRESS)
+        moves.update((PIRATE, PASS))
+    return sorted(moves)
+
+
+class RoundState:
+    def __init__(self, hands: List[List[Card]], leader: int, trick: List[Card], tricks_won: int, round_number: int) -> None:
+        """
+        A round being played out in a search, with every hand known. The searching player sits in seat 0 and the
+        other players follow in turn order.
+
+        Args:
+            hands (List[List[Card]]): Cards of every seat
+            leader (int): Seat that started the current trick
+            trick (List[Card]): Cards of the current trick in the order they were played
+            tricks_won (int): Tricks won by seat 0 so far
+            round_number (int): Number of the round, the number of cards dealt
+        """
+        self.hands = hands
+        self.leader = leader
+        self.trick = TrickState(trick)
+        self.tricks_won = tricks_won
+        self.round_number = round_number
+
+    @property
+    def seat(self) -> int:
+        """
+        Seat to play.
+        """
+        return (self.leader + len(self.trick.cards)) % len(self.hands)
+
+    @property
+    def is_over(self) -> bool:
+        return not self.hands[self.seat]
+
+    def legal_moves(self) -> List[Card]:
+        """
+        The moves of the seat to play, the last card of a hand being played as it is like `Game.play_trick` does.
+        """
+        hand = self.hands[self.seat]
+        if len(hand) == 1:
+            return list(hand)
+        return legal_moves(hand, self.trick.cards)
+
+    def cpu_move(self, rng: random.Random) -> Tuple[Card, Card]:
+        """
+        The card a `CPU` player would play, drawn with `rng`, and the card it takes from the hand, a tigress when
+        it is played as a pirate or an escape.
+        """
+        hand = self.hands[self.seat]
+        if len(hand) == 1:
+            return hand[0], hand[0]
+        card = rng.choice(legal_cards(hand, self.trick.cards))
+        if card == TIGRESS:
+            return PIRATE if rng.random() >= 0.5 else PASS, TIGRESS
+        return card, card
+
+    def apply(self, card: Card, taken: Card | None = None) -> None:
+        """
+        Play a card for the seat to play and resolve the trick like `Game.play_trick` once everybody has played.
+        The card is taken from the hand unless `taken` is given, a pirate or an escape missing from the hand being
+        a tigress.
+        """
+        hand = self.hands[self.seat]
+        if taken is None:
+            taken = card if card in hand else TIGRESS
+        hand.remove(taken)
+        self.trick.add(card)
+        if len(self.trick.cards) < len(self.hands):
+            return
+        cards = self.trick.cards
+        if self.trick.kraken:
+            self.leader = (self.leader + cards.index(KRAKEN) + 1) % len(self.hands)
+        elif self.trick.winner is None:
+            self.leader = (self.leader + cards.index(WHITE_WHALE)) % len(self.hands)
+        else:
+            self.leader = (self.leader + self.trick.winner) % len(self.hands)
+            self.tricks_won += self.leader == 0
+        self.trick = TrickState()
+
+
+class Observation:
+    def __init__(
+        self,
+        hand: List[Card],
+        tricks: List[List[Tuple[int, Card]]],
+        trick: List[Card],
+        number_of_players: int,
+        round_number: int,
+        bet: int,
+    ) -> None:
+        """
+        What the player knows of a round when it is its turn: its hand, the tricks seen so far and its bet.
+
+        Args:
+            hand (List[Card]): Cards of the player
+            tricks (List[List[Tuple[int, Card]]]): Seat and card of every play of the finished tricks of the round
+            trick (List[Card]): Cards of the current trick, the player sits in seat 0 so the trick was led by
+                                seat -len(trick)
+            number_of_players (int): Number of players
+            round_number (int): Number of the round, the number of cards dealt
+            bet (int): Bet of the player
+        """
+        self.hand = list(hand)
+        self.trick = list(trick)
+        self.number_of_players = number_of_players
+        self.round_number = round_number
+        self.bet = bet
+        self.leader = -len(trick) % number_of_players
+        self.tricks_won = 0
+        plays = [play for cards in tricks for play in cards]
+        plays += [((self.leader + i) % number_of_players, card) for i, card in enumerate(trick)]
+        self.voids: List[set] = [set() for _ in range(number_of_players)]
+        for cards in tricks:
+            self._find_voids(cards)
+            state = TrickState(card for _, card in cards)
+            if not state.kraken and state.winner is not None and cards[state.winner][0] == 0:
+                self.tricks_won += 1
+        self._find_voids([((self.leader + i) % number_of_players, card) for i, card in enumerate(trick)])
+
+        # the cards nobody was seen with, a tigress shows up as the pirate or escape it was played as
+        self.unseen = list(deck)
+        for card in self.hand + [card for _, card in plays]:
+            if card in self.unseen:
+                self.unseen.remove(card)
+            elif card in (PIRATE, PASS) and TIGRESS in self.unseen:
+                self.unseen.remove(TIGRESS)
+        played = len(tricks)
+        self.hand_sizes = [
+            len(self.hand) if seat == 0 else round_number - played - ((seat - self.leader) % number_of_players < len(trick))
+            for seat in range(number_of_players)
+        ]
+
+    def _find_voids(self, plays: List[Tuple[int, Card]]) -> None:
+        # a player who did not follow the suit with a plain card has none of it left
+        for i, (seat, card) in enumerate(plays):
+            suit = trump_suit(card for _, card in plays[:i])
+            card_suit = card_suits[card.id] if card.id >= 0 else -1
+            if suit >= 0 and card_suit >= 0 and card_suit not in (suit, BLACK):
+                self.voids[seat].add(suit)
+
+    def determinize(self, rng: random.Random) -> RoundState:
+        """
+        Deal the unseen cards at random to the other players, giving no player a card of a suit it was seen without
+        when the unseen cards allow it.
+        """
+        unseen = list(self.unseen)
+        rng.shuffle(unseen)
+        hands: List[List[Card]] = [[] for _ in range(self.number_of_players)]
+        hands[0] = list(self.hand)
+        for seat in sorted(range(1, self.number_of_players), key=lambda seat: -len(self.voids[seat])):
+            allowed = [card for card in unseen if card_suits[card.id] not in self.voids[seat]]
+            if len(allowed) < self.hand_sizes[seat]:
+                allowed = unseen
+            hands[seat] = allowed[:self.hand_sizes[seat]]
+            for card in hands[seat]:
+                unseen.remove(card)
+        return RoundState(hands, self.leader, self.trick, self.tricks_won, self.round_number)
+
+    def reward(self, state: RoundState) -> float:
+        """
+        Score of the player at the end of the round, scaled from 0 for the worst score to 1 for the best.
+        """
+        worst = -10 * self.round_number
+        best = 20 * self.round_number
+        return (Game.round_score(self.bet, state.tricks_won, self.round_number) - worst) / (best - worst)
+
+
+class Node:
+    __slots__ = ('children', 'visits', 'availability', 'reward')
+
+    def __init__(self) -> None:
+        self.children: Dict[Card, Node] = {}
+        self.visits = 0
+        self.availability = 0
+        self.reward = 0.0
+
+
+def search(
+    observation: Observation,
+    root: Node,
+    rng: random.Random,
+    iterations: int | None = None,
+    time_limit: float | None = None,
+    exploration: float = 0.7,
+) -> None:
+    """
+    Run ISMCTS iterations from `root` until `iterations` are done or `time_limit` seconds have passed, whichever
+    comes first.
+
+    The tree has a node for the plays of every player. The player picks its cards by UCB over the cards legal in
+    the current deal, the other players play like `CPU` does, so their plays are drawn the same way in the tree and
+    in the rollouts. The reward is the score of the player's bet, see `Observation.reward`.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit else math.inf
+    done = 0
+    while (iterations is None or done < iterations) and time.perf_counter() < deadline:
+        state = observation.determinize(rng)
+        node = root
+        path = [root]
+        while not state.is_over:
+            taken = None
+            if state.seat == 0:
+                moves = state.legal_moves()
+                for move in moves:
+                    child = node.children.get(move)
+                    if child:
+                        child.availability += 1
+                untried = [move for move in moves if move not in node.children]
+                if untried:
+                    move = rng.choice(untried)
+                else:
+                    move = max(
+                        moves,
+                        key=lambda move: node.children[move].reward / node.children[move].visits
+                        + exploration * math.sqrt(math.log(node.children[move].availability) / node.children[move].visits),
+                    )
+            else:
+                move, taken = state.cpu_move(rng)
+            state.apply(move, taken)
+            child = node.children.get(move)
+            if child is None:
+                child = node.children[move] = Node()
+                child.availability = 1
+                path.append(child)
+                break
+            node = child
+            path.append(node)
+
+        while not state.is_over:
+            state.apply(*state.cpu_move(rng))
+
+        reward = observation.reward(state)
+        for node in path:
+            node.visits += 1
+            node.reward += reward
+        done += 1
+
+
+def search_root(observation: Observation, seed: int, iterations: int | None, time_limit: float | None, exploration: float) -> Dict[Card, int]:
+    """
+    Search a fresh tree and return the visits of every move from the root, run by the worker processes.
+    """
+    root = Node()
+    search(observation, root, random.Random(seed), iterations, time_limit, exploration)
+    return {move: child.visits for move, child in root.children.items()}
+
+
+class ISMCTS(CPU):
+    def __init__(
+        self,
+        name: str,
+        cards: list[Card] | None = None,
+        iterations: int | None = 500,
+        time_limit: float | None = None,
+        workers: int = 1,
+        exploration: float = 0.7,
+        seed: int | None = None,
+    ) -> None:
+        """
+        A player that searches its card play toward its bet with information-set Monte Carlo tree search.
+        Bets follow the `CPU` policy.
+
+        Args:
+            name (str): Player's name
+            cards (list[Card], optional): Initial hand of cards. Defaults to empty list.
+            iterations (int | None, optional): Iterations per process and move, None for as many as fit in the time limit. Defaults to 500.
+            time_limit (float | None, optional): Seconds per move. Defaults to no limit.
+            workers (int, optional): Processes searching, above 1 the extra ones search fresh trees on a pool and
+                                     their root visits are added in. Defaults to 1.
+            exploration (float, optional): UCB exploration constant. Defaults to 0.7.
+            seed (int | None, optional): Seed of the search. Defaults to a random seed.
+
+        Every iteration deals the unseen cards at random to the other players, see `Observation.determinize`, which
+        needs the tricks shown by `Game.play_trick` to `observe_trick`. The subtree of the chosen card is kept and
+        reused on the next move of the round when the cards played in between are in it. The worker pool is shut
+        down by `close`, which `Game.close` calls.
+        """
+        super().__init__(name, cards)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.exploration = exploration
+        self._rng = random.Random(seed)
+        self._executor: ProcessPoolExecutor | None = None
+        self.number_of_players = 0
+        self.round_number = 0
+        self._tricks: List[List[Tuple[int, Card]]] = []
+        self._root: Node | None = None
+        self._plays_seen = 0
+
+    def bet(self, number_of_players: int) -> int:
+        self.number_of_players = number_of_players
+        self.round_number = len(self.cards)
+        self._tricks = []
+        self._root = None
+        return super().bet(number_of_players)
+
+    def observe_trick(self, trick: Dict[str, Card], winner: str) -> None:
+        names = list(trick)
+        if self.name not in names:
+            return
+        me = names.index(self.name)
+        self._tricks.append([((i - me) % len(names), card) for i, card in enumerate(trick.values())])
+
+    def _reused_root(self, plays: List[Card]) -> Node:
+        node = self._root
+        if node is None:
+            return Node()
+        for card in plays[self._plays_seen:]:
+            node = node.children.get(card)
+            if node is None:
+                return Node()
+        return node
+
+    def play(self, current_trick: Dict[Player, Card], trump_color: str, number_of_players: int = 0) -> Card:
+        if len(self.cards) == 1 or not self.number_of_players or len(self._tricks) + len(self.cards) != self.round_number:
+            # a round that was not bet on and observed is played like a `CPU`
+            return super().play(current_trick, trump_color, number_of_players)
+        trick = list(current_trick.values())
+        moves = legal_moves(self.cards, trick)
+        plays = [card for cards in self._tricks for _, card in cards] + trick
+        root = self._reused_root(plays) if len(moves) > 1 else Node()
+
+        visits = {move: 0 for move in moves}
+        if len(moves) > 1:
+            observation = Observation(self.cards, self._tricks, trick, self.number_of_players, self.round_number, self.current_bet)
+            futures = []
+            if self.workers > 1:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+                futures = [
+                    self._executor.submit(search_root, observation, self._rng.randrange(2 ** 32), self.iterations, self.time_limit, self.exploration)
+                    for _ in range(self.workers - 1)
+                ]
+            search(observation, root, self._rng, self.iterations, self.time_limit, self.exploration)
+            for move, child in root.children.items():
+                visits[move] += child.visits
+            for future in futures:
+                for move, move_visits in future.result().items():
+                    visits[move] += move_visits
+        card = max(moves, key=lambda move: visits[move])
+
+        self._root = root.children.get(card)
+        self._plays_seen = len(plays) + 1
+        self.cards.remove(card if card in self.cards else TIGRESS)
+        return card
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
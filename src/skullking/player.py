@@ -1,5 +1,7 @@
 from skullking.game import Game
-from skullking.cards import special, winning_special, Card
+from skullking.cards import special, winning_special, Card, SKULLKING, PIRATE, MERMAID
+from skullking.hand import legal_cards
+from skullking.trick import TrickState
 from random import choice, random
 from typing import List, Dict, Self, Iterable
 from skullking.util import print_game
@@ -18,11 +20,14 @@ class Player:
             cards (list[Card]): Player's current hand
             current_bet (int): Player's bet for current round
             tricks_won (int): Number of tricks won in current round
+            position (int | None): Place in the turn order of the first trick of the round, 0 for the lead,
+                                   set by `Game.play_round` before the bets
         """
         self.name: str = name
         self.cards: list[Card] = cards or []
         self.current_bet: int = 0
         self.tricks_won: int = 0
+        self.position: int | None = None
 
     def __repr__(self) -> str:
         """
@@ -60,18 +65,33 @@ class Player:
     def bet(self, number_of_players: int) -> int: # type: ignore
         pass
 
+    def observe_trick(self, trick: Dict[str, Card], winner: str) -> None:
+        """
+        Called by `Game.play_trick` once a trick is resolved, the players only see the cards played before theirs
+        when they play.
+
+        Args:
+            trick (Dict[str, Card]): Card played by every player, in the order they were played
+            winner (str): Name of the winning player, or empty string if nobody wins the trick
+        """
+
     def valid_cards(self, cards: Iterable[Card]) -> List[Card]:
-        valid_card_list = []
-        trump_color = Game.get_trump_color(cards)
-        have_trump = False
-        for card in self.cards:
-          if card in special or card.color in ['black', trump_color]:
-            valid_card_list.append(card)
-          if card.color == trump_color:
-            have_trump = True
-        if have_trump:
-            return valid_card_list
-        return self.cards
+        """
+        Find the cards of the hand that may be played on a trick, see `skullking.hand.legal_cards`.
+
+        Args:
+            cards (Iterable[Card]): Cards already played in the trick
+
+        Returns:
+            List[Card]: The cards of the suit of the trick, black and special cards if the player holds the suit,
+                        otherwise the whole hand
+        """
+        return legal_cards(self.cards, cards)
+
+    def close(self) -> None:
+        """
+        Called by `Game.close` once the games are over, frees the resources of the player such as worker processes.
+        """
 
 class Human(Player):
     def play(self, current_trick: Dict[Player, Card], trump_color:str, number_of_players:int = 0) -> str:
@@ -144,26 +164,20 @@ class CPU(Player):
 
     def try2win(self, current_trick: Dict[Player, Card], trump_color:str):
         winners = set(self.cards) & set(winning_special)
-        cards_list = list(current_trick.values())
+        trick = TrickState(current_trick.values())
         for card in winners:
-            if card == Game.winning_card(cards_list):
-                continue
-            elif card == Game.winning_card(cards_list+[card]):
+            if trick.takes_lead(card):
                 return card
 
         for card in [card for card in self.cards if card.color == 'black']:
-            if card == Game.winning_card(cards_list):
-                continue
-            elif card == Game.winning_card(cards_list+[card]):
+            if trick.takes_lead(card):
                 return card
 
         if card := self.card_in_color(trump_color, best=False):
             return card
 
         for card in self.cards:
-            if card == Game.winning_card(cards_list):
-                continue
-            elif card == Game.winning_card(cards_list+[card]):
+            if trick.takes_lead(card):
                 return card
         return self.cards[0]
 
@@ -173,15 +187,15 @@ class CPU(Player):
             if len(non_winning) > 0:
                 return sorted(non_winning, key=lambda x: x.number)[0]
             return self.cards[0]
-        cards_list = list(current_trick.values())
-        winning_card = Game.winning_card(cards_list)
-        if 'white_whale' in cards_list and winning_card:
+        trick = TrickState(current_trick.values())
+        winning_card = trick.winning_card
+        if trick.white_whale and winning_card:
             if 'skullking' in self.cards:
-                return Card('skullking')
+                return SKULLKING
             elif 'pirate' in self.cards:
-                return Card('pirate')
+                return PIRATE
             elif 'mermaid' in self.cards:
-                return Card('mermaid')
+                return MERMAID
             best_black = self.card_in_color('black', max_value=winning_card.number)
             if best_black and best_black.number <= winning_card.number:
                 return best_black
@@ -197,13 +211,13 @@ class CPU(Player):
                 return best
             # print('White whale was played and was not able to find card', current_trick, self.cards)
             return self.cards[0]
-        if 'kraken' in cards_list and winning_card:
+        if trick.kraken and winning_card:
             if 'skullking' in self.cards:
-                return Card('skullking')
+                return SKULLKING
             elif 'pirate' in self.cards:
-                return Card('pirate')
+                return PIRATE
             elif 'mermaid' in self.cards:
-                return Card('mermaid')
+                return MERMAID
             best_black = self.card_in_color('black')
             if best_black:
                 return best_black
@@ -223,9 +237,7 @@ class CPU(Player):
             return card
 
         for card in self.cards:
-            if card == Game.winning_card(cards_list):
-                return card
-            elif card != Game.winning_card(cards_list+[card]):
+            if not trick.takes_lead(card):
                 return card
         return card
 
@@ -0,0 +1,226 @@
+import csv
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple, Type
+
+import numpy as np
+
+from skullking.cards import deck, KRAKEN, WHITE_WHALE
+from skullking.game import Game
+from skullking.player import Player
+
+# one row per player and round
+COLUMNS = ('game', 'seed', 'round', 'player', 'seat', 'bet', 'tricks_won', 'points', 'krakens', 'white_whales')
+Columns = Dict[str, list]
+
+
+class RecordingGame(Game):
+    def __init__(self, deck: List, playerDict: Dict, game_id: int = 0, seed: int = 0) -> None:
+        """
+        A headless game that records every round of every player in columns.
+
+        Args:
+            deck (List): List of cards in the game deck
+            playerDict (Dict): Dictionary mapping player names to Player objects, in seat order
+            game_id (int, optional): Number of the game in the simulation. Defaults to 0.
+            seed (int, optional): Seed the game was played with. Defaults to 0.
+        """
+        super().__init__(deck, playerDict)
+        self.game_id = game_id
+        self.seed = seed
+        self.columns: Columns = {column: [] for column in COLUMNS}
+        self.krakens = self.white_whales = 0
+
+    def play_trick(self) -> str:
+        winner = super().play_trick()
+        self.krakens += KRAKEN in self.last_trick
+        self.white_whales += WHITE_WHALE in self.last_trick
+        return winner
+
+    def play_round(self) -> dict:
+        self.krakens = self.white_whales = 0
+        bets = super().play_round()
+        for name, (bet, tricks_won) in bets.items():
+            row = (
+                self.game_id, self.seed, self.round, name, self.seats[name], bet, tricks_won,
+                self.round_score(bet, tricks_won, self.round), self.krakens, self.white_whales,
+            )
+            for column, value in zip(COLUMNS, row):
+                self.columns[column].append(value)
+        return bets
+
+
+def simulate_games(player_defs: List[Tuple[str, Type[Player]]], first_game: int, num_games: int, seed: int) -> Columns:
+    """
+    Play games `first_game` to `first_game + num_games - 1` of a simulation.
+
+    Args:
+        player_defs (List[Tuple[str, Type[Player]]]): Name and class of every player
+        first_game (int): Number of the first game
+        num_games (int): Number of games to play
+        seed (int): Seed of the simulation, game g is played with the seed `seed + g` so it can be replayed on its own
+
+    Returns:
+        Columns: The rows of every player in every round, by column
+
+    The seating rotates from game to game so no player always leads the first round.
+    """
+    columns: Columns = {column: [] for column in COLUMNS}
+    for game_id in range(first_game, first_game + num_games):
+        random.seed(seed + game_id)
+        offset = game_id % len(player_defs)
+        seating = player_defs[offset:] + player_defs[:offset]
+        game = RecordingGame(deck, {name: player_class(name) for name, player_class in seating}, game_id, seed + game_id)
+        try:
+            game.new_game()
+        finally:
+            game.close()
+        for column, values in game.columns.items():
+            columns[column].extend(values)
+    return columns
+
+
+class SimulationResults:
+    def __init__(self, player_names: List[str], num_rounds: int = 10) -> None:
+        """
+        Summary statistics of a simulation, merged chunk by chunk.
+
+        Args:
+            player_names (List[str]): Names of the players
+            num_rounds (int, optional): Number of rounds in a game. Defaults to 10.
+        """
+        self.num_games = 0
+        self.num_tricks = 0
+        self.krakens = 0
+        self.white_whales = 0
+        self.scores: Dict[str, List[int]] = {name: [] for name in player_names}
+        self.bets_hit = {name: [0] * num_rounds for name in player_names}
+        self.bets_made = {name: [0] * num_rounds for name in player_names}
+
+    def merge(self, columns: Columns) -> None:
+        totals: Dict[Tuple[int, str], int] = {}
+        rounds_counted = set()
+        for game_id, round_number, name, bet, tricks_won, points, krakens, white_whales in zip(
+            columns['game'], columns['round'], columns['player'], columns['bet'], columns['tricks_won'],
+            columns['points'], columns['krakens'], columns['white_whales'],
+        ):
+            totals[game_id, name] = totals.get((game_id, name), 0) + points
+            self.bets_made[name][round_number - 1] += 1
+            self.bets_hit[name][round_number - 1] += bet == tricks_won
+            if (game_id, round_number) not in rounds_counted:
+                # every player of a round has the same counts
+                rounds_counted.add((game_id, round_number))
+                self.num_tricks += round_number
+                self.krakens += krakens
+                self.white_whales += white_whales
+        for (_, name), score in totals.items():
+            self.scores[name].append(score)
+        self.num_games += len({game_id for game_id, _ in totals})
+
+    def score_summary(self, name: str) -> Dict[str, float]:
+        """
+        Mean, standard deviation and quartiles of the final scores of a player.
+        """
+        scores = np.array(self.scores[name], dtype=np.float64)
+        if not len(scores):
+            return {key: math.nan for key in ('mean', 'std', 'min', '25%', '50%', '75%', 'max')}
+        quartiles = np.percentile(scores, [0, 25, 50, 75, 100])
+        return {'mean': scores.mean(), 'std': scores.std(), **dict(zip(('min', '25%', '50%', '75%', 'max'), quartiles))}
+
+    def bet_accuracy(self, name: str) -> List[float]:
+        """
+        Share of the bets of a player that were hit, by round.
+        """
+        return [hit / made if made else math.nan for hit, made in zip(self.bets_hit[name], self.bets_made[name])]
+
+
+class ColumnWriter:
+    def __init__(self, path: str) -> None:
+        """
+        Append batches of rows to a Parquet file, or to a CSV file if the path ends with ".csv".
+
+        Args:
+            path (str): Output file, overwritten if it exists
+        """
+        self.path = path
+        self._file = None
+        self._writer = None
+        if path.endswith('.csv'):
+            self._file = open(path, 'w', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(COLUMNS)
+        else:
+            # only Parquet output needs pyarrow
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError as error:
+                raise ImportError(f'Writing {path} as Parquet needs pyarrow, install it or write to a file ending with ".csv".') from error
+            self._pyarrow = pyarrow
+
+    def write(self, columns: Columns) -> None:
+        if self._file is not None:
+            self._writer.writerows(zip(*(columns[column] for column in COLUMNS)))
+            return
+        table = self._pyarrow.table({column: columns[column] for column in COLUMNS})
+        if self._writer is None:
+            self._writer = self._pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+
+
+def run_simulation(
+    player_defs: List[Tuple[str, Type[Player]]],
+    num_games: int,
+    output: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 100,
+    seed: int | None = None,
+    on_chunk: Callable[[SimulationResults, float], None] | None = None,
+) -> Tuple[SimulationResults, float]:
+    """
+    Play headless games on a process pool.
+
+    Args:
+        player_defs (List[Tuple[str, Type[Player]]]): Name and class of every player
+        num_games (int): Number of games to play
+        output (str, optional): File the rows are written to as the chunks of games come in. Defaults to no file.
+        workers (int, optional): Number of worker processes. Defaults to one per CPU.
+        chunk_size (int, optional): Number of games played by a worker at a time. Defaults to 100.
+        seed (int, optional): Seed of the simulation, see `simulate_games`. Defaults to a random seed.
+        on_chunk (Callable, optional): Called with the results so far and the elapsed seconds after every chunk.
+
+    Returns:
+        Tuple[SimulationResults, float]: The results and the total elapsed seconds
+
+    The output file is opened before any game is played, so a Parquet file without pyarrow fails right away.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    results = SimulationResults([name for name, _ in player_defs])
+    start = time.perf_counter()
+    writer = ColumnWriter(output) if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(simulate_games, player_defs, first_game, min(chunk_size, num_games - first_game), seed)
+                for first_game in range(0, num_games, chunk_size)
+            ]
+            for future in as_completed(futures):
+                columns = future.result()
+                results.merge(columns)
+                if writer is not None:
+                    writer.write(columns)
+                if on_chunk:
+                    on_chunk(results, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+    return results, time.perf_counter() - start
@@ -0,0 +1,253 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations_with_replacement
+from math import comb
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from skullking.bidding import best_bet, canonical_hand
+from skullking.cards import Card, available_cards, cards_by_id, colors, deck, PASS, PIRATE, TIGRESS
+from skullking.player import CPU
+from skullking.trick import BLACK, KRAKEN_ID, WHITE_WHALE_ID, _card_suits, _trump_codes, resolve_tricks
+
+# the rounds and numbers of players the tables cover
+MAX_ROUND = 3
+MIN_PLAYERS, MAX_PLAYERS = 2, 7
+# written by `skullking tables`, in the user's cache directory since the package may not be writable
+DEFAULT_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'skullking', 'trick_tables.npy')
+
+NUM_KINDS = len(available_cards)
+# where the hands of each size start on the hand axis of the tables, hands of a size being every multiset of card ids
+HAND_OFFSETS: Tuple[int, ...] = tuple(sum(comb(NUM_KINDS + size - 1, size) for size in range(1, k)) for k in range(1, MAX_ROUND + 2))
+NUM_HANDS = HAND_OFFSETS[-1]
+# copies of each card id in the deck
+DECK_COUNTS: Tuple[int, ...] = tuple(sum(card.id == card_id for card in deck) for card_id in range(NUM_KINDS))
+
+_deck_ids = np.sort(np.array([card.id for card in deck], dtype=np.intp))
+# the index in `_deck_ids` of the first copy of every card id
+_first_copy = np.searchsorted(_deck_ids, np.arange(NUM_KINDS))
+
+
+def hand_index(ids: Sequence[int]) -> int:
+    """
+    Index of a hand on the hand axis of the tables, its rank among the multisets of card ids of its size.
+
+    Args:
+        ids (Sequence[int]): Card ids of the hand, in any order
+
+    Returns:
+        int: Index of the hand
+    """
+    return HAND_OFFSETS[len(ids) - 1] + sum(comb(card_id + i, i + 1) for i, card_id in enumerate(sorted(ids)))
+
+
+def hands(size: int) -> Dict[Tuple[int, ...], List[Tuple[int, ...]]]:
+    """
+    Every hand of a size that can be dealt from the deck, grouped by `canonical_hand`.
+
+    Args:
+        size (int): Number of cards in the hand
+
+    Returns:
+        Dict[Tuple[int, ...], List[Tuple[int, ...]]]: The sorted card ids of the hands that play like each canonical hand
+    """
+    groups: Dict[Tuple[int, ...], List[Tuple[int, ...]]] = {}
+    for ids in combinations_with_replacement(range(NUM_KINDS), size):
+        if all(ids.count(card_id) <= DECK_COUNTS[card_id] for card_id in set(ids)):
+            groups.setdefault(canonical_hand([cards_by_id[card_id] for card_id in ids]), []).append(ids)
+    return groups
+
+
+def play_rounds(hand_ids: np.ndarray, number_of_players: int, position: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Play a round for every row of `hand_ids` the way `CPU` players do, with the rest of the deck dealt at random to
+    the other players.
+
+    Args:
+        hand_ids (np.ndarray): (N, cards) card ids of the hand of the player, one round per row
+        number_of_players (int): Number of players
+        position (int): Place of the player in the turn order of the first trick, 0 for the lead
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        np.ndarray: (N,) number of tricks won by the player in every round
+
+    Like `CPU.play`, every player plays a legal card at random, a tigress being a pirate or an escape at even odds,
+    and plays the last card of the hand as it is. The tricks are resolved by `resolve_tricks`, and the next trick is
+    started by the winner, the player after the kraken or the white whale, like in `Game.play_trick`.
+    """
+    hand_ids = np.sort(np.asarray(hand_ids, dtype=np.intp), axis=1)
+    num_rounds, num_cards = hand_ids.shape
+    rows = np.arange(num_rounds)
+
+    # deal the other players from the deck without the copies of the cards in the hand
+    copies = (hand_ids[:, :, None] == hand_ids[:, None, :]).cumsum(axis=2)[:, np.arange(num_cards), np.arange(num_cards)] - 1
+    keys = rng.random((num_rounds, len(_deck_ids)))
+    keys[rows[:, None], _first_copy[hand_ids] + copies] = 2
+    num_dealt = (number_of_players - 1) * num_cards
+    dealt = _deck_ids[keys.argpartition(num_dealt - 1, axis=1)[:, :num_dealt]]
+    others = dealt.reshape(num_rounds, number_of_players - 1, num_cards)
+    table = np.concatenate((others[:, :position], hand_ids[:, None], others[:, position:]), axis=1)
+
+    start = np.zeros(num_rounds, dtype=np.intp)
+    tricks_won = np.zeros(num_rounds, dtype=np.intp)
+    for trick_number in range(num_cards):
+        trick = np.empty((num_rounds, number_of_players), dtype=np.intp)
+        trump = np.full(num_rounds, -1, dtype=np.intp)
+        for turn in range(number_of_players):
+            seat = (start + turn) % number_of_players
+            cards = table[rows, seat]
+            in_hand = cards >= 0
+            suits = np.where(in_hand, _card_suits[np.maximum(cards, 0)], -1)
+            suit = np.where(trump < len(colors), trump, -1)[:, None]
+            follows = (suits == suit) & (suit >= 0)
+            legal = in_hand & (~follows.any(axis=1, keepdims=True) | follows | (suits == BLACK) | (suits < 0))
+            slot = np.where(legal, rng.random(cards.shape), -1).argmax(axis=1)
+            card = cards[rows, slot]
+            table[rows, seat, slot] = -1
+            if trick_number < num_cards - 1:
+                card = np.where(card == TIGRESS.id, np.where(rng.random(num_rounds) >= 0.5, PIRATE.id, PASS.id), card)
+            trick[:, turn] = card
+            trump = np.where(trump < 0, _trump_codes[card], trump)
+
+        winner, _ = resolve_tricks(trick)
+        kraken = trick == KRAKEN_ID
+        white_whale = (trick == WHITE_WHALE_ID).argmax(axis=1)
+        winner_seat = (start + winner) % number_of_players
+        tricks_won += (winner >= 0) & ~kraken.any(axis=1) & (winner_seat == position)
+        start = np.where(
+            kraken.any(axis=1), (start + kraken.argmax(axis=1) + 1) % number_of_players,
+            np.where(winner >= 0, winner_seat, (start + white_whale) % number_of_players),
+        )
+    return tricks_won
+
+
+def trick_probabilities(size: int, number_of_players: int, position: int, rollouts: int, seed: int, batch_size: int = 65_536) -> np.ndarray:
+    """
+    Estimate how often every canonical hand of a size wins each number of tricks from a position.
+
+    Args:
+        size (int): Number of cards in the hands, the round number
+        number_of_players (int): Number of players
+        position (int): Place of the player in the turn order of the first trick
+        rollouts (int): Rounds played with every hand
+        seed (int): Seed of the rounds
+        batch_size (int, optional): Number of rounds played at once. Defaults to 65,536.
+
+    Returns:
+        np.ndarray: (canonical hands, size + 1) probability of winning t tricks, the hands in the order of `hands`
+    """
+    rng = np.random.default_rng([seed, size, number_of_players, position])
+    canonical = np.array(list(hands(size)), dtype=np.intp)
+    rounds = np.repeat(np.arange(len(canonical)), rollouts)
+    counts = np.zeros((len(canonical), size + 1), dtype=np.int64)
+    for first in range(0, len(rounds), batch_size):
+        batch = rounds[first:first + batch_size]
+        np.add.at(counts, (batch, play_rounds(canonical[batch], number_of_players, position, rng)), 1)
+    return counts / rollouts
+
+
+def build_tables(
+    path: str = DEFAULT_PATH,
+    rollouts: int = 2_000,
+    workers: int | None = None,
+    seed: int = 0,
+    on_table: Callable[[int, int], None] | None = None,
+) -> np.ndarray:
+    """
+    Simulate every hand of the first `MAX_ROUND` rounds from every position and number of players, and store the
+    probabilities of winning each number of tricks in a `.npy` file that can be memory-mapped.
+
+    Args:
+        path (str, optional): Output file, overwritten once the tables are done. Defaults to `DEFAULT_PATH`.
+        rollouts (int, optional): Rounds played with every canonical hand from every position. Defaults to 2,000.
+        workers (int, optional): Number of worker processes. Defaults to one per CPU.
+        seed (int, optional): Seed of the simulation. Defaults to 0.
+        on_table (Callable, optional): Called with the number of (round, players, position) tables done and their total.
+
+    Returns:
+        np.ndarray: The tables, memory-mapped from `path`
+
+    The tables have the shape (players - MIN_PLAYERS, position, `hand_index`, tricks), float16 and NaN where there is
+    no such hand or position. Hands that only differ by the names of the plain suits share their simulations.
+    """
+    jobs = [
+        (size, number_of_players, position)
+        for size in range(1, MAX_ROUND + 1)
+        for number_of_players in range(MIN_PLAYERS, MAX_PLAYERS + 1)
+        for position in range(number_of_players)
+    ]
+    groups = {size: list(hands(size).values()) for size in range(1, MAX_ROUND + 1)}
+    indices = {size: [[hand_index(ids) for ids in group] for group in groups[size]] for size in groups}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = path + '.tmp.npy'
+    tables = np.lib.format.open_memmap(temporary, mode='w+', dtype=np.float16, shape=(MAX_PLAYERS - MIN_PLAYERS + 1, MAX_PLAYERS, NUM_HANDS, MAX_ROUND + 1))
+    tables[:] = np.nan
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(trick_probabilities, *job, rollouts, seed): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            size, number_of_players, position = futures[future]
+            probabilities = future.result()
+            for group, probability in zip(indices[size], probabilities):
+                tables[number_of_players - MIN_PLAYERS, position, group, :size + 1] = probability
+            if on_table:
+                on_table(done, len(jobs))
+    tables.flush()
+    del tables
+    os.replace(temporary, path)
+    _tables.pop(path, None)
+    return load_tables(path)
+
+
+_tables: Dict[str, np.ndarray] = {}
+
+
+def load_tables(path: str = DEFAULT_PATH) -> np.ndarray:
+    """
+    Memory-map the tables written by `build_tables`, once per file and process.
+    """
+    if path not in _tables:
+        _tables[path] = np.load(path, mmap_mode='r')
+    return _tables[path]
+
+
+class TableCPU(CPU):
+    def __init__(self, name: str, cards: list[Card] | None = None, path: str = DEFAULT_PATH) -> None:
+        """
+        A `CPU` player that bets in the first rounds by looking its hand up in the tables of `build_tables`.
+
+        Args:
+            name (str): Player's name
+            cards (list[Card], optional): Initial hand of cards. Defaults to empty list.
+            path (str, optional): File of the tables, loaded at the first bet that needs it. Defaults to `DEFAULT_PATH`.
+
+        Hands of more than `MAX_ROUND` cards are bet on like `CPU` does, and so are all hands with a warning when
+        the file is missing. The player's position is set by `Game.play_round`, without one the probabilities of
+        every position are averaged.
+        """
+        super().__init__(name, cards)
+        self.path = path
+
+    def trick_probabilities(self, number_of_players: int) -> np.ndarray:
+        """
+        Probability of the hand winning each number of tricks, from 0 to the size of the hand.
+        """
+        tables = load_tables(self.path)[number_of_players - MIN_PLAYERS]
+        index = hand_index([card.id for card in self.cards])
+        if self.position is None:
+            return tables[:number_of_players, index, :len(self.cards) + 1].astype(np.float64).mean(axis=0)
+        return tables[self.position, index, :len(self.cards) + 1].astype(np.float64)
+
+    def bet(self, number_of_players: int) -> int:
+        if not 0 < len(self.cards) <= MAX_ROUND or not MIN_PLAYERS <= number_of_players <= MAX_PLAYERS:
+            return super().bet(number_of_players)
+        try:
+            probabilities = self.trick_probabilities(number_of_players)
+        except FileNotFoundError:
+            warnings.warn(f'No trick tables in {self.path}, betting like the CPU, run `skullking tables` to build them.')
+            return super().bet(number_of_players)
+        bet = best_bet(list(probabilities), len(self.cards))
+        self.current_bet = bet
+        return bet
@@ -0,0 +1,301 @@
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from skullking.cards import Card, available_cards, card_numbers, card_suits, colors, deck, SKULLKING, PIRATE, MERMAID, WHITE_WHALE, KRAKEN
+
+BLACK = colors.index('black')
+SKULLKING_ID = SKULLKING.id
+PIRATE_ID = PIRATE.id
+MERMAID_ID = MERMAID.id
+WHITE_WHALE_ID = WHITE_WHALE.id
+KRAKEN_ID = KRAKEN.id
+
+
+def _rank_key(card_id: int, lead_suit: int) -> int:
+    suit = card_suits[card_id]
+    if suit == BLACK:
+        return 100 + card_numbers[card_id]
+    if suit >= 0:
+        return card_numbers[card_id] if suit == lead_suit else 0
+    return {PIRATE_ID: 300, MERMAID_ID: 200}.get(card_id, 0)
+
+
+# the rank of every card in a trick without skull king, white whale or kraken, by lead suit: the highest rank wins and
+# the first card played wins ties. The last table is for tricks without a lead suit, so a lead suit of -1 finds it.
+rank_keys: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_rank_key(card_id, lead_suit) for card_id in range(len(available_cards))) for lead_suit in (*range(len(colors)), -1)
+)
+# the rank of every card in a trick with a white whale, where only the number of numbered cards counts
+white_whale_keys: Tuple[int, ...] = tuple(number if suit >= 0 else 0 for number, suit in zip(card_numbers, card_suits))
+
+
+def resolve_trick(cards: Sequence[Card]) -> int | None:
+    """
+    Find the index of the card that wins a trick.
+
+    Args:
+        cards (Sequence[Card]): Cards of the trick in the order they were played
+
+    Returns:
+        int | None: Index of the winning card, or None if nobody wins the trick
+
+    Rules, from the strongest:
+    1. White whale: the highest numbered card wins whatever its suit, nobody wins without numbered cards
+    2. Kraken: nobody wins
+    3. Skull king: wins, unless the first mermaid is played after it, then that mermaid wins
+    4. Pirate, then mermaid: the first one played wins
+    5. Black trumps the other suits: the highest black card wins
+    6. Otherwise the highest card of the suit of the first numbered card wins (the first card if there is none)
+
+    The last three rules are looked up in `rank_keys`, so the trick is only scanned by `in`, `max` and `index`.
+    """
+    ids = [card.id for card in cards]
+    if not ids:
+        return None
+    if WHITE_WHALE_ID in ids:
+        keys = [white_whale_keys[card_id] for card_id in ids]
+        best = max(keys)
+        return keys.index(best) if best else None
+    if KRAKEN_ID in ids:
+        return None
+    if SKULLKING_ID in ids:
+        skullking = ids.index(SKULLKING_ID)
+        if MERMAID_ID in ids and ids.index(MERMAID_ID) > skullking:
+            return ids.index(MERMAID_ID)
+        return skullking
+    lead_suit = -1
+    for card_id in ids:
+        lead_suit = card_suits[card_id]
+        if lead_suit >= 0:
+            break
+    table = rank_keys[lead_suit]
+    keys = [table[card_id] for card_id in ids]
+    return keys.index(max(keys))
+
+
+# the trump colors returned by `resolve_tricks`, `Game.get_trump_color` of a trick is trump_colors[trump]
+trump_colors = (*colors, 'any', '')
+ANY = trump_colors.index('any')
+NO_TRUMP = trump_colors.index('')
+# the trump color set by each card if it is the first card to set one, -1 for the cards that do not (pass and tigress)
+trump_codes: Tuple[int, ...] = tuple(
+    suit if suit >= 0 else ANY if card_id in (SKULLKING_ID, PIRATE_ID, MERMAID_ID, WHITE_WHALE_ID, KRAKEN_ID) else -1
+    for card_id, suit in enumerate(card_suits)
+)
+
+_rank_keys = np.array(rank_keys, dtype=np.int16)
+_white_whale_keys = np.array(white_whale_keys, dtype=np.int16)
+_card_suits = np.array(card_suits, dtype=np.int8)
+_trump_codes = np.array(trump_codes, dtype=np.int8)
+
+
+def card_ids(tricks: Iterable[Sequence[Card]]) -> np.ndarray:
+    """
+    Convert tricks of cards to the (N, players) array of card ids taken by `resolve_tricks`.
+    """
+    return np.array([[card.id for card in cards] for cards in tricks], dtype=np.int8)
+
+
+def resolve_tricks(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve many tricks at once, with the rules of `resolve_trick`.
+
+    Args:
+        ids (np.ndarray): (N, players) card ids, each row a trick in the order the cards were played
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The index of the winning card of every trick (-1 if nobody wins it)
+            and its trump color as an index in `trump_colors`
+    """
+    ids = np.asarray(ids, dtype=np.intp)
+    rows = np.arange(len(ids))
+
+    # trump color, set by the first card that is not a pass or a tigress
+    codes = _trump_codes[ids]
+    sets_trump = codes >= 0
+    first = sets_trump.argmax(axis=1)
+    trump = np.where(sets_trump[rows, first], codes[rows, first], NO_TRUMP)
+
+    # tricks without white whale, kraken or skull king: highest rank key for the lead suit, -1 (the last table) without one
+    suits = _card_suits[ids]
+    numbered = suits >= 0
+    first = numbered.argmax(axis=1)
+    lead_suit = np.where(numbered[rows, first], suits[rows, first], -1)
+    winner = _rank_keys[lead_suit[:, None], ids].argmax(axis=1)
+
+    skullking = ids == SKULLKING_ID
+    has_skullking = skullking.any(axis=1)
+    skullking = skullking.argmax(axis=1)
+    mermaid = ids == MERMAID_ID
+    mermaid_wins = mermaid.any(axis=1) & (mermaid.argmax(axis=1) > skullking)
+    winner = np.where(has_skullking, np.where(mermaid_wins, mermaid.argmax(axis=1), skullking), winner)
+
+    winner = np.where((ids == KRAKEN_ID).any(axis=1), -1, winner)
+
+    white_whale_keys = _white_whale_keys[ids]
+    best = white_whale_keys.argmax(axis=1)
+    white_whale_winner = np.where(white_whale_keys[rows, best] > 0, best, -1)
+    winner = np.where((ids == WHITE_WHALE_ID).any(axis=1), white_whale_winner, winner)
+    return winner, trump
+
+
+def trick_win_rates(num_players: int, num_tricks: int = 1_000_000, batch_size: int = 65_536, rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Estimate how often each card wins a trick from each position, dealing tricks at random from the deck.
+    A tigress is counted as played as an escape.
+
+    Args:
+        num_players (int): Number of cards in a trick
+        num_tricks (int, optional): Number of random tricks. Defaults to 1,000,000.
+        batch_size (int, optional): Number of tricks resolved at once. Defaults to 65,536.
+        rng (np.random.Generator, optional): Random generator. Defaults to a new one.
+
+    Returns:
+        np.ndarray: (cards, positions) probability that card id c played in position p wins the trick, NaN if never dealt
+    """
+    rng = rng or np.random.default_rng()
+    deck_ids = np.array([card.id for card in deck], dtype=np.int8)
+    played = np.zeros((len(available_cards), num_players), dtype=np.int64)
+    won = np.zeros_like(played)
+    positions = np.arange(num_players)
+    for start in range(0, num_tricks, batch_size):
+        n = min(batch_size, num_tricks - start)
+        ids = deck_ids[rng.random((n, len(deck_ids))).argpartition(num_players, axis=1)[:, :num_players]]
+        winner, _ = resolve_tricks(ids)
+        np.add.at(played, (ids, positions), 1)
+        has_winner = winner >= 0
+        np.add.at(won, (ids[has_winner, winner[has_winner]], winner[has_winner]), 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return won / played
+
+
+class TrickState:
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """
+        A trick being played, kept up to date card by card so the winner of the trick and whether a card would take
+        the lead are known without going over the trick again.
+
+        Args:
+            cards (Iterable[Card], optional): Cards already played in the trick. Defaults to none.
+
+        Attributes:
+            cards (List[Card]): Cards of the trick in the order they were played
+            winner (int | None): Index of the card winning the trick so far, None if nobody would win it
+            trump (str): Trump color of the trick, as `Game.get_trump_color` returns it
+            white_whale (bool): Whether a white whale was played
+            kraken (bool): Whether a kraken was played
+        """
+        self.cards: List[Card] = []
+        self.winner: int | None = None
+        self.trump = ''
+        self.white_whale = False
+        self.kraken = False
+        self.skullking = self.pirate = self.mermaid = -1
+        self.lead_suit = -1
+        self.best = self.best_number = 0
+        self.best_black = self.best_black_number = -1
+        self.best_lead = self.best_lead_number = 0
+        for card in cards:
+            self.add(card)
+
+    @property
+    def winning_card(self) -> Card | None:
+        """
+        The card winning the trick so far, as `Game.winning_card` returns it.
+        """
+        return None if self.winner is None else self.cards[self.winner]
+
+    def add(self, card: Card) -> None:
+        """
+        Play the next card of the trick.
+
+        Args:
+            card (Card): Card played
+        """
+        i = len(self.cards)
+        self.cards.append(card)
+        card_id = card.id
+        if not self.trump:
+            code = trump_codes[card_id] if card_id >= 0 else -1
+            if code >= 0:
+                self.trump = trump_colors[code]
+        suit = card_suits[card_id] if card_id >= 0 else -1
+        if suit >= 0:
+            number = card_numbers[card_id]
+            if number > self.best_number:
+                self.best, self.best_number = i, number
+            if suit == BLACK and number > self.best_black_number:
+                self.best_black, self.best_black_number = i, number
+            if self.lead_suit < 0:
+                self.lead_suit = suit
+            if suit == self.lead_suit and number > self.best_lead_number:
+                self.best_lead, self.best_lead_number = i, number
+        elif card_id == PIRATE_ID:
+            if self.pirate < 0:
+                self.pirate = i
+        elif card_id == MERMAID_ID:
+            if self.mermaid < 0:
+                self.mermaid = i
+        elif card_id == SKULLKING_ID:
+            if self.skullking < 0:
+                self.skullking = i
+        elif card_id == WHITE_WHALE_ID:
+            self.white_whale = True
+        elif card_id == KRAKEN_ID:
+            self.kraken = True
+        self.winner = self._winner()
+
+    def _winner(self) -> int | None:
+        # the rules of `resolve_trick`
+        if self.white_whale:
+            return self.best if self.best_number else None
+        if self.kraken:
+            return None
+        if self.skullking >= 0:
+            return self.mermaid if self.mermaid > self.skullking else self.skullking
+        if self.pirate >= 0:
+            return self.pirate
+        if self.mermaid >= 0:
+            return self.mermaid
+        if self.best_black >= 0:
+            return self.best_black
+        return self.best_lead
+
+    def takes_lead(self, card: Card) -> bool:
+        """
+        Whether playing a card next would make it win the trick so far, without playing it.
+
+        Args:
+            card (Card): Card that could be played
+
+        Returns:
+            bool: True if the card would become the winning card of the trick
+        """
+        card_id = card.id
+        suit = card_suits[card_id] if card_id >= 0 else -1
+        if self.white_whale or card_id == WHITE_WHALE_ID:
+            return suit >= 0 and card_numbers[card_id] > self.best_number
+        if self.kraken or card_id == KRAKEN_ID:
+            return False
+        if self.skullking >= 0:
+            # only the first mermaid played after the skull king captures it
+            return card_id == MERMAID_ID and self.mermaid < 0
+        if card_id == SKULLKING_ID:
+            return True
+        if self.pirate >= 0:
+            return False
+        if card_id == PIRATE_ID:
+            return True
+        if self.mermaid >= 0:
+            return False
+        if card_id == MERMAID_ID:
+            return True
+        if suit == BLACK:
+            return card_numbers[card_id] > self.best_black_number
+        if self.best_black >= 0:
+            return False
+        if suit >= 0:
+            return (self.lead_suit < 0 or suit == self.lead_suit) and card_numbers[card_id] > self.best_lead_number
+        # an escape only wins an empty trick
+        return not self.cards
@@ -0,0 +1,97 @@
+"""Headless, multi-process tournaments for The Great Dalmuti."""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple, Type
+
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.player import Player
+
+
+def play_games(player_defs: List[Tuple[str, Type[Player]]], num_games: int, seed: int) -> Dict[str, List[int]]:
+    """
+    Plays `num_games` quiet games in a row at one table, so the trades follow the previous rankings just like the `dalmuti` CLI.
+    Returns how many times each player finished in each rank (index 0 is first place).
+    """
+    random.seed(seed)
+    players = [player_class(name) for name, player_class in player_defs]
+    game = Game(players, show_print=False)
+    rank_counts = {name: [0] * len(players) for name, _ in player_defs}
+    try:
+        for _ in range(num_games):
+            for name, rank in game.play().items():
+                rank_counts[name][rank - 1] += 1
+    finally:
+        game.close()
+    return rank_counts
+
+
+class ArenaResults:
+    def __init__(self, player_names: List[str], z: float = 1.96) -> None:
+        self.z = z
+        self.num_games = 0
+        self.rank_counts: Dict[str, List[int]] = {name: [0] * len(player_names) for name in player_names}
+
+    def merge(self, rank_counts: Dict[str, List[int]]) -> None:
+        for name, counts in rank_counts.items():
+            totals = self.rank_counts[name]
+            for i, count in enumerate(counts):
+                totals[i] += count
+        self.num_games += sum(next(iter(rank_counts.values()), []))
+
+    def mean_rank(self, name: str) -> Tuple[float, float]:
+        """
+        Returns the mean finishing rank of a player and the half width of its confidence interval.
+        """
+        counts = self.rank_counts[name]
+        n = sum(counts)
+        if not n:
+            return math.nan, math.nan
+        mean = sum(rank * count for rank, count in enumerate(counts, 1)) / n
+        if n < 2:
+            return mean, math.inf
+        variance = sum(count * (rank - mean) ** 2 for rank, count in enumerate(counts, 1)) / (n - 1)
+        return mean, self.z * math.sqrt(variance / n)
+
+    def rank_share(self, name: str, rank: int) -> Tuple[float, float, float]:
+        """
+        Returns the share of games a player finished in `rank` with the lower and upper bounds of its Wilson score interval.
+        """
+        n = self.num_games
+        if not n:
+            return math.nan, math.nan, math.nan
+        p = self.rank_counts[name][rank - 1] / n
+        z2 = self.z ** 2
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half_width = self.z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+        return p, max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def run_arena(
+    player_defs: List[Tuple[str, Type[Player]]],
+    num_games: int,
+    workers: int | None = None,
+    chunk_size: int = 1000,
+    seed: int | None = None,
+    on_chunk: Callable[[ArenaResults, float], None] | None = None,
+) -> Tuple[ArenaResults, float]:
+    """
+    Splits `num_games` into chunks, plays them on a process pool and merges every chunk into the results as soon as its worker finishes.
+    `on_chunk` is called after each merge with the results so far and the elapsed seconds.
+    Returns the results and the total elapsed seconds.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    results = ArenaResults([name for name, _ in player_defs])
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for i, first_game in enumerate(range(0, num_games, chunk_size)):
+            games = min(chunk_size, num_games - first_game)
+            futures.append(executor.submit(play_games, player_defs, games, seed + i))
+        for future in as_completed(futures):
+            results.merge(future.result())
+            if on_chunk:
+                on_chunk(results, time.perf_counter() - start)
+    return results, time.perf_counter() - start
@@ -0,0 +1,171 @@
+"""
+Lockstep simulation of many Great Dalmuti rounds at once.
+
+Every game's hands are held in one (games, players, 13) count array, index 12 being the wilds.
+Each step advances the seat to play in every unfinished game with the rules and turn order of `Game.play`,
+all players following the greedy `CPU` policy.
+"""
+from random import Random
+from typing import Sequence
+
+import numpy as np
+
+from the_great_dalmuti.game import get_cards
+
+_ranks = np.arange(1, 13)
+
+
+def _count_hands(decks: np.ndarray, num_players: int) -> np.ndarray:
+    """
+    Deals every (shuffled) deck card by card around the table and returns the (games, players, 13) counts.
+    """
+    num_games, num_cards = decks.shape
+    seats = np.arange(num_cards) % num_players
+    index = (np.arange(num_games)[:, None] * num_players + seats) * 13 + decks - 1
+    return np.bincount(index.ravel(), minlength=num_games * num_players * 13).reshape(num_games, num_players, 13).astype(np.int16)
+
+
+def deal(seeds: Sequence[int], num_players: int) -> np.ndarray:
+    """
+    Deals one game per seed, each the same deal `Game.play` makes after `random.seed(seed)`.
+    """
+    cards = get_cards(shuffle_cards=False)
+    decks = np.empty((len(seeds), len(cards)), dtype=np.int64)
+    for i, seed in enumerate(seeds):
+        deck = cards.copy()
+        Random(seed).shuffle(deck)
+        decks[i] = deck
+    return _count_hands(decks, num_players)
+
+
+def random_deal(num_games: int, num_players: int, rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Deals `num_games` games with a vectorized shuffle, much faster than `deal` but not reproducible by `Game`.
+    """
+    rng = rng or np.random.default_rng()
+    cards = np.array(get_cards(shuffle_cards=False))
+    decks = cards[np.argsort(rng.random((num_games, len(cards))), axis=1)]
+    return _count_hands(decks, num_players)
+
+
+def _take_highest(counts: np.ndarray, n: int) -> np.ndarray:
+    above = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1] - counts
+    return np.minimum(np.maximum(n - above, 0), counts)
+
+
+def _take_lowest(counts: np.ndarray, n: int) -> np.ndarray:
+    below = np.cumsum(counts, axis=1) - counts
+    return np.minimum(np.maximum(n - below, 0), counts)
+
+
+def trade(hands: np.ndarray) -> None:
+    """
+    Makes the Dalmuti/Peon trades in place the way `CPU` players do: the Dalmutis give their highest cards and the Peons their lowest.
+    """
+    trades = [(0, -1, 2)]
+    if hands.shape[1] > 3:
+        trades.append((1, -2, 1))
+    for dalmuti, peon, n in trades:
+        given = _take_highest(hands[:, dalmuti], n)
+        received = _take_lowest(hands[:, peon], n)
+        hands[:, dalmuti] += received - given
+        hands[:, peon] += given - received
+
+
+def _next_seats(finished: np.ndarray, seats: np.ndarray) -> np.ndarray:
+    """
+    Returns the next seat after each of `seats` that has not finished yet.
+    """
+    num_players = finished.shape[1]
+    rows = np.arange(len(seats))
+    candidates = (seats[:, None] + np.arange(1, num_players + 1)) % num_players
+    waiting = ~finished[rows[:, None], candidates]
+    return candidates[rows, waiting.argmax(axis=1)]
+
+
+def play(hands: np.ndarray) -> np.ndarray:
+    """
+    Plays out every dealt (and traded) game and returns the (games, players) finishing rank of each seat, 1 being the first.
+    `hands` is not modified.
+    """
+    hands = hands.astype(np.int16)
+    num_games, num_players, _ = hands.shape
+    sizes = hands.sum(axis=2)
+    seat = np.zeros(num_games, dtype=np.int64)
+    last = np.full(num_games, -1, dtype=np.int64)
+    trick_rank = np.zeros(num_games, dtype=np.int64)
+    trick_len = np.zeros(num_games, dtype=np.int64)
+    finished = np.zeros((num_games, num_players), dtype=bool)
+    num_finished = np.zeros(num_games, dtype=np.int64)
+    ranks = np.zeros((num_games, num_players), dtype=np.int64)
+    active = np.arange(num_games)
+
+    while len(active):
+        current = seat[active]
+        empty = sizes[active, current] == 0
+
+        # players out of cards leave the table the next time their turn comes up
+        games, seats = active[empty], current[empty]
+        if len(games):
+            finished[games, seats] = True
+            num_finished[games] += 1
+            ranks[games, seats] = num_finished[games]
+            still_playing = num_finished[games] < num_players
+            games, seats = games[still_playing], seats[still_playing]
+            next_seats = _next_seats(finished[games], seats)
+            won_trick = (last[games] == -1) | (last[games] == seats)
+            trick_rank[games[won_trick]] = 0
+            trick_len[games[won_trick]] = 0
+            last[games[won_trick]] = next_seats[won_trick]
+            seat[games] = next_seats
+
+        games, seats = active[~empty], current[~empty]
+        if len(games):
+            # everyone passed back to the last player to play
+            won_trick = last[games] == seats
+            trick_rank[games[won_trick]] = 0
+            trick_len[games[won_trick]] = 0
+
+            hand = hands[games, seats]
+            wilds = hand[:, 12]
+            naturals = hand[:, :12]
+            length = trick_len[games]
+            leading = length == 0
+
+            # leads play all copies of their highest card, wilds only when nothing else is left
+            lead_rank = np.where(naturals > 0, _ranks, 0).max(axis=1)
+            lead_rank = np.where(lead_rank > 0, lead_rank, 13)
+
+            # follows play the highest lower card that uses up all of its copies, completed with wilds
+            fits = (_ranks < trick_rank[games][:, None]) & (naturals > 0) & (naturals <= length[:, None]) & (naturals + wilds[:, None] >= length[:, None])
+            follow_rank = np.where(fits, _ranks, 0).max(axis=1)
+
+            rank = np.where(leading, lead_rank, follow_rank)
+            played = rank > 0
+            rows = np.flatnonzero(played)
+            rank_index = rank[rows] - 1
+            num_naturals = hand[rows, rank_index]
+            count = np.where(leading[rows], num_naturals, length[rows])
+            num_wilds = np.where(rank[rows] == 13, 0, count - num_naturals)
+
+            games_played, seats_played = games[rows], seats[rows]
+            hands[games_played, seats_played, rank_index] -= num_naturals.astype(np.int16)
+            hands[games_played, seats_played, 12] -= num_wilds.astype(np.int16)
+            sizes[games_played, seats_played] -= count
+            trick_rank[games_played] = rank[rows]
+            trick_len[games_played] = count
+            last[games_played] = seats_played
+            seat[games] = _next_seats(finished[games], seats)
+
+        active = active[num_finished[active] < num_players]
+    return ranks
+
+
+def simulate(seeds: Sequence[int], num_players: int, trade_cards: bool = True) -> np.ndarray:
+    """
+    Deals, trades and plays one game per seed. The rankings match `Game(players).play()` for CPU players after `random.seed(seed)`.
+    """
+    hands = deal(seeds, num_players)
+    if trade_cards:
+        trade(hands)
+    return play(hands)
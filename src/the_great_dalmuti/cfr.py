@@ -0,0 +1,310 @@
+"""
+Monte Carlo counterfactual regret minimization (outcome sampling MCCFR) for an abstracted Great Dalmuti.
+
+The game is abstracted on both sides: a player only tells apart a few features of their hand and of the table
+(`info_key`), and chooses between at most three actions, passing or playing the highest or the lowest cards they can
+(`abstract_moves`), the concrete moves following the rules of `moves_against`, the same as `GameState.valid_play`.
+Information sets are hashed into fixed-size regret and average-strategy tables kept in shared memory, so worker
+processes can run iterations on their own and add their regrets into the same tables.
+
+A round lasts about a hundred moves, so the sampled returns are only corrected for the sampling of the decision being
+updated instead of the whole rest of the round, and the average strategy is the plain sum of the strategies played
+by the updated seat. Both trade a little bias for estimates that are not swamped by huge importance weights.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from the_great_dalmuti.game import get_cards
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import PASS, Move
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import RoundState, greedy_move, observe
+
+PASS_ACTION, HIGH, LOW = range(3)
+NUM_ACTIONS = 3
+
+
+def abstract_moves(state: RoundState) -> List[Move | None]:
+    """
+    Maps the legal moves of the seat to play to the abstract actions: the pass, the highest cards the way `CPU`
+    plays them (all copies of a card, completed with wilds when following), and the lowest card with as few wilds as
+    possible, all of its copies when leading. Actions that are not possible, or would repeat the highest cards, are None.
+    """
+    moves = state.legal_moves()
+    actions: List[Move | None] = [None] * NUM_ACTIONS
+    plays = [move for move in moves if move.count]
+    if len(plays) < len(moves):
+        actions[PASS_ACTION] = PASS
+    if plays:
+        high = greedy_move(state)
+        if not high.count:
+            high = min((move for move in plays if move.rank == plays[-1].rank), key=lambda move: move.wilds)
+        low_options = [move for move in plays if move.rank == plays[0].rank]
+        if state.trick_length:
+            low = min(low_options, key=lambda move: move.wilds)
+        else:
+            low = max(low_options, key=lambda move: (move.count - move.wilds, -move.wilds))
+        actions[HIGH] = high
+        if low != high:
+            actions[LOW] = low
+    return actions
+
+
+def _bucket(value: int, bounds: Sequence[int]) -> int:
+    return sum(value > bound for bound in bounds)
+
+
+def info_key(state: RoundState, actions: List[Move | None], card_counts: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Returns the abstraction of what the seat to play knows: buckets of their hand size and of the cards the abstract
+    actions would play, the trick to beat and the number of cards left to the closest opponent.
+    """
+    hand = state.hands[state.seat]
+    opponents = [count for seat, count in enumerate(card_counts) if seat != state.seat and count]
+    high, low = actions[HIGH], actions[LOW]
+    return (
+        len(card_counts),
+        _bucket(len(hand), (1, 2, 3, 6, 10)),
+        hand.num_wilds,
+        min(state.trick_length, 4),
+        (state.trick_rank + 3) // 4,
+        (high.rank + 3) // 4 if high else 0,
+        (low.rank + 3) // 4 if low else 0,
+        _bucket(min(opponents, default=0), (1, 2, 5)),
+    )
+
+
+def info_index(key: Tuple[int, ...], table_size: int) -> int:
+    # tuples of ints hash the same in every process, unlike strings
+    return hash(key) % table_size
+
+
+def regret_matching(regrets: Sequence[float], legal: Sequence[bool]) -> List[float]:
+    positive = [max(regret, 0.0) if allowed else 0.0 for regret, allowed in zip(regrets, legal)]
+    total = sum(positive)
+    if total > 0:
+        return [regret / total for regret in positive]
+    num_legal = sum(legal)
+    return [1 / num_legal if allowed else 0.0 for allowed in legal]
+
+
+def rewards(state: RoundState) -> List[float]:
+    worst = max(state.num_players - 1, 1)
+    return [(state.num_players - rank) / worst for rank in state.ranks()]
+
+
+def deal(num_players: int, rng: random.Random) -> RoundState:
+    cards = get_cards(shuffle_cards=False)
+    rng.shuffle(cards)
+    return RoundState([Hand(cards[seat::num_players]) for seat in range(num_players)])
+
+
+def _iterate(
+    regrets: np.ndarray,
+    num_players: int,
+    iterations: int,
+    epsilon: float,
+    rng: random.Random,
+) -> Tuple[Dict[int, List[float]], Dict[int, List[float]]]:
+    """
+    Runs outcome sampling iterations, each on a new deal with the seats taking turns at being updated.
+    The updated seat explores with probability `epsilon` and the others follow the current strategy.
+    Returns the regret and average-strategy increments by table index, the tables themselves are only read.
+    """
+    table_size = len(regrets)
+    actions_range = range(NUM_ACTIONS)
+    regret_deltas: Dict[int, List[float]] = {}
+    strategy_deltas: Dict[int, List[float]] = {}
+
+    for iteration in range(iterations):
+        update_seat = iteration % num_players
+        state = deal(num_players, rng)
+        # (table index, strategy, legal actions, sampled action, sampling probability) of the updated seat's decisions
+        decisions = []
+        while not state.is_over:
+            seat = state.seat
+            actions = abstract_moves(state)
+            legal = [action is not None for action in actions]
+            key = info_key(state, actions, [len(hand) for hand in state.hands])
+            index = info_index(key, table_size)
+            row = regrets[index].tolist()
+            delta = regret_deltas.get(index)
+            if delta is not None:
+                row = [regret + change for regret, change in zip(row, delta)]
+            strategy = regret_matching(row, legal)
+            if seat == update_seat:
+                num_legal = sum(legal)
+                sampling = [epsilon / num_legal + (1 - epsilon) * p if allowed else 0.0 for p, allowed in zip(strategy, legal)]
+                action = rng.choices(actions_range, weights=sampling)[0]
+                decisions.append((index, strategy, legal, action, sampling[action]))
+                totals = strategy_deltas.setdefault(index, [0.0] * NUM_ACTIONS)
+                for a in actions_range:
+                    totals[a] += strategy[a]
+            else:
+                action = rng.choices(actions_range, weights=strategy)[0]
+            state.apply(actions[action])  # type: ignore[arg-type]
+
+        # the return is only corrected for the sampling of each decision, not of the whole rest of the round:
+        # the product over a hundred moves would make the estimates far too noisy to learn from
+        utility = rewards(state)[update_seat] - 0.5
+        for index, strategy, legal, action, probability in decisions:
+            value = utility / probability
+            delta = regret_deltas.setdefault(index, [0.0] * NUM_ACTIONS)
+            for a in actions_range:
+                if legal[a]:
+                    delta[a] -= strategy[action] * value
+            delta[action] += value
+    return regret_deltas, strategy_deltas
+
+
+def _merge(table: np.ndarray, deltas: Dict[int, List[float]]) -> None:
+    if deltas:
+        indices = np.fromiter(deltas, dtype=np.int64, count=len(deltas))
+        table[indices] += np.array(list(deltas.values()))
+
+
+_worker_tables: Tuple[SharedMemory, np.ndarray, np.ndarray] | None = None
+_worker_lock = None
+
+
+def _attach(name: str, table_size: int, lock) -> None:
+    global _worker_tables, _worker_lock
+    memory = SharedMemory(name=name)
+    tables = np.ndarray((2, table_size, NUM_ACTIONS), dtype=np.float64, buffer=memory.buf)
+    _worker_tables = (memory, tables[0], tables[1])
+    _worker_lock = lock
+
+
+def _work(num_players: int, iterations: int, epsilon: float, seed: int) -> int:
+    assert _worker_tables is not None and _worker_lock is not None
+    _, regrets, strategy_sum = _worker_tables
+    regret_deltas, strategy_deltas = _iterate(regrets, num_players, iterations, epsilon, random.Random(seed))
+    with _worker_lock:
+        _merge(regrets, regret_deltas)
+        _merge(strategy_sum, strategy_deltas)
+    return iterations
+
+
+def _normalize(strategy_sum: np.ndarray) -> np.ndarray:
+    totals = strategy_sum.sum(axis=1, keepdims=True)
+    return np.divide(strategy_sum, totals, out=np.full_like(strategy_sum, 1 / NUM_ACTIONS), where=totals > 0)
+
+
+class CFRTrainer:
+    """
+    Holds the regret and average-strategy tables of `table_size` hashed information sets in shared memory
+    and runs MCCFR iterations on them. Call `close` to free the shared memory.
+    """
+    def __init__(self, num_players: int = 4, table_size: int = 1 << 16, epsilon: float = 0.2, seed: int | None = None) -> None:
+        self.num_players = num_players
+        self.table_size = table_size
+        self.epsilon = epsilon
+        self.iterations = 0
+        self.rng = random.Random(seed)
+        self._memory = SharedMemory(create=True, size=2 * table_size * NUM_ACTIONS * 8)
+        tables = np.ndarray((2, table_size, NUM_ACTIONS), dtype=np.float64, buffer=self._memory.buf)
+        tables[:] = 0
+        self.regrets = tables[0]
+        self.strategy_sum = tables[1]
+
+    def train(
+        self,
+        iterations: int,
+        workers: int = 1,
+        batch_size: int = 1000,
+        checkpoint: str | None = None,
+        on_batch: Callable[["CFRTrainer"], None] | None = None,
+    ) -> None:
+        """
+        Runs `iterations` iterations in batches of `batch_size`, on `workers` processes when above 1.
+        Every worker adds its batch into the shared tables when it is done. With `checkpoint`, the tables are saved there
+        after every batch. `on_batch` is called with the trainer after every batch.
+        """
+        batches = [min(batch_size, iterations - start) for start in range(0, iterations, batch_size)]
+
+        def finish_batch(done: int) -> None:
+            self.iterations += done
+            if checkpoint:
+                self.save(checkpoint)
+            if on_batch:
+                on_batch(self)
+
+        if workers <= 1:
+            for size in batches:
+                regret_deltas, strategy_deltas = _iterate(self.regrets, self.num_players, size, self.epsilon, self.rng)
+                _merge(self.regrets, regret_deltas)
+                _merge(self.strategy_sum, strategy_deltas)
+                finish_batch(size)
+            return
+
+        lock = Lock()
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(self._memory.name, self.table_size, lock)) as executor:
+            futures = [
+                executor.submit(_work, self.num_players, size, self.epsilon, self.rng.randrange(2 ** 32)) for size in batches
+            ]
+            for future in futures:
+                finish_batch(future.result())
+
+    def average_strategy(self) -> np.ndarray:
+        """
+        Returns the (table_size, 3) average strategy, uniform where an information set was never reached.
+        """
+        return _normalize(self.strategy_sum)
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            regrets=self.regrets,
+            strategy_sum=self.strategy_sum,
+            num_players=self.num_players,
+            iterations=self.iterations,
+            epsilon=self.epsilon,
+        )
+
+    @classmethod
+    def load(cls, path: str, seed: int | None = None) -> "CFRTrainer":
+        with np.load(path) as data:
+            trainer = cls(int(data['num_players']), len(data['regrets']), float(data['epsilon']), seed)
+            trainer.regrets[:] = data['regrets']
+            trainer.strategy_sum[:] = data['strategy_sum']
+            trainer.iterations = int(data['iterations'])
+        return trainer
+
+    def close(self) -> None:
+        self._memory.close()
+        self._memory.unlink()
+
+
+def load_policy(path: str) -> np.ndarray:
+    """
+    Returns the average strategy saved in a checkpoint.
+    """
+    with np.load(path) as data:
+        return _normalize(data['strategy_sum'])
+
+
+class CFRPolicy(CPU):
+    """
+    Plays the abstract action with the highest probability in a trained average strategy, one hash and one table lookup
+    per move, preferring the highest cards on ties. Trades follow the `CPU` policy.
+    """
+    def __init__(self, name: str, policy: np.ndarray | str) -> None:
+        super().__init__(name)
+        self.policy = load_policy(policy) if isinstance(policy, str) else policy
+
+    def play(self, game_state: GameState) -> List[int]:
+        if not self.num_cards:
+            return []
+        observation = observe(game_state, self)
+        state = observation.state
+        actions = abstract_moves(state)
+        key = info_key(state, actions, observation.card_counts)
+        probabilities = self.policy[info_index(key, len(self.policy))]
+        action = max((a for a in (HIGH, LOW, PASS_ACTION) if actions[a] is not None), key=lambda a: probabilities[a])
+        return self.play_move(actions[action])  # type: ignore[arg-type]
@@ -0,0 +1,152 @@
+"""
+Exact endgame solver for The Great Dalmuti.
+
+When few cards are left the rest of a round can be searched completely. Every player picks the move that gets them out of
+cards the soonest, assuming everyone after them does the same (max^n search), and solved positions are stored in a
+transposition table so positions reached through different orders of play are only searched once.
+"""
+import random
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Mapping, Tuple
+
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import Move
+from the_great_dalmuti.player import CPU, Player
+from the_great_dalmuti.round_state import RoundState, observe
+
+
+class TranspositionTable:
+    """
+    Maps positions to the finishing order of the players still holding cards, forgetting the least recently used
+    positions once it holds `max_entries` of them.
+    """
+    def __init__(self, max_entries: int = 1_000_000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[int, ...] | None:
+        order = self._entries.get(key)
+        if order is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return order
+
+    def put(self, key: Hashable, order: Tuple[int, ...]) -> None:
+        self._entries[key] = order
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def position_key(state: RoundState) -> Hashable:
+    """
+    Returns a key holding everything that decides how the rest of the round goes, whatever happened before.
+    """
+    return (
+        tuple(hand.encode() for hand in state.hands),
+        state.seat,
+        state.active,
+        state.last_seat,
+        state.trick_rank,
+        state.trick_length,
+    )
+
+
+class EndgameSolver:
+    def __init__(self, table: TranspositionTable | None = None) -> None:
+        self.table = table if table is not None else TranspositionTable()
+
+    def _order_after(self, state: RoundState, move: Move) -> Tuple[int, ...]:
+        num_finished = len(state.finished)
+        state.apply(move)
+        order = tuple(state.finished[num_finished:]) + self.solve(state)
+        state.undo()
+        return order
+
+    def solve(self, state: RoundState) -> Tuple[int, ...]:
+        """
+        Returns the seats still in the round in the order they run out of cards with perfect play.
+        `state` is searched in place and left as it was.
+        """
+        if state.is_over:
+            return ()
+        key = position_key(state)
+        order = self.table.get(key)
+        if order is not None:
+            return order
+        seat = state.seat
+        best = None
+        for move in state.legal_moves():
+            child_order = self._order_after(state, move)
+            if best is None or child_order.index(seat) < best.index(seat):
+                best = child_order
+                if best[0] == seat:
+                    break
+        assert best is not None
+        self.table.put(key, best)
+        return best
+
+    def move_values(self, state: RoundState) -> List[Tuple[Move, int]]:
+        """
+        Returns every legal move of the player in `seat` with the number of players who finish before them after it.
+        """
+        return [(move, self._order_after(state, move).index(state.seat)) for move in state.legal_moves()]
+
+    def best_move(self, state: RoundState) -> Move:
+        return min(self.move_values(state), key=lambda value: value[1])[0]
+
+
+def known_state(game_state: GameState, player: Player, hands: Mapping[str, Iterable[int]]) -> RoundState:
+    """
+    Builds the round seen by `player`, whose turn it is, with the hands of the other players filled in from `hands`.
+    """
+    observation = observe(game_state, player)
+    state = observation.state.clone()
+    for seat, other in enumerate(game_state.players):
+        if seat != observation.seat:
+            state.hands[seat] = Hand(hands[other.name])
+    return state
+
+
+class EndgameCPU(CPU):
+    """
+    Plays like `CPU` until the players hold `max_cards` cards or fewer in total, then deals the unseen cards
+    `determinizations` times and plays the move that finishes earliest on average according to the endgame solver.
+    """
+    def __init__(
+        self,
+        name: str,
+        max_cards: int = 12,
+        determinizations: int = 20,
+        max_entries: int = 1_000_000,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(name)
+        self.max_cards = max_cards
+        self.determinizations = determinizations
+        self.solver = EndgameSolver(TranspositionTable(max_entries))
+        self._rng = random.Random(seed)
+
+    def play(self, game_state: GameState) -> List[int]:
+        if not self.num_cards or sum(game_state.get_player_card_count().values()) > self.max_cards:
+            return super().play(game_state)
+        observation = observe(game_state, self)
+        moves = observation.state.legal_moves()
+        if len(moves) == 1:
+            return self.play_move(moves[0])
+        totals = dict.fromkeys(moves, 0)
+        for _ in range(self.determinizations):
+            for move, value in self.solver.move_values(observation.determinize(self._rng)):
+                totals[move] += value
+        return self.play_move(min(moves, key=lambda move: totals[move]))
@@ -0,0 +1,244 @@
+"""
+Self-play environment for training Great Dalmuti policies, stepping many games at once.
+
+Like `batch`, every game's hands live in one (games, players, 13) count array. Each `step` takes one action per game
+for the seat whose turn it is, so a single policy plays every seat. Actions are indices into `ACTIONS`, and the
+observations carry a mask of the legal ones following the rules of `moves_against`.
+Finished games are dealt again right away, so `step` can be called in a loop without resets.
+"""
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from the_great_dalmuti.batch import _next_seats, random_deal, trade
+from the_great_dalmuti.moves import PASS, Move
+
+# every possible move: the pass, then each card with 1 up to all of its copies and 0 to 2 wilds, then wilds alone
+ACTIONS: List[Move] = [PASS] + [
+    Move(card, natural + wilds, wilds) for card in range(1, 13) for natural in range(1, card + 1) for wilds in range(3)
+] + [Move(13, wilds, wilds) for wilds in (1, 2)]
+ACTION_INDEX: Dict[Move, int] = {move: i for i, move in enumerate(ACTIONS)}
+
+_action_rank = np.array([move.rank for move in ACTIONS])
+_action_count = np.array([move.count for move in ACTIONS])
+_action_wilds = np.array([move.wilds for move in ACTIONS])
+_action_natural = _action_count - _action_wilds
+# the hand column holding the natural cards of each action, the wilds for a pass or wilds alone
+_action_column = np.where((_action_rank > 0) & (_action_rank < 13), _action_rank - 1, 12)
+
+Observation = Dict[str, np.ndarray]
+
+
+def legal_mask(hands: np.ndarray, trick_rank: np.ndarray, trick_length: np.ndarray) -> np.ndarray:
+    """
+    Returns the (games, actions) mask of the moves each hand can make against the current trick, a length of 0 meaning a lead.
+    """
+    wilds = hands[:, 12:13]
+    held = (hands[:, _action_column] >= np.where(_action_rank == 13, _action_wilds, _action_natural)) & (wilds >= _action_wilds)
+    leading = (trick_length == 0)[:, None]
+    follows = (_action_count == trick_length[:, None]) & ((_action_rank < trick_rank[:, None]) | (_action_rank == 13))
+    mask = held & np.where(leading, _action_count > 0, follows)
+    mask[:, 0] = ~leading[:, 0]
+    return mask
+
+
+class DalmutiEnv:
+    """
+    Runs `num_envs` games of `num_players` players in lockstep. Every deal starts with seat 0 as the Greater Dalmuti,
+    and when `trade_cards` is set the Dalmutis and Peons trade the way `CPU` players do.
+
+    Observations are seen by the seat to move, with the seats rotated so index 0 is that seat:
+    `hand` (games, 13) its cards, `card_counts` (games, players) the cards held by each seat, `played` (games, 13)
+    the cards played since the deal, `last_play` (games, 2) the card and number of cards to beat (0, 0 when leading),
+    `seat` (games,) the seat to move and `action_mask` (games, actions) its legal actions.
+    """
+    def __init__(self, num_envs: int, num_players: int = 4, seed: int | None = None, trade_cards: bool = True) -> None:
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.trade_cards = trade_cards
+        self.rng = np.random.default_rng(seed)
+        self.hands = np.zeros((num_envs, num_players, 13), dtype=np.int16)
+        self.sizes = np.zeros((num_envs, num_players), dtype=np.int16)
+        self.played = np.zeros((num_envs, 13), dtype=np.int16)
+        self.seat = np.zeros(num_envs, dtype=np.int64)
+        self.last = np.zeros(num_envs, dtype=np.int64)
+        self.trick_rank = np.zeros(num_envs, dtype=np.int64)
+        self.trick_length = np.zeros(num_envs, dtype=np.int64)
+        self.finished = np.zeros((num_envs, num_players), dtype=bool)
+        self.num_finished = np.zeros(num_envs, dtype=np.int64)
+        self.ranks = np.zeros((num_envs, num_players), dtype=np.int64)
+
+    def _deal(self, games: np.ndarray) -> None:
+        hands = random_deal(len(games), self.num_players, self.rng)
+        if self.trade_cards:
+            trade(hands)
+        self.hands[games] = hands
+        self.sizes[games] = hands.sum(axis=2)
+        self.played[games] = 0
+        self.seat[games] = 0
+        self.last[games] = -1
+        self.trick_rank[games] = 0
+        self.trick_length[games] = 0
+        self.finished[games] = False
+        self.num_finished[games] = 0
+        self.ranks[games] = 0
+
+    def _advance(self, games: np.ndarray) -> None:
+        """
+        Moves every game on to the next seat that has to play, with the rules and turn order of `Game.play`.
+        """
+        while len(games):
+            seats = self.seat[games]
+            empty = self.sizes[games, seats] == 0
+
+            # everyone passed back to the last player to play
+            playing, playing_seats = games[~empty], seats[~empty]
+            won_trick = playing[self.last[playing] == playing_seats]
+            self.trick_rank[won_trick] = 0
+            self.trick_length[won_trick] = 0
+
+            # players out of cards leave the table the next time their turn comes up
+            games, seats = games[empty], seats[empty]
+            self.finished[games, seats] = True
+            self.num_finished[games] += 1
+            self.ranks[games, seats] = self.num_finished[games]
+            still_playing = self.num_finished[games] < self.num_players
+            games, seats = games[still_playing], seats[still_playing]
+            next_seats = _next_seats(self.finished[games], seats)
+            won_trick = (self.last[games] == -1) | (self.last[games] == seats)
+            self.trick_rank[games[won_trick]] = 0
+            self.trick_length[games[won_trick]] = 0
+            self.last[games[won_trick]] = next_seats[won_trick]
+            self.seat[games] = next_seats
+
+    def observe(self) -> Observation:
+        rows = np.arange(self.num_envs)[:, None]
+        rotation = (self.seat[:, None] + np.arange(self.num_players)) % self.num_players
+        hands = self.hands[np.arange(self.num_envs), self.seat]
+        return {
+            'hand': hands.copy(),
+            'card_counts': self.sizes[rows, rotation],
+            'played': self.played.copy(),
+            'last_play': np.stack([self.trick_rank, self.trick_length], axis=1),
+            'seat': self.seat.copy(),
+            'action_mask': legal_mask(hands, self.trick_rank, self.trick_length),
+        }
+
+    def reset(self) -> Observation:
+        """
+        Deals new games everywhere and returns the first observations.
+        """
+        self._deal(np.arange(self.num_envs))
+        return self.observe()
+
+    def step(self, actions: np.ndarray) -> Tuple[Observation, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Plays one action in every game for the seat to move.
+        Returns the next observations, the (games, players) rewards, 1 for the first player out of cards down to 0 for
+        the last and only given when a game ends, which games ended, and `ranks` (games, players) of the ended games.
+        Ended games are dealt again, their observations are of the new deal.
+        """
+        actions = np.asarray(actions)
+        games = np.arange(self.num_envs)
+        seats = self.seat
+        hands = self.hands[games, seats]
+        if not legal_mask(hands, self.trick_rank, self.trick_length)[games, actions].all():
+            raise ValueError('Illegal action.')
+
+        natural = _action_natural[actions]
+        wilds = _action_wilds[actions]
+        column = _action_column[actions]
+        played = games[actions > 0]
+        natural_played = np.where(_action_rank[actions] == 13, 0, natural)
+        self.hands[games, seats, column] -= natural_played.astype(np.int16)
+        self.hands[games, seats, 12] -= wilds.astype(np.int16)
+        self.sizes[games, seats] -= _action_count[actions].astype(np.int16)
+        self.played[games, column] += natural_played.astype(np.int16)
+        self.played[games, 12] += wilds.astype(np.int16)
+        self.trick_rank[played] = _action_rank[actions[played]]
+        self.trick_length[played] = _action_count[actions[played]]
+        self.last[played] = seats[played]
+        self.seat = _next_seats(self.finished, seats)
+        self._advance(games)
+
+        dones = self.num_finished == self.num_players
+        ranks = np.where(dones[:, None], self.ranks, 0)
+        rewards = np.where(dones[:, None], (self.num_players - ranks) / max(self.num_players - 1, 1), 0.0)
+        if dones.any():
+            self._deal(np.flatnonzero(dones))
+        return self.observe(), rewards, dones, {'ranks': ranks}
+
+
+def _worker(remote: Connection, parent_remote: Connection, num_envs: int, num_players: int, seed: int | None, trade_cards: bool) -> None:
+    parent_remote.close()
+    env = DalmutiEnv(num_envs, num_players, seed, trade_cards)
+    while True:
+        command, data = remote.recv()
+        if command == 'step':
+            remote.send(env.step(data))
+        elif command == 'reset':
+            remote.send(env.reset())
+        elif command == 'close':
+            remote.close()
+            break
+
+
+def _concatenate(observations: List[Observation]) -> Observation:
+    return {key: np.concatenate([observation[key] for observation in observations]) for key in observations[0]}
+
+
+class SubprocVecEnv:
+    """
+    Runs a `DalmutiEnv` of `envs_per_worker` games in each of `num_workers` processes, stepping them in parallel.
+    Observations and results are concatenated in worker order, so game i lives in worker i // envs_per_worker.
+    """
+    def __init__(
+        self,
+        num_workers: int,
+        envs_per_worker: int,
+        num_players: int = 4,
+        seed: int | None = None,
+        trade_cards: bool = True,
+    ) -> None:
+        self.num_envs = num_workers * envs_per_worker
+        self.envs_per_worker = envs_per_worker
+        seeds = np.random.SeedSequence(seed).spawn(num_workers)
+        self.remotes: List[Connection] = []
+        self.processes: List[Process] = []
+        for worker_seed in seeds:
+            remote, work_remote = Pipe()
+            process = Process(
+                target=_worker,
+                args=(work_remote, remote, envs_per_worker, num_players, int(worker_seed.generate_state(1)[0]), trade_cards),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+    def reset(self) -> Observation:
+        for remote in self.remotes:
+            remote.send(('reset', None))
+        return _concatenate([remote.recv() for remote in self.remotes])
+
+    def step(self, actions: np.ndarray) -> Tuple[Observation, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        actions = np.asarray(actions)
+        for i, remote in enumerate(self.remotes):
+            remote.send(('step', actions[i * self.envs_per_worker:(i + 1) * self.envs_per_worker]))
+        results = [remote.recv() for remote in self.remotes]
+        observations, rewards, dones, infos = zip(*results)
+        return (
+            _concatenate(list(observations)),
+            np.concatenate(rewards),
+            np.concatenate(dones),
+            _concatenate(list(infos)),
+        )
+
+    def close(self) -> None:
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
@@ -1,7 +1,11 @@
 from random import shuffle
 from the_great_dalmuti.player import Player, CPU, Human
 from the_great_dalmuti.game_state import GameState
-from typing import List, Dict, Self, Tuple, Sequence
+from the_great_dalmuti.round_state import next_seat, to_move
+from typing import List, Dict, Self, Tuple, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from the_great_dalmuti.replay import Recorder
 
 
 def get_cards(shuffle_cards=True):
@@ -15,20 +19,28 @@ def get_cards(shuffle_cards=True):
 
 
 class Game:
-  def __init__(self, players: List[CPU], show_print: bool = True) -> None:
+  def __init__(self, players: List[CPU], show_print: bool = True, recorder: "Recorder | None" = None) -> None:
     # shuffle(players)
     self.players = players
     self.cards = get_cards()
     self.game_state = GameState([p for p in players])
     self.num_players = len(players)
     self.show_print = show_print
+    self.recorder = recorder
 
   def play(self):
     # shuffle cards
     self.cards = get_cards()
     # Deal cards
+    for player in self.players:
+      player.num_players = self.num_players
     for i, card in enumerate(self.cards):
       self.players[i % self.num_players].add_cards(card)
+    # trades keep the number of cards of every player
+    self.game_state.refresh_card_counts()
+    recorder = self.recorder
+    if recorder:
+      recorder.start_game([p.name for p in self.players], self.cards)
     
     if self.show_print:
       print(self.game_state)
@@ -38,6 +50,9 @@ class Game:
     greater_peons_cards = self.players[-1].give_low_cards(2)
     self.players[0].add_cards(greater_peons_cards)
     self.players[-1].add_cards(greater_dalmutis_cards)
+    if recorder:
+      recorder.trade(0, self.num_players - 1, greater_dalmutis_cards)
+      recorder.trade(self.num_players - 1, 0, greater_peons_cards)
     
     # if more than 3 players, second player trades one card with the second to last player
     if len(self.players) > 3:
@@ -45,65 +60,59 @@ class Game:
       lesser_peons_cards = self.players[-2].give_low_cards(1)
       self.players[1].add_cards(lesser_peons_cards)
       self.players[-2].add_cards(lesser_dalmutis_cards)
+      if recorder:
+        recorder.trade(1, self.num_players - 2, lesser_dalmutis_cards)
+        recorder.trade(self.num_players - 2, 1, lesser_peons_cards)
 
-    last_player_to_play = None
-    game_over = False
-    finished_players = []
-    
-    while self.players:
-      player = self.players.pop(0)
-      
-      while not player.has_cards():
-        finished_players.append(player)
-        if not self.players:
-          game_over = True
-          break
-        if not last_player_to_play:
-          last_player_to_play = player
-        elif player == last_player_to_play:
-          if self.show_print:
-            print(f"{player.name} has won the trick but has no cards.")
-          self.game_state.clear_current_round()
-          if not self.players:
-            break
-          player = self.players.pop(0)
-          if self.show_print:
-            print(f'{player.name}\'s turn to play.')
-          last_player_to_play = player
-        else:
-          if self.show_print:
-            print(f"{player.name} has no cards, skipping turn.")
-          if not self.players:
-            break
-          player = self.players.pop(0)
-      if game_over:
-        break
-      
-      if player == last_player_to_play:
-        if self.show_print:
-          print(f"{player.name} has won the trick.")
-          print(self.game_state)
-        self.game_state.clear_current_round()
+    # seats stay fixed, the round state keeps the turn order and shares the players' hands
+    seats = self.players
+    state = self.game_state.start_round()
+
+    while not state.is_over:
+      seat = state.seat
+      player = seats[seat]
       cards_played = player.play(self.game_state)
-      if cards_played:
-        last_player_to_play = player
       self.game_state.add_to_current_round(player.name, cards_played)
+      if recorder:
+        recorder.play(seat, cards_played)
       if self.show_print:
         print(f'{player.name} played: {cards_played}')
-      
       if not player.has_cards() and self.show_print:
         print(f"{player.name} has finished all their cards!")
 
-      self.players.append(player)
+      trick_winner = seat if cards_played else state.last_seat
+      trick_started = bool(cards_played or state.trick_length)
+      num_finished = len(state.finished)
+      state.apply(to_move(cards_played), take_cards=False)
+
+      # players out of cards leave the table the next time their turn comes up
+      if self.show_print:
+        for finished_seat in state.finished[num_finished:]:
+          print(f"{seats[finished_seat].name} is out of cards and leaves the table.")
+      if state.is_over:
+        break
+      if trick_started and not state.trick_length:
+        if self.show_print:
+          print(f"{seats[trick_winner].name} has won the trick.")
+          print(self.game_state)
+        self.game_state.clear_current_round()
+        if recorder:
+          recorder.clear()
 
       if self.show_print:
+        print(f'{seats[state.seat].name}\'s turn to play.')
         response = input()
         if response in ['q', 'quit', 'exit']:
           exit(0)
         elif response in ['s', 'show']:
-          for p in self.players:
-            print(f"{p.name}: {p._cards}")
-    
+          for i, p in enumerate(seats):
+            if state.active >> i & 1:
+              print(f"{p.name}: {p._cards}")
+
+    finished_seats = state.finished
+    finished_players = [seats[seat] for seat in finished_seats]
+    if recorder:
+      recorder.end_game(finished_seats)
     if self.show_print:
       print("Round Over! Rankings:")
       for i, player in enumerate(finished_players, 1):
@@ -113,3 +122,8 @@ class Game:
 
     return {player.name: i+1 for i, player in enumerate(finished_players)}
 
+  def close(self) -> None:
+    # the players are done playing, free their worker processes
+    for player in self.players:
+      player.close()
+
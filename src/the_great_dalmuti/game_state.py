@@ -1,55 +1,157 @@
+from types import MappingProxyType
 from typing import *
+from the_great_dalmuti.moves import Move, legal_moves, play_key
+from the_great_dalmuti.round_state import RoundState
 
 if TYPE_CHECKING:
+    from the_great_dalmuti.hand import Hand
     from the_great_dalmuti.player import Player, CPU, Human
 
 
+class PublicState(NamedTuple):
+    """
+    What every player can see of the game, frozen at the time it was taken.
+    """
+    card_counts: Mapping[str, int]
+    last_played: List[int] | None
+    last_player: str | None
+    pass_streak: int  # passes since the last cards were played in the current trick
+    played_cards: Tuple[int, ...]  # how many of each card (1-13) have been played since the deal
+
+
 class GameState:
     def __init__(self, players: List["Player"]) -> None:
         self.players: List["Player"] = players
         self._current_round: List[Tuple[str, List[int]]] = []
-    
+        self._history: List[Tuple[str, List[int]]] = []
+        self._last_played: List[int] | None = None
+        self._last_player: str | None = None
+        self._pass_streak: int = 0
+        self._played_cards: List[int] = [0] * 13
+        self._card_counts: Dict[str, int] = {}
+        self._snapshot: PublicState | None = None
+        self.round: RoundState | None = None
+        self.refresh_card_counts()
+
     def __repr__(self) -> str:
         return f"""
 {self._current_round}
-{self.get_player_card_count()}
+{dict(self._card_counts)}
 """
 
     def valid_play(self, cards: List[int]) -> bool:
         last_played = self.get_last_played()
         if not (last_played and cards):
             return True
-        
-        last_played_card = ((set(last_played) - {13}) or {13}).pop()
-        
-        if len(cards) != len(last_played):
+
+        last_played_card, last_played_count = play_key(last_played)
+
+        if len(cards) != last_played_count:
             print("You must play the same number of cards as the last played.")
             return False
-        
+
         if any(card >= last_played_card for card in cards if card != 13):
             print("You must play cards lower than the last played (excluding wilds).")
             return False
         return True
 
+    def legal_moves(self, hand: "Hand") -> List[Move]:
+        """
+        Returns every legal move for the hand against the last played cards.
+        """
+        return legal_moves(hand, self.get_last_played())
+
+    def refresh_card_counts(self) -> None:
+        """
+        Reads every player's number of cards again and starts a new deal, call it after cards are dealt.
+        Plays added to the current round keep the counts up to date afterwards.
+        """
+        self._card_counts = {player.name: player.num_cards for player in self.players}
+        self._played_cards = [0] * 13
+        self._history = []
+        self._snapshot = None
+
+    def start_round(self) -> RoundState:
+        """
+        Starts the deal's round on a `RoundState` sharing the players' hands, with seats in the order of `players`.
+        The players still take their own cards when they play, the round is told about every move with `apply(move, take_cards=False)`.
+        """
+        self.refresh_card_counts()
+        self.round = RoundState([player._cards for player in self.players])
+        return self.round
+
     def clear_current_round(self) -> None:
         self._current_round = []
+        self._last_played = None
+        self._last_player = None
+        self._pass_streak = 0
+        self._snapshot = None
 
     def get_current_round(self) -> List[Tuple[str, List[int]]]:
         return self._current_round
 
     def add_to_current_round(self, player_name: str, cards: List[int]) -> None:
-        if not self.valid_play(cards):
+        valid = self.valid_play(cards)
+        if not valid:
             print(f"Invalid play attempted by {player_name} with cards {cards} on {self.get_last_played()}")
-        assert self.valid_play(cards)
+        assert valid
         self._current_round.append((player_name, cards))
+        self._history.append((player_name, cards))
+        if cards:
+            self._last_played = cards
+            self._last_player = player_name
+            self._pass_streak = 0
+            for card in cards:
+                self._played_cards[card - 1] += 1
+            if player_name in self._card_counts:
+                self._card_counts[player_name] -= len(cards)
+        else:
+            self._pass_streak += 1
+        self._snapshot = None
 
-    def get_player_card_count(self) -> Dict[str, int]:
-        return {player.name: player.num_cards for player in self.players}
+    def get_player_card_count(self) -> Mapping[str, int]:
+        """
+        Returns a read-only view of how many cards each player holds.
+        """
+        return MappingProxyType(self._card_counts)
+
+    def get_history(self) -> List[Tuple[str, List[int]]]:
+        """
+        Returns every play and pass since the deal, a new list is started with every deal.
+        """
+        return self._history
 
     def get_last_played(self) -> List[int] | None:
         """
         Returns the last played cards in the current round. Ignores players that passed. If no cards have been played, returns None.
         """
-        for _, cards in reversed(self._current_round):
-            if cards:
-                return cards
+        return self._last_played
+
+    def get_last_player(self) -> str | None:
+        """
+        Returns the name of the player who played the last cards in the current round, None if no cards have been played.
+        """
+        return self._last_player
+
+    def get_pass_streak(self) -> int:
+        return self._pass_streak
+
+    def get_played_cards(self) -> Tuple[int, ...]:
+        """
+        Returns how many of each card (index 0 for the 1s, index 12 for the wilds) have been played since the deal.
+        """
+        return tuple(self._played_cards)
+
+    def snapshot(self) -> PublicState:
+        """
+        Returns the public information of the game. It is only rebuilt after the state changes, so reading it every turn is free.
+        """
+        if self._snapshot is None:
+            self._snapshot = PublicState(
+                card_counts=MappingProxyType(dict(self._card_counts)),
+                last_played=self._last_played,
+                last_player=self._last_player,
+                pass_streak=self._pass_streak,
+                played_cards=tuple(self._played_cards),
+            )
+        return self._snapshot
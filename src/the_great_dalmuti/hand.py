@@ -0,0 +1,119 @@
+from typing import Iterable, Iterator, List
+
+
+class Hand:
+    """
+    A hand of Dalmuti cards stored as the number of each card (1-13) it holds.
+    Iterating, indexing and printing behave like the sorted list of cards players used to keep,
+    while counting, adding and removing cards no longer depends on the size of the hand.
+    """
+    __slots__ = ('_counts', '_size')
+
+    def __init__(self, cards: Iterable[int] = ()) -> None:
+        self._counts: List[int] = [0] * 13
+        self._size: int = 0
+        self.extend(cards)
+
+    @property
+    def counts(self) -> List[int]:
+        """
+        The number of each card in the hand, index 0 holds the 1s and index 12 the wilds. Do not modify it.
+        """
+        return self._counts
+
+    @property
+    def num_wilds(self) -> int:
+        return self._counts[12]
+
+    def count(self, card: int) -> int:
+        return self._counts[card - 1] if isinstance(card, int) and 1 <= card <= 13 else 0
+
+    def ranks(self) -> List[int]:
+        """
+        Returns the distinct non-wild cards in the hand from lowest to highest.
+        """
+        return [card for card, count in enumerate(self._counts[:12], 1) if count]
+
+    def add(self, card: int, n: int = 1) -> None:
+        self._counts[card - 1] += n
+        self._size += n
+
+    def extend(self, cards: Iterable[int]) -> None:
+        for card in cards:
+            self.add(card)
+
+    def take(self, card: int, n: int) -> List[int]:
+        """
+        Removes `n` copies of `card` from the hand and returns them.
+        """
+        if n > self.count(card):
+            raise ValueError(f'Hand has {self.count(card)} of {card}, cannot take {n}.')
+        self._counts[card - 1] -= n
+        self._size -= n
+        return [card] * n
+
+    def take_all(self, card: int) -> List[int]:
+        return self.take(card, self.count(card))
+
+    def remove(self, card: int) -> None:
+        self.take(card, 1)
+
+    def pop(self, index: int = -1) -> int:
+        card = self[index]
+        self.take(card, 1)
+        return card
+
+    def copy(self) -> "Hand":
+        hand = Hand()
+        hand._counts = self._counts.copy()
+        hand._size = self._size
+        return hand
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def encode(self) -> int:
+        """
+        Packs the counts into one integer, 4 bits per card with the 1s in the lowest bits. Equal hands have equal codes.
+        """
+        code = 0
+        for count in reversed(self._counts):
+            code = code << 4 | count
+        return code
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for card, count in enumerate(self._counts, 1):
+            for _ in range(count):
+                yield card
+
+    def __reversed__(self) -> Iterator[int]:
+        for card in range(13, 0, -1):
+            for _ in range(self._counts[card - 1]):
+                yield card
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('hand index out of range')
+        for card, count in enumerate(self._counts, 1):
+            if index < count:
+                return card
+            index -= count
+        raise IndexError('hand index out of range')
+
+    def __contains__(self, card: object) -> bool:
+        return self.count(card) > 0  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Hand):
+            return self._counts == other._counts
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
@@ -0,0 +1,185 @@
+"""
+Information-set Monte Carlo tree search (ISMCTS) player for The Great Dalmuti.
+
+Every iteration deals the cards the player has not seen to the other players at random, matching their public card counts,
+then walks one tree shared by all of these deals, only considering the moves legal in the current deal.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.moves import Move
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import Observation, RoundState, greedy_move, observe, to_move
+
+
+class Node:
+    __slots__ = ('player', 'children', 'visits', 'availability', 'reward')
+
+    def __init__(self, player: int) -> None:
+        self.player = player  # seat that made the move leading to this node
+        self.children: Dict[Move, Node] = {}
+        self.visits = 0
+        self.availability = 0
+        self.reward = 0.0
+
+
+def rewards(state: RoundState) -> List[float]:
+    """
+    Returns 1 for the first player out of cards down to 0 for the last one.
+    """
+    worst = max(state.num_players - 1, 1)
+    return [(state.num_players - rank) / worst for rank in state.ranks()]
+
+
+def search(
+    observation: Observation,
+    root: Node,
+    rng: random.Random,
+    iterations: int | None = None,
+    time_limit: float | None = None,
+    exploration: float = 0.7,
+    rollout_epsilon: float = 0.1,
+) -> None:
+    """
+    Runs ISMCTS iterations from `root` until `iterations` are done or `time_limit` seconds have passed, whichever comes first.
+    Rollouts follow the `CPU` policy, with a random move `rollout_epsilon` of the time.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit else math.inf
+    done = 0
+    while (iterations is None or done < iterations) and time.perf_counter() < deadline:
+        state = observation.determinize(rng)
+        node = root
+        path = []
+        while not state.is_over:
+            moves = state.legal_moves()
+            untried = [move for move in moves if move not in node.children]
+            for move in moves:
+                child = node.children.get(move)
+                if child:
+                    child.availability += 1
+            if untried:
+                move = rng.choice(untried)
+                child = node.children[move] = Node(state.seat)
+                child.availability = 1
+                state.apply(move)
+                path.append(child)
+                break
+            move = max(
+                moves,
+                key=lambda move: node.children[move].reward / node.children[move].visits
+                + exploration * math.sqrt(math.log(node.children[move].availability) / node.children[move].visits),
+            )
+            node = node.children[move]
+            state.apply(move)
+            path.append(node)
+
+        while not state.is_over:
+            if rng.random() < rollout_epsilon:
+                state.apply(rng.choice(state.legal_moves()))
+            else:
+                state.apply(greedy_move(state))
+
+        scores = rewards(state)
+        root.visits += 1
+        for node in path:
+            node.visits += 1
+            node.reward += scores[node.player]
+        done += 1
+
+
+def search_root(
+    observation: Observation,
+    seed: int,
+    iterations: int | None,
+    time_limit: float | None,
+    exploration: float,
+    rollout_epsilon: float,
+) -> Dict[Move, Tuple[int, float]]:
+    """
+    Searches a fresh tree and returns the visits and total reward of every move from the root, run by the worker processes.
+    """
+    root = Node(-1)
+    search(observation, root, random.Random(seed), iterations, time_limit, exploration, rollout_epsilon)
+    return {move: (child.visits, child.reward) for move, child in root.children.items()}
+
+
+class ISMCTS(CPU):
+    """
+    Picks the most visited move after searching with a budget of `iterations` and/or `time_limit` seconds per move.
+    The subtree of the chosen move is kept and reused on the next turn when the moves played in between are in it.
+    With `workers` above 1, that many extra processes search fresh trees at the same time and their root statistics are added in.
+    Their pool is started at the first search and shut down by `close`, which `Game.close` calls once the games are over.
+    Trades follow the `CPU` policy.
+    """
+    def __init__(
+        self,
+        name: str,
+        iterations: int | None = 200,
+        time_limit: float | None = None,
+        workers: int = 1,
+        exploration: float = 0.7,
+        rollout_epsilon: float = 0.1,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(name)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.exploration = exploration
+        self.rollout_epsilon = rollout_epsilon
+        self._rng = random.Random(seed)
+        self._executor: ProcessPoolExecutor | None = None
+        self._root: Node | None = None
+        self._history: List[Tuple[str, List[int]]] | None = None
+        self._history_seen = 0
+
+    def _reused_root(self, game_state: GameState) -> Node:
+        history = game_state.get_history()
+        node = self._root
+        if node is None or history is not self._history:
+            return Node(-1)
+        for _, cards in history[self._history_seen:]:
+            node = node.children.get(to_move(cards))
+            if node is None:
+                return Node(-1)
+        return node
+
+    def play(self, game_state: GameState) -> List[int]:
+        if not self.num_cards:
+            return []
+        observation = observe(game_state, self)
+        moves = observation.state.legal_moves()
+        root = self._reused_root(game_state) if len(moves) > 1 else Node(-1)
+
+        futures = []
+        if len(moves) > 1 and self.workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+            for _ in range(self.workers - 1):
+                futures.append(self._executor.submit(
+                    search_root, observation, self._rng.randrange(2 ** 32),
+                    self.iterations, self.time_limit, self.exploration, self.rollout_epsilon,
+                ))
+        if len(moves) > 1:
+            search(observation, root, self._rng, self.iterations, self.time_limit, self.exploration, self.rollout_epsilon)
+
+        visits = {move: root.children[move].visits if move in root.children else 0 for move in moves}
+        for future in futures:
+            for move, (move_visits, _) in future.result().items():
+                if move in visits:
+                    visits[move] += move_visits
+        best = max(moves, key=lambda move: visits[move])
+
+        self._root = root.children.get(best)
+        self._history = game_state.get_history()
+        self._history_seen = len(self._history) + 1
+        return self.play_move(best)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,188 @@
+"""
+Rating ladder for Great Dalmuti players.
+
+Every player class gets a Weng-Lin (Bradley-Terry) rating, a TrueSkill-like skill estimate `mu` with an uncertainty
+`sigma`. Matches are scheduled on a process pool, each table built around the player whose rating is the least certain,
+and ratings are updated after every game and stored in SQLite, so a ladder can be stopped and resumed at any time.
+"""
+import math
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Mapping, NamedTuple, Sequence, Tuple, Type
+
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.player import Player
+
+MU = 25.0
+SIGMA = MU / 3
+BETA = SIGMA / 2
+KAPPA = 0.0001
+
+
+class Rating(NamedTuple):
+    mu: float = MU
+    sigma: float = SIGMA
+
+    @property
+    def conservative(self) -> float:
+        """
+        A skill the player is very likely above, used to order the ladder.
+        """
+        return self.mu - 3 * self.sigma
+
+
+def rate(ratings: Sequence[Rating], ranks: Sequence[int], beta: float = BETA, kappa: float = KAPPA) -> List[Rating]:
+    """
+    Returns the ratings after a game where each player finished in the given rank (1 being the first),
+    comparing every pair of players with the Bradley-Terry model of Weng and Lin (2011).
+    """
+    updated = []
+    for i, (mu, sigma) in enumerate(ratings):
+        omega = delta = 0.0
+        for q, (mu_q, sigma_q) in enumerate(ratings):
+            if q == i:
+                continue
+            c = math.sqrt(sigma ** 2 + sigma_q ** 2 + 2 * beta ** 2)
+            p = 1 / (1 + math.exp((mu_q - mu) / c))
+            score = 1.0 if ranks[i] < ranks[q] else 0.5 if ranks[i] == ranks[q] else 0.0
+            omega += sigma ** 2 / c * (score - p)
+            delta += sigma / c * sigma ** 2 / c ** 2 * p * (1 - p)
+        updated.append(Rating(mu + omega, sigma * math.sqrt(max(1 - delta, kappa))))
+    return updated
+
+
+class RatingStore:
+    """
+    Keeps the ratings and game results of a ladder in an SQLite database.
+    """
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS ratings (name TEXT PRIMARY KEY, mu REAL NOT NULL, sigma REAL NOT NULL, games INTEGER NOT NULL)'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, finishing_order TEXT NOT NULL, played_at REAL NOT NULL)'
+            )
+
+    def register(self, names: Sequence[str]) -> None:
+        """
+        Adds players that are not on the ladder yet with the default rating.
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO ratings (name, mu, sigma, games) VALUES (?, ?, ?, 0)',
+                [(name, MU, SIGMA) for name in names],
+            )
+
+    def ratings(self) -> Dict[str, Rating]:
+        rows = self.connection.execute('SELECT name, mu, sigma FROM ratings')
+        return {name: Rating(mu, sigma) for name, mu, sigma in rows}
+
+    def games_played(self) -> Dict[str, int]:
+        return dict(self.connection.execute('SELECT name, games FROM ratings'))
+
+    def record(self, finishing_order: Sequence[str]) -> Dict[str, Rating]:
+        """
+        Rates a game from the names of its players in finishing order and stores the game with the new ratings.
+        Returns the new ratings of the players.
+        """
+        current = self.ratings()
+        updated = rate([current[name] for name in finishing_order], range(1, len(finishing_order) + 1))
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE ratings SET mu = ?, sigma = ?, games = games + 1 WHERE name = ?',
+                [(rating.mu, rating.sigma, name) for name, rating in zip(finishing_order, updated)],
+            )
+            self.connection.execute(
+                'INSERT INTO games (finishing_order, played_at) VALUES (?, ?)', (','.join(finishing_order), time.time())
+            )
+        return dict(zip(finishing_order, updated))
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def choose_table(ratings: Mapping[str, Rating], table_size: int, busy: Mapping[str, int] | None = None) -> List[str]:
+    """
+    Seats the player with the highest `sigma`, preferring players not already in a running match,
+    then fills the table with the players whose `mu` is the closest to theirs.
+    """
+    busy = busy or {}
+    names = sorted(ratings, key=lambda name: (busy.get(name, 0), -ratings[name].sigma))
+    first = names[0]
+    others = sorted(names[1:], key=lambda name: (busy.get(name, 0), abs(ratings[name].mu - ratings[first].mu)))
+    return [first] + others[:table_size - 1]
+
+
+def play_match(player_defs: List[Tuple[str, Type[Player]]], num_games: int, seed: int) -> List[List[str]]:
+    """
+    Plays `num_games` quiet games in a row at one table, starting from a random seating.
+    Returns the names of the players in finishing order for every game.
+    """
+    rng = random.Random(seed)
+    player_defs = player_defs.copy()
+    rng.shuffle(player_defs)
+    random.seed(rng.randrange(2 ** 32))
+    game = Game([player_class(name) for name, player_class in player_defs], show_print=False)
+    orders = []
+    try:
+        for _ in range(num_games):
+            ranking = game.play()
+            orders.append(sorted(ranking, key=ranking.get))
+    finally:
+        game.close()
+    return orders
+
+
+def run_ladder(
+    store: RatingStore,
+    players: Mapping[str, Type[Player]],
+    num_matches: int,
+    games_per_match: int = 10,
+    table_size: int = 4,
+    workers: int | None = None,
+    seed: int | None = None,
+    on_match: Callable[[Dict[str, Rating], int], None] | None = None,
+) -> Dict[str, Rating]:
+    """
+    Plays `num_matches` matches between the `players` on a process pool, keeping one match in flight per worker.
+    Each finished match updates the stored ratings game by game and the next table is chosen from the new ratings.
+    `on_match` is called after each match with the ratings so far and the number of matches finished.
+    Returns the ratings of the ladder.
+    """
+    store.register(list(players))
+    rng = random.Random(seed)
+    table_size = min(table_size, len(players))
+    busy: Dict[str, int] = {}
+    running: Dict[Future, List[str]] = {}
+    scheduled = finished = 0
+    max_running = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_running) as executor:
+        def schedule() -> None:
+            nonlocal scheduled
+            ratings = store.ratings()
+            while scheduled < num_matches and len(running) < max_running:
+                table = choose_table({name: ratings[name] for name in players}, table_size, busy)
+                future = executor.submit(play_match, [(name, players[name]) for name in table], games_per_match, rng.randrange(2 ** 32))
+                running[future] = table
+                for name in table:
+                    busy[name] = busy.get(name, 0) + 1
+                scheduled += 1
+
+        schedule()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for name in running.pop(future):
+                    busy[name] -= 1
+                for order in future.result():
+                    store.record(order)
+                finished += 1
+                if on_match:
+                    on_match(store.ratings(), finished)
+            schedule()
+    return {name: rating for name, rating in store.ratings().items() if name in players}
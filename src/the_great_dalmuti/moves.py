@@ -0,0 +1,82 @@
+"""Legal move generation for The Great Dalmuti."""
+from typing import List, NamedTuple, Sequence, Tuple
+
+from the_great_dalmuti.hand import Hand
+
+# no rank can have more cards than this, the 12s plus both wilds
+_MAX_PLAY = 14
+
+
+class Move(NamedTuple):
+    rank: int  # card played, 13 when only wilds are played and 0 for a pass
+    count: int  # number of cards played
+    wilds: int  # number of wilds among them
+
+    @property
+    def cards(self) -> List[int]:
+        return [self.rank] * (self.count - self.wilds) + [13] * self.wilds
+
+
+PASS = Move(0, 0, 0)
+
+# _lead_options[natural][wilds] -> every (count, wilds used) lead with `natural` copies of a card and `wilds` wilds in hand
+_lead_options: List[List[Tuple[Tuple[int, int], ...]]] = [
+    [tuple((used + w, w) for used in range(1, natural + 1) for w in range(wilds + 1)) for wilds in range(3)]
+    for natural in range(_MAX_PLAY + 1)
+]
+
+# _follow_options[natural][wilds][length] -> wilds used by every play of `length` cards with `natural` copies of a card and `wilds` wilds in hand
+_follow_options: List[List[List[Tuple[int, ...]]]] = [
+    [
+        [tuple(w for w in range(min(wilds, length - 1) + 1) if length - w <= natural) for length in range(_MAX_PLAY + 1)]
+        for wilds in range(3)
+    ]
+    for natural in range(_MAX_PLAY + 1)
+]
+
+
+def play_key(cards: Sequence[int] | None) -> Tuple[int, int]:
+    """
+    Returns the card and the number of cards of a play, wilds count as 13 unless they were played with another card. A pass is (0, 0).
+    """
+    if not cards:
+        return 0, 0
+    for card in cards:
+        if card != 13:
+            return card, len(cards)
+    return 13, len(cards)
+
+
+def moves_against(hand: Hand, rank: int, length: int) -> List[Move]:
+    """
+    Returns every legal move for `hand` when the last play was `length` cards of `rank`, ordered from the lowest card to the highest.
+    With no last play (`length` of 0) these are all possible leads, otherwise passing is always included first.
+    """
+    counts = hand.counts
+    wilds = counts[12]
+    if not length:
+        moves = [
+            Move(card, count, w)
+            for card in range(1, 13) if counts[card - 1]
+            for count, w in _lead_options[counts[card - 1]][wilds]
+        ]
+        moves.extend(Move(13, w, w) for w in range(1, wilds + 1))
+        return moves
+
+    moves = [PASS]
+    options = _follow_options
+    for card in range(1, rank):
+        natural = counts[card - 1]
+        if natural:
+            for w in options[natural][wilds][length]:
+                moves.append(Move(card, length, w))
+    if wilds >= length:
+        moves.append(Move(13, length, length))
+    return moves
+
+
+def legal_moves(hand: Hand, last_played: Sequence[int] | None = None) -> List[Move]:
+    """
+    Returns every legal move for `hand` against the last played cards, see `moves_against`.
+    """
+    return moves_against(hand, *play_key(last_played))
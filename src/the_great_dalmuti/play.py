@@ -1,11 +1,39 @@
 #!/usr/bin/env python3
 """CLI for The Great Dalmuti game."""
 import click
+from the_great_dalmuti.arena import run_arena
+from the_great_dalmuti.cfr import CFRTrainer
+from the_great_dalmuti.endgame import EndgameCPU
 from the_great_dalmuti.game import Game
+from the_great_dalmuti.ladder import RatingStore, run_ladder
+from the_great_dalmuti.ismcts import ISMCTS
 from the_great_dalmuti.player import Player, CPU, CPU2, Human
+from the_great_dalmuti.strength import DEFAULT_PATH as STRENGTH_PATH, StrengthCPU, build_strength
 
+player_types = {
+    "human": Human,
+    "cpu": CPU,
+    "cpu2": CPU2,
+    "ismcts": ISMCTS,
+    "endgame": EndgameCPU,
+    "strength": StrengthCPU,
+}
 
-@click.command()
+
+def parse_players(players, num_players, first_type="human"):
+    """Turns 'name:type' definitions into (name, type) pairs. Without definitions, the first player is `first_type` and the rest are CPU."""
+    if players:
+        player_defs = []
+        for player_def in players:
+            parts = player_def.split(":")
+            name = parts[0]
+            player_type = parts[1].lower() if len(parts) > 1 else "cpu"
+            player_defs.append((name, player_type if player_type in player_types else "cpu"))
+        return player_defs
+    return [(f"Player{i+1}", first_type if i == 0 else "cpu") for i in range(num_players)]
+
+
+@click.group(invoke_without_command=True)
 @click.option(
     "-n", "--num-players",
     type=int,
@@ -15,7 +43,7 @@ from the_great_dalmuti.player import Player, CPU, CPU2, Human
 @click.option(
     "-p", "--players",
     multiple=True,
-    help="Player definitions in format: name:type (e.g., 'Alice:cpu' 'Sam:human'). Type can be 'cpu', 'cpu2', or 'human'."
+    help="Player definitions in format: name:type (e.g., 'Alice:cpu' 'Sam:human'). Type can be 'cpu', 'cpu2', 'ismcts', 'endgame', 'strength', or 'human'."
 )
 @click.option(
     "-q", "--quiet",
@@ -28,44 +56,248 @@ from the_great_dalmuti.player import Player, CPU, CPU2, Human
     default=10,
     help="Number of games to play (default: 10)."
 )
-def main(num_players, players, quiet, num_games):
+@click.pass_context
+def main(ctx, num_players, players, quiet, num_games):
     """Play The Great Dalmuti game."""
-    if players:
-        player_list = []
-        for player_def in players:
-            parts = player_def.split(":")
-            name = parts[0]
-            player_type = parts[1].lower() if len(parts) > 1 else "cpu"
-            
-            if player_type == "human":
-                player_list.append(Human(name))
-            elif player_type == "cpu2":
-                player_list.append(CPU2(name))
-            else:
-                player_list.append(CPU(name))
-    else:
-        # Create default players: first is Human, rest are CPU
-        player_list = []
-        for i in range(num_players):
-            name = f"Player{i+1}"
-            if i == 0:
-                player_list.append(Human(name))
-            else:
-                player_list.append(CPU(name))
-    
+    if ctx.invoked_subcommand is not None:
+        return
+    player_list = [player_types[player_type](name) for name, player_type in parse_players(players, num_players)]
+
     game = Game(player_list, show_print=not quiet)
     scoreboard = {}
-    for _ in range(num_games):
-        ranking = game.play()
-        for player_name, rank in ranking.items():
-            if player_name not in scoreboard:
-                scoreboard[player_name] = 0
-            scoreboard[player_name] += rank
-    
+    try:
+        for _ in range(num_games):
+            ranking = game.play()
+            for player_name, rank in ranking.items():
+                if player_name not in scoreboard:
+                    scoreboard[player_name] = 0
+                scoreboard[player_name] += rank
+    finally:
+        game.close()
+
     click.echo(f"Final Scoreboard after {num_games} games:")
     for player_name, total_rank in sorted(scoreboard.items(), key=lambda x: x[1]):
         click.echo(f"{player_name}: {total_rank}")
 
 
+@main.command()
+@click.option(
+    "-n", "--num-players",
+    type=int,
+    default=4,
+    help="Number of CPU players when no player definitions are given (default: 4)."
+)
+@click.option(
+    "-p", "--players",
+    multiple=True,
+    help="Player definitions in format: name:type (e.g., 'Alice:cpu' 'Bob:ismcts'). Human players are not allowed."
+)
+@click.option(
+    "-g", "--num-games",
+    type=int,
+    default=1_000_000,
+    help="Number of games to play (default: 1000000)."
+)
+@click.option(
+    "-w", "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: one per CPU)."
+)
+@click.option(
+    "-c", "--chunk-size",
+    type=int,
+    default=1000,
+    help="Games played by a worker before its results are merged (default: 1000)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=None,
+    help="Seed for the first chunk, each following chunk uses the next seed (default: random)."
+)
+def arena(num_players, players, num_games, workers, chunk_size, seed):
+    """Play many headless games in parallel and report rank distributions."""
+    player_defs = parse_players(players, num_players, first_type="cpu")
+    names = [name for name, _ in player_defs]
+    if any(player_type == "human" for _, player_type in player_defs):
+        raise click.BadParameter("Human players cannot play in the arena.", param_hint="'-p' / '--players'")
+    if len(set(names)) != len(names):
+        raise click.BadParameter("Player names must be unique.", param_hint="'-p' / '--players'")
+
+    def show_progress(results, elapsed):
+        click.echo(f"\r{results.num_games}/{num_games} games ({results.num_games / elapsed:,.0f} games/sec)", nl=False)
+
+    player_classes = [(name, player_types[player_type]) for name, player_type in player_defs]
+    results, elapsed = run_arena(player_classes, num_games, workers=workers, chunk_size=chunk_size, seed=seed, on_chunk=show_progress)
+    click.echo()
+    click.echo(f"Played {results.num_games} games in {elapsed:.1f}s ({results.num_games / elapsed:,.0f} games/sec).")
+    click.echo("Mean rank with 95% confidence interval, then the share of games finished in each rank:")
+    for name in sorted(names, key=lambda name: results.mean_rank(name)[0]):
+        mean, half_width = results.mean_rank(name)
+        shares = []
+        for rank in range(1, len(names) + 1):
+            share, low, high = results.rank_share(name, rank)
+            shares.append(f"{rank}: {share:.1%} [{low:.1%}, {high:.1%}]")
+        click.echo(f"{name}: {mean:.3f} ± {half_width:.3f} | " + " | ".join(shares))
+
+
+@main.command()
+@click.option(
+    "-p", "--players",
+    multiple=True,
+    help="Player types to rate (e.g., '-p cpu -p ismcts', default: every CPU type)."
+)
+@click.option(
+    "-d", "--database",
+    default="ladder.db",
+    help="SQLite database keeping the ratings, created if missing (default: ladder.db)."
+)
+@click.option(
+    "-m", "--num-matches",
+    type=int,
+    default=100,
+    help="Number of matches to play (default: 100)."
+)
+@click.option(
+    "-g", "--games-per-match",
+    type=int,
+    default=10,
+    help="Number of games played at the table of each match (default: 10)."
+)
+@click.option(
+    "-t", "--table-size",
+    type=int,
+    default=4,
+    help="Number of players at each table (default: 4)."
+)
+@click.option(
+    "-w", "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (default: one per CPU)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=None,
+    help="Seed for seating and dealing (default: random)."
+)
+def ladder(players, database, num_matches, games_per_match, table_size, workers, seed):
+    """Rate player types against each other, playing the least certain ratings first."""
+    player_names = [player.lower() for player in players] or [name for name in player_types if name != "human"]
+    unknown = [name for name in player_names if name not in player_types or name == "human"]
+    if unknown:
+        raise click.BadParameter(f"Unknown CPU player types: {', '.join(unknown)}.", param_hint="'-p' / '--players'")
+    if len(set(player_names)) < 2:
+        raise click.BadParameter("At least two player types are needed.", param_hint="'-p' / '--players'")
+
+    def show_progress(ratings, finished):
+        click.echo(f"\r{finished}/{num_matches} matches", nl=False)
+
+    store = RatingStore(database)
+    try:
+        ratings = run_ladder(
+            store, {name: player_types[name] for name in player_names}, num_matches, games_per_match=games_per_match,
+            table_size=table_size, workers=workers, seed=seed, on_match=show_progress,
+        )
+        games = store.games_played()
+    finally:
+        store.close()
+    click.echo()
+    click.echo("Ladder ordered by conservative rating (mu - 3 sigma):")
+    for name in sorted(ratings, key=lambda name: -ratings[name].conservative):
+        rating = ratings[name]
+        click.echo(f"{name}: {rating.conservative:.2f} (mu {rating.mu:.2f}, sigma {rating.sigma:.2f}, {games[name]} games)")
+
+
+@main.command()
+@click.option(
+    "-i", "--iterations",
+    type=int,
+    default=100_000,
+    help="Number of MCCFR iterations, one deal each (default: 100000)."
+)
+@click.option(
+    "-n", "--num-players",
+    type=int,
+    default=4,
+    help="Number of players at the table (default: 4)."
+)
+@click.option(
+    "-o", "--output",
+    default="cfr.npz",
+    help="Checkpoint file, saved after every batch (default: cfr.npz)."
+)
+@click.option(
+    "-r", "--resume",
+    is_flag=True,
+    help="Continue training from the checkpoint file."
+)
+@click.option(
+    "-w", "--workers",
+    type=int,
+    default=1,
+    help="Number of worker processes (default: 1)."
+)
+@click.option(
+    "-b", "--batch-size",
+    type=int,
+    default=5000,
+    help="Iterations a worker runs before adding its regrets to the shared tables (default: 5000)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=None,
+    help="Seed for dealing and sampling (default: random)."
+)
+def cfr(iterations, num_players, output, resume, workers, batch_size, seed):
+    """Train an abstracted Dalmuti policy with Monte Carlo counterfactual regret minimization."""
+    trainer = CFRTrainer.load(output, seed=seed) if resume else CFRTrainer(num_players, seed=seed)
+    start = trainer.iterations
+
+    def show_progress(trainer):
+        click.echo(f"\r{trainer.iterations - start}/{iterations} iterations", nl=False)
+
+    try:
+        trainer.train(iterations, workers=workers, batch_size=batch_size, checkpoint=output, on_batch=show_progress)
+    finally:
+        trainer.close()
+    click.echo()
+    click.echo(f"Saved {trainer.iterations} iterations to {output}, play it with CFRPolicy(name, '{output}').")
+
+
+@main.command()
+@click.option(
+    "-o", "--output",
+    default=STRENGTH_PATH,
+    help=f"File the models are saved to, 'strength' players load them from the default one (default: {STRENGTH_PATH})."
+)
+@click.option(
+    "-n", "--num-players",
+    type=int,
+    multiple=True,
+    help="Numbers of players to fit a model for (e.g., '-n 4 -n 5', default: 3 to 8)."
+)
+@click.option(
+    "-g", "--num-games",
+    type=int,
+    default=20_000,
+    help="Simulated games per number of players (default: 20000)."
+)
+@click.option(
+    "-s", "--seed",
+    type=int,
+    default=0,
+    help="Seed for the simulated games (default: 0)."
+)
+def strength(output, num_players, num_games, seed):
+    """Fit the hand-strength models the 'strength' players trade with."""
+    player_counts = num_players or range(3, 9)
+    build_strength(output, player_counts, num_games=num_games, seed=seed)
+    click.echo(f"Saved the models for {', '.join(map(str, player_counts))} players to {output}.")
+
+
 if __name__ == "__main__":
     main()
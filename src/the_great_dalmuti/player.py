@@ -2,12 +2,16 @@ import click
 import random
 from typing import List
 from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
 from the_great_dalmuti.input_util import prompt
+from the_great_dalmuti.moves import Move
 
 class Player:
     def __init__(self, name) -> None:
         self.name: str = name
-        self._cards: List[int] = []
+        self._cards: Hand = Hand()
+        # number of players at the table, set by the game at the deal
+        self.num_players: int = 0
 
     @property
     def num_cards(self) -> int:
@@ -15,23 +19,27 @@ class Player:
 
     @property
     def num_wilds(self) -> int:
-        return self._cards.count(13)
+        return self._cards.num_wilds
 
     def has_cards(self) -> bool:
         return len(self._cards) > 0
     
     def get_valid_cards(self, cards: List[int] | None) -> List[int]:
         if not cards:
-            return self._cards.copy()
+            return self._cards.to_list()
+        last_played_card = (set(cards) - {13} or {13}).pop()
+        num_wilds = self.num_wilds
         valid_cards = []
-        for card in self._cards:
-            if card == 13:
-                continue
-            elif card < (set(cards) - {13} or {13}).pop() and self._cards.count(card) >= len(cards) - self.num_wilds:
-                valid_cards.append(card)
-            if 13 not in valid_cards and self._cards.count(card) + self.num_wilds >= len(cards):
-                valid_cards.extend([13] * self.num_wilds)
-        valid_cards.sort()
+        wilds_valid = False
+        for card in self._cards.ranks():
+            card_count = self._cards.count(card)
+            if card_count + num_wilds >= len(cards):
+                # wilds are offered as soon as any card can be completed with them
+                wilds_valid = True
+                if card < last_played_card:
+                    valid_cards.extend([card] * card_count)
+        if wilds_valid:
+            valid_cards.extend([13] * num_wilds)
         return valid_cards
 
     def valid_play(self, game_state: GameState, cards: List[int]) -> bool:
@@ -57,9 +65,14 @@ class Player:
         return game_state.valid_play(cards)
 
 
+    def play_move(self, move: Move) -> List[int]:
+        """
+        Removes the cards of the move from the hand and returns them.
+        """
+        return self._cards.take(move.rank, move.count - move.wilds) + self._cards.take(13, move.wilds)
+
     def add_cards(self, cards: int | List[int]) -> None:
         self._cards.extend([cards] if isinstance(cards, int) else cards)
-        self._cards.sort()
 
     def give_low_cards(self, num_of_cards) -> List[int]: # type: ignore
         pass
@@ -70,6 +83,11 @@ class Player:
     def play(self, game_state) -> List[int]: # type: ignore
         pass
 
+    def close(self) -> None:
+        """
+        Frees what the player holds on to between games, like worker processes. Called once the player is done playing.
+        """
+
 class Human(Player):
     def remove_cards(self, cards: List[int] | int) -> List[int]:
         if isinstance(cards, int):
@@ -92,7 +110,7 @@ class Human(Player):
         for i in range(1, num_of_cards + 1):
             card = prompt(
                 f'What card do you want to give your opponent (card {i} of {num_of_cards})? You have {self._cards}',
-                type=click.Choice(self._cards + ['q', 'quit', 'exit']),
+                type=click.Choice(self._cards.to_list() + ['q', 'quit', 'exit']),
                 show_choices=False,
             )
             cards.extend(self.remove_cards(card))
@@ -102,7 +120,7 @@ class Human(Player):
         while True:
             card = prompt(
                 f'What cards do you want to play? You have {self._cards}',
-                type=click.Choice(self._cards + ['q', 'quit', 'exit', '']),
+                type=click.Choice(self._cards.to_list() + ['q', 'quit', 'exit', '']),
                 show_choices=False,
                 default='',
                 show_default=False
@@ -146,32 +164,15 @@ class CPU(Player):
         return cards
     
     def play_any(self) -> List[int]:
-        i = -1
-        card = self._cards[i]
-        while card == 13 and abs(i) <= len(self._cards):
-            card = self._cards[i]
-            i -= 1
-        card_count = self._cards.count(card)
-        while card in self._cards:
-            self._cards.remove(card)
-        return [card] * card_count
-
-    def choose_valid(self, valid_cards: List[int], last_played: List[int]) -> List[int]:
-        last_played_card = (set(last_played) - {13} or {13}).pop()
-        for card in reversed(valid_cards):
-            if card >= last_played_card or self._cards.count(card) > len(last_played):
-                continue
-            elif self._cards.count(card) == len(last_played):
-                card_count = self._cards.count(card)
-                while card in self._cards:
-                    self._cards.remove(card)
-                return [card] * card_count
-            elif self._cards.count(card) + self.num_wilds >= len(last_played):
-                cards_to_play = [card] * self._cards.count(card) + [13] * (len(last_played) - self._cards.count(card))
-                assert cards_to_play.count(13) <= self._cards.count(13)
-                for card in cards_to_play:
-                    self._cards.remove(card)
-                return cards_to_play
+        # highest card, wilds only when nothing else is left
+        ranks = self._cards.ranks()
+        return self._cards.take_all(ranks[-1] if ranks else 13)
+
+    def choose_move(self, moves: List[Move], last_played: List[int]) -> List[int]:
+        # highest card that gets rid of all of its copies, completed with wilds if needed
+        for move in reversed(moves):
+            if move.rank < 13 and move.count - move.wilds == self._cards.count(move.rank):
+                return self.play_move(move)
         return []
     
     def play(self, game_state: GameState) -> List[int]:
@@ -180,41 +181,24 @@ class CPU(Player):
         last_played = game_state.get_last_played()
         if not last_played:
             return self.play_any()
-        valid_cards = self.get_valid_cards(last_played)
-        
-        return self.choose_valid(valid_cards, last_played)
+        return self.choose_move(game_state.legal_moves(self._cards), last_played)
 
 
 
 class CPU2(CPU):
     def play_any(self) -> List[int]:
-        card_Set = set(self._cards) - {13} or {13}
-        # pick a random card from the set
-        card = random.choice(list(card_Set))
-        card_count = self._cards.count(card)
-        while card in self._cards:
-            self._cards.remove(card)
-        return [card] * card_count
+        # pick a random card, wilds only when nothing else is left
+        card = random.choice(self._cards.ranks() or [13])
+        return self._cards.take_all(card)
     
-    def choose_valid(self, valid_cards: List[int], last_played: List[int]) -> List[int]:
-        # return a random valid play
-        valid_set = set(valid_cards) - {13} or {13}
-        card = random.choice(list(valid_set))
-        if card == 13 and len(valid_set) > 1:
-            print('what is going on?????????????????????????')
-        if self._cards.count(card) >= len(last_played):
-            card_count = len(last_played)
-            for _ in range(card_count):
-                self._cards.remove(card)
-            return [card] * card_count
-        elif self._cards.count(card) + self.num_wilds >= len(last_played):
-            print(f"CPU2 choosing valid play with card {card}, last_played {last_played}, cards {self._cards}, valid_cards {valid_cards}, {self._cards.count(card)}, {self.num_wilds}, {len(last_played)}")
-            cards_to_play = [card] * self._cards.count(card) + [13] * (len(last_played) - self._cards.count(card))
-            assert cards_to_play.count(13) <= self._cards.count(13)
-            for card in cards_to_play:
-                self._cards.remove(card)
-            return cards_to_play
-        return []
+    def choose_move(self, moves: List[Move], last_played: List[int]) -> List[int]:
+        # random card played with as few wilds as possible, wilds alone only when nothing else beats the last play
+        cards = sorted({move.rank for move in moves if 0 < move.rank < 13}) or [move.rank for move in moves if move.rank == 13]
+        if not cards:
+            return []
+        card = random.choice(cards)
+        return self.play_move(min((move for move in moves if move.rank == card), key=lambda move: move.wilds))
+
 
 if __name__ == "__main__":
     """
@@ -0,0 +1,160 @@
+"""
+Compact binary recordings of Great Dalmuti rounds.
+
+A file starts with `MAGIC` and holds any number of games, each one a 4 byte little endian length followed by:
+the number of players, every name as a length prefixed utf-8 string, the 80 cards in the order they were dealt
+and the actions. Every action starts with a byte holding its kind in the top 3 bits and a seat in the low 5 bits:
+a play adds the card and a (count << 2 | wilds) byte, a trade adds the receiving seat, the number of cards and the cards,
+and the end of the game adds the seats in finishing order.
+"""
+from typing import BinaryIO, Iterator, List, NamedTuple, Sequence, Tuple
+
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import play_key
+
+MAGIC = b'DLMR\x01'
+
+PLAY, PASS, CLEAR, TRADE, END = range(5)
+
+
+class Recorder:
+    """
+    Writes games to a replay file. Every call only appends a few bytes to a buffer, the game is written when it ends.
+    """
+    def __init__(self, path: str) -> None:
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._game = bytearray()
+
+    def start_game(self, names: Sequence[str], dealt_cards: Sequence[int]) -> None:
+        game = bytearray((len(names),))
+        for name in names:
+            encoded = name.encode()
+            game.append(len(encoded))
+            game += encoded
+        game += bytes(dealt_cards)
+        self._game = game
+
+    def trade(self, giver: int, receiver: int, cards: Sequence[int]) -> None:
+        self._game += bytes((TRADE << 5 | giver, receiver, len(cards), *cards))
+
+    def play(self, seat: int, cards: Sequence[int]) -> None:
+        if cards:
+            card, count = play_key(cards)
+            self._game += bytes((PLAY << 5 | seat, card, count << 2 | cards.count(13)))
+        else:
+            self._game.append(PASS << 5 | seat)
+
+    def clear(self) -> None:
+        self._game.append(CLEAR << 5)
+
+    def end_game(self, finishing_seats: Sequence[int]) -> None:
+        self._game.append(END << 5)
+        self._game += bytes(finishing_seats)
+        self._file.write(len(self._game).to_bytes(4, 'little'))
+        self._file.write(self._game)
+        self._game = bytearray()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class GameRecord(NamedTuple):
+    names: List[str]
+    dealt_cards: bytes
+    actions: bytes  # the encoded actions, END excluded
+    finishing_seats: List[int]
+
+
+def read_games(path: str) -> Iterator[GameRecord]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f'{path} is not a Dalmuti replay file.')
+    position = len(MAGIC)
+    while position < len(data):
+        length = int.from_bytes(data[position:position + 4], 'little')
+        game = data[position + 4:position + 4 + length]
+        position += 4 + length
+
+        num_players = game[0]
+        offset = 1
+        names = []
+        for _ in range(num_players):
+            names.append(game[offset + 1:offset + 1 + game[offset]].decode())
+            offset += 1 + game[offset]
+        dealt_cards = game[offset:offset + 80]
+        end = len(game) - num_players - 1
+        yield GameRecord(names, dealt_cards, game[offset + 80:end], list(game[end + 1:]))
+
+
+class Action(NamedTuple):
+    kind: int  # PLAY, PASS, CLEAR or TRADE
+    seat: int  # the player acting, the giver for trades
+    cards: List[int]
+    receiver: int = -1  # the seat receiving the cards of a trade
+
+
+def iter_actions(record: GameRecord) -> Iterator[Action]:
+    """
+    Decodes the actions of a game in the order they happened.
+    """
+    actions = record.actions
+    position = 0
+    while position < len(actions):
+        kind, seat = actions[position] >> 5, actions[position] & 31
+        if kind == PLAY:
+            card, packed = actions[position + 1], actions[position + 2]
+            count, wilds = packed >> 2, packed & 3
+            yield Action(PLAY, seat, [card] * (count - wilds) + [13] * wilds)
+            position += 3
+        elif kind == TRADE:
+            receiver, n = actions[position + 1], actions[position + 2]
+            yield Action(TRADE, seat, list(actions[position + 3:position + 3 + n]), receiver)
+            position += 3 + n
+        else:
+            yield Action(kind, seat, [])
+            position += 1
+
+
+class ReplayState(NamedTuple):
+    hands: List[Hand]
+    current_round: List[Tuple[int, List[int]]]  # (seat, cards) of the current trick
+    actions: int  # number of actions applied
+
+
+def replay(record: GameRecord, num_actions: int | None = None) -> ReplayState:
+    """
+    Rebuilds the hands and current trick after the first `num_actions` actions (trades, plays, passes and cleared tricks) of a game,
+    or after the whole game when `num_actions` is None.
+    """
+    num_players = len(record.names)
+    hands = [Hand() for _ in range(num_players)]
+    for i, card in enumerate(record.dealt_cards):
+        hands[i % num_players].add(card)
+    current_round: List[Tuple[int, List[int]]] = []
+    applied = 0
+    for kind, seat, cards, receiver in iter_actions(record):
+        if num_actions is not None and applied >= num_actions:
+            break
+        if kind == PLAY:
+            hand = hands[seat]
+            for card in cards:
+                hand.remove(card)
+            current_round.append((seat, cards))
+        elif kind == PASS:
+            current_round.append((seat, []))
+        elif kind == CLEAR:
+            current_round = []
+        elif kind == TRADE:
+            for card in cards:
+                hands[seat].remove(card)
+                hands[receiver].add(card)
+        applied += 1
+    return ReplayState(hands, current_round, applied)
@@ -0,0 +1,217 @@
+"""
+The compact state of one Dalmuti round. `Game` plays its rounds on it and search players clone it, play moves on it and take them back.
+"""
+import random
+from typing import TYPE_CHECKING, List, NamedTuple, Tuple
+
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import PASS, Move, moves_against, play_key
+
+if TYPE_CHECKING:
+    from the_great_dalmuti.game_state import GameState
+    from the_great_dalmuti.player import Player
+
+
+def next_seat(active: int, seat: int) -> int:
+    """
+    Returns the first seat after `seat` (wrapping around the table) whose bit is set in the `active` mask.
+    """
+    later_seats = active >> (seat + 1)
+    if later_seats:
+        return seat + (later_seats & -later_seats).bit_length()
+    return (active & -active).bit_length() - 1
+
+
+class RoundState:
+    """
+    The hands and turn order of a round, following the rules of `Game.play`: seats are fixed, `active` has a bit set for every
+    seat still at the table and players out of cards leave the table the next time their turn comes up.
+    `seat` is always a player holding cards who has to move, unless the round is over.
+    Every `apply` can be taken back with `undo`, so searches can walk a single state instead of copying it at every node.
+    """
+    __slots__ = ('hands', 'seat', 'active', 'last_seat', 'trick_rank', 'trick_length', 'finished', '_undo')
+
+    def __init__(self, hands: List[Hand], seat: int = 0, last_seat: int = -1, trick_rank: int = 0, trick_length: int = 0) -> None:
+        self.hands = hands
+        self.seat = seat
+        self.active = (1 << len(hands)) - 1
+        self.last_seat = last_seat
+        self.trick_rank = trick_rank
+        self.trick_length = trick_length
+        self.finished: List[int] = []
+        self._undo: List[Tuple[int, int, int, int, int, int, Move, bool]] = []
+        self._advance()
+
+    @property
+    def num_players(self) -> int:
+        return len(self.hands)
+
+    @property
+    def is_over(self) -> bool:
+        return not self.active
+
+    def clone(self) -> "RoundState":
+        """
+        Returns an independent copy of the state, `undo` on the copy goes back no further than this point.
+        """
+        state = RoundState.__new__(RoundState)
+        state.hands = [hand.copy() for hand in self.hands]
+        state.seat = self.seat
+        state.active = self.active
+        state.last_seat = self.last_seat
+        state.trick_rank = self.trick_rank
+        state.trick_length = self.trick_length
+        state.finished = self.finished.copy()
+        state._undo = []
+        return state
+
+    def legal_moves(self) -> List[Move]:
+        return moves_against(self.hands[self.seat], self.trick_rank, self.trick_length)
+
+    def apply(self, move: Move, take_cards: bool = True) -> None:
+        """
+        Plays the move for the player in `seat` and moves on to the next player who has to move.
+        With `take_cards` unset the cards are expected to be gone from the hand already, as when players play their own hands.
+        """
+        seat = self.seat
+        self._undo.append((seat, self.active, self.last_seat, self.trick_rank, self.trick_length, len(self.finished), move, take_cards))
+        if move.count:
+            if take_cards:
+                hand = self.hands[seat]
+                hand.take(move.rank, move.count - move.wilds)
+                hand.take(13, move.wilds)
+            self.trick_rank = move.rank
+            self.trick_length = move.count
+            self.last_seat = seat
+        self.seat = next_seat(self.active, seat)
+        self._advance()
+
+    def undo(self) -> Move:
+        """
+        Takes back the last applied move and returns it, the cards go back to the hand if `apply` took them.
+        """
+        seat, self.active, self.last_seat, self.trick_rank, self.trick_length, num_finished, move, take_cards = self._undo.pop()
+        self.seat = seat
+        del self.finished[num_finished:]
+        if move.count and take_cards:
+            hand = self.hands[seat]
+            hand.add(move.rank, move.count - move.wilds)
+            hand.add(13, move.wilds)
+        return move
+
+    def _advance(self) -> None:
+        while True:
+            seat = self.seat
+            if not self.hands[seat]:
+                self.finished.append(seat)
+                self.active &= ~(1 << seat)
+                if not self.active:
+                    return
+                self.seat = next_seat(self.active, seat)
+                if self.last_seat == -1 or seat == self.last_seat:
+                    # the player who won the trick has no cards, the next player leads
+                    self.trick_rank = self.trick_length = 0
+                    self.last_seat = self.seat
+                continue
+            if seat == self.last_seat:
+                # everyone passed back to the last player to play
+                self.trick_rank = self.trick_length = 0
+            return
+
+    def ranks(self) -> List[int]:
+        """
+        Returns the finishing rank of every seat (1 being the first), only complete once the round is over.
+        """
+        ranks = [0] * self.num_players
+        for rank, seat in enumerate(self.finished, 1):
+            ranks[seat] = rank
+        return ranks
+
+
+def greedy_move(state: RoundState) -> Move:
+    """
+    Returns the move the `CPU` player would make: leads play every copy of the highest card and follows play the highest
+    card that uses up all of its copies, completed with wilds.
+    """
+    hand = state.hands[state.seat]
+    counts = hand.counts
+    if not state.trick_length:
+        ranks = hand.ranks()
+        if ranks:
+            return Move(ranks[-1], counts[ranks[-1] - 1], 0)
+        return Move(13, counts[12], counts[12])
+    length = state.trick_length
+    for card in range(state.trick_rank - 1, 0, -1):
+        natural = counts[card - 1]
+        if natural and natural <= length and natural + counts[12] >= length:
+            return Move(card, length, length - natural)
+    return PASS
+
+
+def random_move(state: RoundState, rng: random.Random) -> Move:
+    return rng.choice(state.legal_moves())
+
+
+def to_move(cards: List[int]) -> Move:
+    if not cards:
+        return PASS
+    card, count = play_key(cards)
+    return Move(card, count, cards.count(13))
+
+
+class Observation(NamedTuple):
+    """
+    What a player knows of a round: the public state with only their own hand filled in, and the cards they have not seen.
+    """
+    state: RoundState
+    seat: int
+    unseen: List[int]
+    card_counts: List[int]
+
+    def determinize(self, rng: random.Random) -> RoundState:
+        """
+        Returns a copy of the state where the unseen cards are dealt at random to the other players, matching their number of cards.
+        """
+        state = self.state.clone()
+        unseen = self.unseen.copy()
+        rng.shuffle(unseen)
+        position = 0
+        for seat, count in enumerate(self.card_counts):
+            if seat != self.seat:
+                state.hands[seat].extend(unseen[position:position + count])
+                position += count
+        return state
+
+
+def observe(game_state: "GameState", player: "Player") -> Observation:
+    """
+    Builds the observation of `player`, whose turn it is, from the public information of the game state.
+    Seats follow the order of `game_state.players`.
+    """
+    public = game_state.snapshot()
+    names = [p.name for p in game_state.players]
+    seat = names.index(player.name)
+    card_counts = [public.card_counts[name] for name in names]
+
+    unseen_counts = [card - public.played_cards[card - 1] for card in range(1, 13)] + [2 - public.played_cards[12]]
+    for card, count in enumerate(player._cards.counts, 1):
+        unseen_counts[card - 1] -= count
+    unseen = [card for card, count in enumerate(unseen_counts, 1) for _ in range(count)]
+
+    hands = [Hand() for _ in names]
+    hands[seat] = player._cards.copy()
+    state = RoundState.__new__(RoundState)
+    state.hands = hands
+    state.seat = seat
+    trick_rank, trick_length = play_key(public.last_played)
+    state.trick_rank = trick_rank
+    state.trick_length = trick_length
+    state.last_seat = names.index(public.last_player) if public.last_player is not None else seat
+    # players out of cards no longer change the round, except the last player to play who still clears the trick
+    # when play comes back to them. Their finishing order is not public, they are listed in seat order.
+    state._undo = []
+    state.finished = [s for s, count in enumerate(card_counts) if not count and s != state.last_seat]
+    state.active = (1 << len(names)) - 1
+    for s in state.finished:
+        state.active &= ~(1 << s)
+    return Observation(state, seat, unseen, card_counts)
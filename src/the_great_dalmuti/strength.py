@@ -0,0 +1,174 @@
+"""
+Hand-strength evaluation for The Great Dalmuti.
+
+The expected finishing rank of a hand is learned offline from `batch` simulations of CPU games: for every number of
+players a least-squares model maps the 13 card counts of a hand (and their squares, so pairs and triples can be worth
+more than their cards) to the rank the hand finished in. Dealt hands almost never repeat, so the simulated games cannot
+be looked up directly; instead the answers of the model are cached by hand, making repeated queries a dict lookup.
+
+`dalmuti strength` fits the models once and saves them to `DEFAULT_PATH`, where `default_strength` loads them from.
+"""
+import os
+import warnings
+from itertools import combinations_with_replacement
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from the_great_dalmuti.batch import play, random_deal, trade
+from the_great_dalmuti.player import CPU
+
+# the models of `dalmuti strength`, in the user's cache directory since the package may not be writable
+DEFAULT_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'the_great_dalmuti', 'strength.npz')
+
+
+def features(counts: np.ndarray) -> np.ndarray:
+    """
+    Returns the (hands, 27) model inputs of (hands, 13) card counts: a constant, the counts and the squared counts.
+    """
+    counts = counts.astype(np.float64)
+    return np.concatenate([np.ones((len(counts), 1)), counts, counts ** 2], axis=1)
+
+
+def simulate_ranks(num_games: int, num_players: int, rng: np.random.Generator | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deals, trades and plays `num_games` CPU games and returns every traded hand as (hands, 13) counts with its finishing rank.
+    """
+    hands = random_deal(num_games, num_players, rng)
+    trade(hands)
+    ranks = play(hands)
+    return hands.reshape(-1, 13), ranks.reshape(-1)
+
+
+class HandStrength:
+    """
+    Estimates the expected finishing rank of a hand, 1 being the best. The models are fitted offline with `fit` and
+    `save`, and loaded with `load`. A model that was not loaded is fitted on `num_games` simulated games the first time
+    it is needed, with a warning since that holds up the game for a second or more.
+    At most `max_entries` hands are cached, the cache starts over when it is full.
+    """
+    def __init__(self, num_games: int = 20_000, seed: int | None = 0, max_entries: int = 1_000_000) -> None:
+        self.num_games = num_games
+        self.max_entries = max_entries
+        self.rng = np.random.default_rng(seed)
+        self.coefficients: Dict[int, np.ndarray] = {}
+        self._cache: Dict[Tuple[int, Tuple[int, ...]], float] = {}
+
+    def fit(self, num_players: int, num_games: int | None = None) -> np.ndarray:
+        """
+        Fits (or refits) the model for `num_players` players and returns its coefficients.
+        """
+        counts, ranks = simulate_ranks(num_games or self.num_games, num_players, self.rng)
+        coefficients = np.linalg.lstsq(features(counts), ranks.astype(np.float64), rcond=None)[0]
+        self.coefficients[num_players] = coefficients
+        self._cache = {key: value for key, value in self._cache.items() if key[0] != num_players}
+        return coefficients
+
+    def _coefficients(self, num_players: int) -> np.ndarray:
+        coefficients = self.coefficients.get(num_players)
+        if coefficients is None:
+            warnings.warn(
+                f'No hand-strength model for {num_players} players was loaded, fitting one on {self.num_games} simulated games. '
+                'Build the models once with `dalmuti strength`.',
+                stacklevel=3,
+            )
+            coefficients = self.fit(num_players)
+        return coefficients
+
+    def expected_rank(self, counts: Sequence[int], num_players: int) -> float:
+        """
+        Returns the expected finishing rank of a hand given as the counts of each card (index 0 for the 1s, 12 for the wilds).
+        """
+        key = (num_players, tuple(counts))
+        rank = self._cache.get(key)
+        if rank is None:
+            rank = float(self.expected_ranks(np.array([counts]), num_players)[0])
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+            self._cache[key] = rank
+        return rank
+
+    def expected_ranks(self, counts: np.ndarray, num_players: int) -> np.ndarray:
+        """
+        Returns the expected finishing ranks of (hands, 13) card counts, without going through the cache.
+        """
+        return features(counts) @ self._coefficients(num_players)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, **{str(num_players): coefficients for num_players, coefficients in self.coefficients.items()})
+
+    def load(self, path: str) -> None:
+        with np.load(path) as data:
+            for num_players in data.files:
+                self.coefficients[int(num_players)] = data[num_players]
+        self._cache.clear()
+
+
+def build_strength(path: str = DEFAULT_PATH, player_counts: Iterable[int] = range(3, 9), num_games: int = 20_000, seed: int | None = 0) -> HandStrength:
+    """
+    Fits the models for every number of players in `player_counts` on `num_games` simulated games each and saves them to `path`.
+    """
+    strength = HandStrength(num_games, seed)
+    for num_players in player_counts:
+        strength.fit(num_players)
+    strength.save(path)
+    return strength
+
+
+_default_strength: HandStrength | None = None
+
+
+def default_strength() -> HandStrength:
+    """
+    Returns the evaluator shared by the players that do not get their own, with the models saved at `DEFAULT_PATH`.
+    Without that file, the models are fitted when they are first needed and a warning says so.
+    """
+    global _default_strength
+    if _default_strength is None:
+        _default_strength = HandStrength()
+        if os.path.exists(DEFAULT_PATH):
+            _default_strength.load(DEFAULT_PATH)
+        else:
+            warnings.warn(f'No hand-strength models at {DEFAULT_PATH}, build them once with `dalmuti strength`.', stacklevel=2)
+    return _default_strength
+
+
+def cards_to_give(counts: Sequence[int], num_of_cards: int) -> List[Tuple[int, ...]]:
+    """
+    Returns every distinct choice of `num_of_cards` cards that can be given from a hand, as sorted tuples of cards.
+    """
+    held = [card for card, count in enumerate(counts, 1) if count]
+    choices = []
+    for cards in combinations_with_replacement(held, num_of_cards):
+        if all(cards.count(card) <= counts[card - 1] for card in set(cards)):
+            choices.append(cards)
+    return choices
+
+
+class StrengthCPU(CPU):
+    """
+    Plays like `CPU` but gives away the cards that leave the hand with the best expected rank when it is a Dalmuti,
+    with the model for the number of players the game set at the deal.
+    """
+    def __init__(self, name: str, strength: HandStrength | None = None) -> None:
+        super().__init__(name)
+        self.strength = strength
+
+    def give_any_cards(self, num_of_cards) -> List[int]:
+        assert num_of_cards <= self.num_cards
+        assert self.num_players, 'The number of players is set by the game at the deal.'
+        strength = self.strength or default_strength()
+        num_players = self.num_players
+        counts = self._cards.counts
+
+        def rank_after(cards: Tuple[int, ...]) -> float:
+            remaining = list(counts)
+            for card in cards:
+                remaining[card - 1] -= 1
+            return strength.expected_rank(remaining, num_players)
+
+        cards = min(cards_to_give(counts, num_of_cards), key=rank_after)
+        for card in cards:
+            self._cards.remove(card)
+        return list(cards)
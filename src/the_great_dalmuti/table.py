@@ -0,0 +1,258 @@
+"""
+Asynchronous Dalmuti tables for networked play.
+
+A `Table` runs its games as a single asyncio task, so a server can hold many tables in one thread: a table waiting
+for a remote player costs nothing but its task. Remote players talk to the table through `submit` and receive
+JSON-compatible messages through their `send` coroutine, empty seats are filled with `CPU` bots, and every play is
+checked with `Player.valid_play` against the table's `GameState`.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Type
+
+from the_great_dalmuti.game import get_cards
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import to_move
+
+Message = Dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class RemotePlayer(CPU):
+    """
+    A seat played over the network. Without a connection, or when the turn timer runs out, the `CPU` policy plays for it.
+    """
+    def __init__(self, name: str, send: Send | None = None) -> None:
+        super().__init__(name)
+        self.send = send
+        self.messages: asyncio.Queue[Message] = asyncio.Queue()
+
+    @property
+    def connected(self) -> bool:
+        return self.send is not None
+
+
+class Table:
+    """
+    A Dalmuti table of `num_players` seats playing `num_games` games. Players `join` before the table is started,
+    and the seats still empty when it starts are given to `bot_class` players.
+    Moves are waited for `turn_timeout` seconds at most, after which the `CPU` policy plays them.
+    """
+    def __init__(
+        self,
+        num_players: int = 4,
+        num_games: int = 1,
+        turn_timeout: float | None = None,
+        bot_class: Type[CPU] = CPU,
+    ) -> None:
+        self.num_players = num_players
+        self.num_games = num_games
+        self.turn_timeout = turn_timeout
+        self.bot_class = bot_class
+        self.players: List[CPU | None] = [None] * num_players
+        self.game_state: GameState | None = None
+        self.scores: Dict[str, int] = {}
+        self.task: asyncio.Task | None = None
+        self._waiting_for: RemotePlayer | None = None
+
+    @property
+    def started(self) -> bool:
+        return self.task is not None
+
+    @property
+    def finished(self) -> bool:
+        return self.task is not None and self.task.done()
+
+    def join(self, name: str, send: Send) -> RemotePlayer:
+        """
+        Seats a remote player in the first empty seat, raises ValueError when the table is full, started or the name is taken.
+        """
+        if self.started:
+            raise ValueError('The table has already started.')
+        if any(player is not None and player.name == name for player in self.players):
+            raise ValueError(f'{name} is already at the table.')
+        if None not in self.players:
+            raise ValueError('The table is full.')
+        player = RemotePlayer(name, send)
+        self.players[self.players.index(None)] = player
+        return player
+
+    def leave(self, player: RemotePlayer) -> None:
+        """
+        Disconnects a remote player. Before the start their seat is freed, afterwards the `CPU` policy plays it.
+        """
+        player.send = None
+        if not self.started and player in self.players:
+            self.players[self.players.index(player)] = None
+        elif self._waiting_for is player:
+            player.messages.put_nowait({'type': 'timeout'})
+
+    def submit(self, player: RemotePlayer, message: Message) -> None:
+        """
+        Hands a message of a remote player to the table, raises ValueError when the table is not waiting for them.
+        """
+        if self._waiting_for is not player:
+            raise ValueError('It is not your turn.')
+        player.messages.put_nowait(message)
+
+    def start(self) -> asyncio.Task:
+        """
+        Fills the empty seats with bots and starts playing in a new task.
+        """
+        if self.task is None:
+            for seat, player in enumerate(self.players):
+                if player is None:
+                    name = f'CPU{seat + 1}'
+                    while any(p is not None and p.name == name for p in self.players):
+                        name += "'"
+                    self.players[seat] = self.bot_class(name)
+            self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def run(self) -> Dict[str, int]:
+        """
+        Plays every game and returns the sum of the ranks of each player.
+        """
+        try:
+            for _ in range(self.num_games):
+                ranking = await self.play_game()
+                for name, rank in ranking.items():
+                    self.scores[name] = self.scores.get(name, 0) + rank
+        finally:
+            for player in self.players:
+                if player is not None:
+                    player.close()
+        await self.broadcast({'type': 'end', 'scores': self.scores})
+        return self.scores
+
+    async def broadcast(self, message: Message) -> None:
+        for player in self.players:
+            if isinstance(player, RemotePlayer) and player.send is not None:
+                try:
+                    await player.send(message)
+                except Exception:
+                    self.leave(player)
+
+    async def send_state(self) -> None:
+        """
+        Sends every remote player the public state of the game with their own hand.
+        """
+        game_state = self.game_state
+        assert game_state is not None
+        state = game_state.round
+        public = {
+            'type': 'state',
+            'players': [player.name for player in game_state.players],
+            'card_counts': dict(game_state.get_player_card_count()),
+            'current_round': game_state.get_current_round(),
+            'last_played': game_state.get_last_played(),
+            'turn': game_state.players[state.seat].name if state is not None and not state.is_over else None,
+        }
+        for player in game_state.players:
+            if isinstance(player, RemotePlayer) and player.send is not None:
+                try:
+                    await player.send({**public, 'hand': player._cards.to_list()})
+                except Exception:
+                    self.leave(player)
+
+    async def _ask(self, player: RemotePlayer, message: Message) -> Message | None:
+        """
+        Asks a remote player for a move, returns None if they are not connected or do not answer in time.
+        """
+        if player.send is None:
+            return None
+        while not player.messages.empty():
+            player.messages.get_nowait()
+        self._waiting_for = player
+        try:
+            await player.send(message)
+            answer = await asyncio.wait_for(player.messages.get(), self.turn_timeout)
+        except Exception:
+            answer = None
+        finally:
+            self._waiting_for = None
+        if answer is None or answer.get('type') == 'timeout':
+            return None
+        return answer
+
+    async def _error(self, player: RemotePlayer, text: str) -> None:
+        if player.send is not None:
+            await player.send({'type': 'error', 'message': text})
+
+    async def give_cards(self, player: CPU, num_of_cards: int) -> List[int]:
+        """
+        Asks a Dalmuti for the cards they give away.
+        """
+        while isinstance(player, RemotePlayer):
+            answer = await self._ask(player, {'type': 'give', 'count': num_of_cards, 'hand': player._cards.to_list()})
+            if answer is None:
+                break
+            cards = answer.get('cards')
+            if (
+                isinstance(cards, list) and len(cards) == num_of_cards
+                and all(isinstance(card, int) and cards.count(card) <= player._cards.count(card) for card in cards)
+            ):
+                for card in cards:
+                    player._cards.remove(card)
+                return cards
+            await self._error(player, f'Give {num_of_cards} cards from your hand.')
+        return player.give_any_cards(num_of_cards)
+
+    async def play_move(self, player: CPU) -> List[int]:
+        """
+        Returns the cards a player plays on their turn, asking remote players until they make a valid play.
+        """
+        game_state = self.game_state
+        assert game_state is not None
+        while isinstance(player, RemotePlayer):
+            answer = await self._ask(player, {'type': 'turn', 'last_played': game_state.get_last_played(), 'hand': player._cards.to_list()})
+            if answer is None:
+                break
+            cards = answer.get('cards', [])
+            if isinstance(cards, list) and all(isinstance(card, int) and 1 <= card <= 13 for card in cards) and player.valid_play(game_state, cards):
+                for card in cards:
+                    player._cards.remove(card)
+                return cards
+            await self._error(player, f'Invalid play {cards}.')
+        # bots and players out of time, yield so a table full of bots does not hold up the others
+        await asyncio.sleep(0)
+        return player.play(game_state)
+
+    async def play_game(self) -> Dict[str, int]:
+        """
+        Deals, trades and plays one game with the rules of `Game.play`, returning the rank of every player.
+        """
+        players: List[CPU] = [player for player in self.players if player is not None]
+        game_state = self.game_state = GameState(players)
+        for player in players:
+            player.num_players = len(players)
+        for i, card in enumerate(get_cards()):
+            players[i % len(players)].add_cards(card)
+        game_state.refresh_card_counts()
+
+        trades = [(players[0], players[-1], 2)]
+        if len(players) > 3:
+            trades.append((players[1], players[-2], 1))
+        for dalmuti, peon, num_of_cards in trades:
+            given = await self.give_cards(dalmuti, num_of_cards)
+            received = peon.give_low_cards(num_of_cards)
+            dalmuti.add_cards(received)
+            peon.add_cards(given)
+
+        state = game_state.start_round()
+        await self.send_state()
+        while not state.is_over:
+            player = players[state.seat]
+            cards = await self.play_move(player)
+            game_state.add_to_current_round(player.name, cards)
+            state.apply(to_move(cards), take_cards=False)
+            await self.broadcast({'type': 'play', 'player': player.name, 'cards': cards})
+            if not state.is_over and not state.trick_length and game_state.get_current_round():
+                game_state.clear_current_round()
+            await self.send_state()
+
+        finished = [players[seat] for seat in state.finished]
+        self.players = list(finished)
+        ranking = {player.name: rank for rank, player in enumerate(finished, 1)}
+        await self.broadcast({'type': 'ranking', 'ranking': ranking})
+        return ranking
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip('fastapi')
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from deckAPI.dalmuti import router
+
+
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestDalmutiRouter:
+    def test_new_table(self):
+        with client() as test_client:
+            response = test_client.post('/dalmuti/tables', json={'num_players': 3, 'num_games': 1})
+            assert response.status_code == 200
+            table = response.json()
+            assert table['num_players'] == 3 and not table['started']
+            assert table['table_id'] in [table['table_id'] for table in test_client.get('/dalmuti/tables').json()]
+            assert test_client.post('/dalmuti/tables', json={'num_players': 2}).status_code == 400
+
+    def test_play(self):
+        with client() as test_client:
+            table_id = test_client.post('/dalmuti/tables', json={'num_players': 3, 'num_games': 1}).json()['table_id']
+            with test_client.websocket_connect(f'/dalmuti/tables/{table_id}/ws?name=Remote') as websocket:
+                websocket.send_json(['start'])
+                assert websocket.receive_json()['type'] == 'error'
+                websocket.send_json({'type': 'start'})
+                turns = 0
+                while True:
+                    message = websocket.receive_json()
+                    if message['type'] == 'give':
+                        websocket.send_json({'cards': message['hand'][:message['count']]})
+                    elif message['type'] == 'turn':
+                        turns += 1
+                        hand = message['hand']
+                        # lead every copy of the first card, pass on the others
+                        websocket.send_json({'cards': [] if message['last_played'] else [hand[0]] * hand.count(hand[0])})
+                    elif message['type'] == 'end':
+                        break
+                assert turns and sorted(message['scores']) == sorted(['Remote', 'CPU2', 'CPU3'])
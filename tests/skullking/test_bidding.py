@@ -0,0 +1,49 @@
+import random
+
+from skullking.bidding import RolloutCPU, best_bet, canonical_hand, rollout_tricks
+from skullking.cards import Card
+from skullking.game import Game
+from skullking.player import CPU
+
+
+def cards(*values):
+    return [Card(value) for value in values]
+
+
+class TestCanonicalHand:
+    def test_plain_suits_are_interchangeable(self):
+        assert canonical_hand(cards('yellow-3', 'green-9', 'pirate')) == canonical_hand(cards('pirate', 'purple-9', 'green-3'))
+        assert canonical_hand(cards('yellow-3', 'black-9')) != canonical_hand(cards('black-3', 'yellow-9'))
+
+
+class TestRollouts:
+    def test_rollout_tricks(self):
+        state = random.getstate()
+        counts = rollout_tricks(cards('skullking', 'pirate', 'black-14'), 4, 30, None, seed=0)
+        assert random.getstate() == state
+        assert len(counts) == 4 and sum(counts) == 30
+        assert rollout_tricks(cards('skullking', 'pirate', 'black-14'), 4, 30, None, seed=0) == counts
+
+    def test_best_bet(self):
+        assert best_bet([0, 0, 10], 2) == 2
+        assert best_bet([10, 0, 0], 2) == 0
+        assert best_bet([1, 8, 1], 2) == 1
+
+    def test_bet_is_cached(self):
+        player = RolloutCPU('Alex', cards('skullking', 'yellow-3'), rollouts=20, seed=0)
+        bet = player.bet(3)
+        assert 0 <= bet <= 2 and player.current_bet == bet
+        player.cards = cards('purple-3', 'skullking')
+        player.rollouts = 0
+        assert player.bet(3) == bet
+        assert len(player._cache) == 1
+
+    def test_workers(self):
+        player = RolloutCPU('Alex', cards('pass'), rollouts=10, workers=2, seed=0)
+        game = Game([], {'Alex': player, 'Bo': CPU('Bo')})
+        try:
+            assert player.bet(2) == 0
+            assert sum(player.trick_counts(2)) == 20
+        finally:
+            game.close()
+        assert player._executor is None
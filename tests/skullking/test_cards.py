@@ -0,0 +1,24 @@
+import pickle
+
+from skullking.cards import Card, available_cards, card_colors, card_numbers, card_suits, cards_by_id, deck, deckDict
+
+
+class TestCard:
+    def test_cards_are_interned(self):
+        assert Card('black-14') is Card('black-14')
+        assert Card(Card('pirate')) is Card('pirate')
+        assert all(card is cards_by_id[card.id] for card in deck)
+
+    def test_card_ids(self):
+        assert len(cards_by_id) == 63
+        assert [card.id for card in available_cards] == list(range(63))
+        assert all(deckDict[card] == card.id for card in available_cards)
+        assert Card('unicorn').id == -1
+
+    def test_card_tables(self):
+        card = Card('purple-3')
+        assert (card_colors[card.id], card_numbers[card.id], card_suits[card.id]) == ('purple', 3, 3)
+        assert (card_colors[Card('skullking').id], card_numbers[Card('skullking').id], card_suits[Card('skullking').id]) == ('skullking', 17, -1)
+
+    def test_cards_stay_interned_when_pickled(self):
+        assert pickle.loads(pickle.dumps(Card('mermaid'))) is Card('mermaid')
@@ -33,3 +33,29 @@ class TestGameWinningCard:
         winning_card = 'black-14'
         cards = [Card('yellow-5'), Card('black-14'), Card('black-12'), Card('pirate'), Card('green-13'), Card('yellow-13'), Card('white_whale')]
         assert Game.winning_card(cards) == winning_card
+
+
+class TestSeatRotation:
+    def game(self, *hands):
+        players = {name: CPU(name, [Card(card)]) for name, card in zip('ABCD', hands)}
+        return Game([], players)
+
+    def test_reorder_players(self):
+        game = self.game('pass', 'pass', 'pass', 'pass')
+        game.reorder_players('C')
+        assert game.playerNames == ['C', 'D', 'A', 'B']
+        assert list(game.playerDict) == ['C', 'D', 'A', 'B']
+        assert game.players[game.seats['C']] is game.playerDict['C']
+
+    def test_winner_starts_next_trick(self):
+        game = self.game('yellow-3', 'yellow-9', 'pass', 'yellow-1')
+        game.reorder_players('B')
+        assert game.play_trick() == 'B'
+        assert game.playerNames[0] == 'B'
+
+    def test_kraken_passes_the_lead(self):
+        game = self.game('yellow-3', 'kraken', 'pirate', 'yellow-1')
+        game.reorder_players('D')
+        # D, A, B plays the kraken, then C starts the next trick
+        assert game.play_trick() == ''
+        assert game.playerNames[0] == 'C'
@@ -0,0 +1,48 @@
+import random
+
+from skullking.cards import Card, deck, special
+from skullking.game import Game
+from skullking.hand import ALL_MASK, BLACK_MASK, SPECIAL_MASK, SUIT_MASKS, card_mask, legal_cards, legal_mask, trump_suit
+from skullking.player import CPU
+
+
+def cards(*values):
+    return [Card(value) for value in values]
+
+
+def reference_valid_cards(hand, trick):
+    # the rule as `Player.valid_cards` first wrote it
+    trump_color = Game.get_trump_color(trick)
+    valid = [card for card in hand if card in special or card.color in ['black', trump_color]]
+    return valid if any(card.color == trump_color for card in hand) else hand
+
+
+class TestMasks:
+    def test_masks_cover_the_cards_once(self):
+        assert sum(SUIT_MASKS) + SPECIAL_MASK == ALL_MASK
+        assert card_mask(cards('black-1', 'black-14')) & ~BLACK_MASK == 0
+
+    def test_trump_suit(self):
+        assert trump_suit(cards('pass', 'green-3', 'yellow-9')) == 2
+        assert trump_suit(cards('pass', 'pirate', 'yellow-9')) == -1
+        assert trump_suit([]) == -1
+
+    def test_legal_mask(self):
+        hand = card_mask(cards('green-3', 'yellow-9', 'black-2', 'kraken'))
+        assert legal_mask(hand, 2) == card_mask(cards('green-3', 'black-2', 'kraken'))
+        assert legal_mask(hand, 3) == hand
+
+
+class TestLegalCards:
+    def test_follow_suit(self):
+        hand = cards('green-3', 'yellow-9', 'black-2', 'pirate', 'yellow-1')
+        assert legal_cards(hand, cards('yellow-5')) == cards('yellow-9', 'black-2', 'pirate', 'yellow-1')
+        assert legal_cards(hand, cards('purple-5')) is hand
+
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            dealt = rng.sample(deck, 17)
+            hand, trick = dealt[:rng.randint(1, 10)], dealt[10:10 + rng.randint(0, 7)]
+            assert legal_cards(hand, trick) == reference_valid_cards(hand, trick)
+            assert CPU('Alex', hand).valid_cards(trick) == reference_valid_cards(hand, trick)
@@ -0,0 +1,111 @@
+import random
+
+from skullking.cards import Card, colors, deck
+from skullking.game import Game
+from skullking.ismcts import ISMCTS, Node, Observation, RoundState, legal_moves
+from skullking.player import CPU
+
+
+def cards(*values):
+    return [Card(value) for value in values]
+
+
+class TestRoundState:
+    def test_tigress_moves(self):
+        assert legal_moves(cards('tigress', 'yellow-3', 'green-5'), cards('yellow-9')) == cards('pass', 'pirate', 'yellow-3')
+        state = RoundState([cards('tigress', 'yellow-3'), cards('yellow-9', 'pass')], 0, [], 0, 2)
+        state.apply(Card('pirate'))
+        assert state.hands[0] == cards('yellow-3')
+
+    def test_cpu_tigress_is_taken_from_the_hand(self):
+        played = set()
+        for seed in range(20):
+            state = RoundState([cards('yellow-3', 'green-5'), cards('tigress', 'pirate')], 1, [], 0, 2)
+            card, taken = state.cpu_move(random.Random(seed))
+            state.apply(card, taken)
+            assert sorted(state.hands[1] + [taken]) == cards('pirate', 'tigress')
+            if taken == Card('tigress'):
+                played.add(card)
+        # a tigress played as a pirate leaves the real pirate in the hand
+        assert played == set(cards('pirate', 'pass'))
+
+    def test_last_card_is_played_as_it_is(self):
+        state = RoundState([cards('tigress'), cards('yellow-9')], 0, [], 0, 1)
+        assert state.legal_moves() == cards('tigress')
+        assert state.cpu_move(random.Random(0)) == (Card('tigress'), Card('tigress'))
+
+    def test_tricks_are_resolved(self):
+        state = RoundState([cards('pirate', 'yellow-3'), cards('yellow-9', 'pass'), cards('kraken', 'green-2')], 1, [], 0, 2)
+        # seat 1 leads, seat 0 wins with the pirate and leads the next trick
+        for card in cards('yellow-9', 'green-2', 'pirate'):
+            state.apply(card)
+        assert state.tricks_won == 1 and state.leader == 0 and not state.trick.cards
+        # the kraken in seat 2 makes seat 0 lead again
+        for card in cards('yellow-3', 'pass', 'kraken'):
+            state.apply(card)
+        assert state.tricks_won == 1 and state.leader == 0 and state.is_over
+
+
+class TestObservation:
+    def test_unseen_cards(self):
+        tricks = [[(1, Card('yellow-9')), (2, Card('green-2')), (0, Card('yellow-3'))]]
+        observation = Observation(cards('mermaid'), tricks, cards('pirate', 'pass'), 3, 2, bet=0)
+        assert observation.leader == 1
+        assert observation.hand_sizes == [1, 0, 0]
+        assert len(observation.unseen) == len(deck) - 6
+        # seat 2 played a green card on yellow
+        assert observation.voids[2] == {colors.index('yellow')}
+
+    def test_determinize(self):
+        tricks = [[(1, Card('yellow-9')), (2, Card('green-2')), (0, Card('yellow-3'))]]
+        observation = Observation(cards('mermaid', 'black-4'), tricks, [], 3, 3, bet=0)
+        state = observation.determinize(random.Random(0))
+        assert [len(hand) for hand in state.hands] == [2, 2, 2]
+        assert not any(card.color == 'yellow' for card in state.hands[2])
+        # no trick won yet, a bet of 0 scores 30 out of -30 to 60
+        assert observation.reward(state) == 60 / 90
+
+
+class TestISMCTS:
+    def game(self, *players):
+        game = Game(deck, {player.name: player for player in players})
+        game.round = 3
+        return game
+
+    def test_plays_legal_cards(self):
+        random.seed(1)
+        for seed in range(5):
+            players = [ISMCTS('Alex', iterations=30, seed=seed), CPU('Bo'), CPU('Cy')]
+            game = self.game(*players)
+            game.deal()
+            bets = game.play_round()
+            assert sum(tricks for _, tricks in bets.values()) <= 3
+            assert not players[0].cards
+
+    def test_subtree_is_reused(self):
+        player = ISMCTS('Alex', cards('pirate', 'yellow-3', 'green-7'), iterations=50, seed=0)
+        opponent = CPU('Bo', cards('yellow-9', 'green-2', 'black-5'))
+        game = self.game(player, opponent)
+        player.bet(2)
+        random.seed(0)
+        game.play_trick()
+        root = player._root
+        assert root is not None and root.visits
+        # the search of the next move starts from the tree of the cards played since
+        played = [card for trick in player._tricks for _, card in trick]
+        child = root.children.setdefault(played[-1], Node())
+        assert player._reused_root(played) is child
+        assert player._reused_root(played[:-1] + cards('kraken')) is not child
+
+    def test_workers(self):
+        player = ISMCTS('Alex', cards('pirate', 'yellow-3'), iterations=20, workers=2, seed=0)
+        opponent = CPU('Bo', cards('yellow-9', 'green-2'))
+        game = self.game(player, opponent)
+        game.round = 2
+        player.bet(2)
+        try:
+            game.play_trick()
+            assert len(player.cards) == 1
+        finally:
+            game.close()
+        assert player._executor is None
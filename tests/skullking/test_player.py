@@ -16,4 +16,16 @@ class TestHumanPlay:
         monkeypatch.setattr('builtins.input', lambda _: next(inputs))
         sam = Human('Sam', [Card('skullking')])
         card = sam.play(current_trick, trump_color='green')
-        assert card == 'skullking'
\ No newline at end of file
+        assert card == 'skullking'
+
+
+class TestCPUHeuristics:
+    def test_try2win_takes_the_lead(self):
+        cpu = CPU('Alex', [Card('yellow-3'), Card('black-2'), Card('yellow-12')])
+        current_trick = {'Sam': Card('yellow-10')}
+        assert cpu.try2win(current_trick, 'yellow') == 'black-2'
+
+    def test_try2lose_stays_under_the_lead(self):
+        cpu = CPU('Alex', [Card('pirate'), Card('yellow-3')])
+        current_trick = {'Sam': Card('black-10')}
+        assert cpu.try2lose(current_trick, 'black') == 'yellow-3'
@@ -0,0 +1,70 @@
+import csv
+import sys
+
+import pytest
+
+from skullking.game import Game
+from skullking.player import CPU
+from skullking.simulate import COLUMNS, ColumnWriter, SimulationResults, run_simulation, simulate_games
+
+PLAYERS = [('Alice', CPU), ('Bob', CPU), ('Charlie', CPU)]
+
+
+class TestRoundScore:
+    def test_round_score(self):
+        assert Game.round_score(2, 2, 5) == 40
+        assert Game.round_score(2, 4, 5) == -20
+        assert Game.round_score(0, 0, 5) == 50
+        assert Game.round_score(0, 1, 5) == -50
+
+
+class TestSimulate:
+    def test_simulate_games(self):
+        columns = simulate_games(PLAYERS, 3, 2, seed=7)
+        assert set(columns) == set(COLUMNS)
+        assert len(columns['game']) == 2 * 10 * len(PLAYERS)
+        assert set(columns['game']) == {3, 4}
+        assert all(tricks <= round_number for tricks, round_number in zip(columns['tricks_won'], columns['round']))
+        # every game can be replayed from its seed alone
+        assert simulate_games(PLAYERS, 4, 1, seed=7)['points'] == columns['points'][len(columns['points']) // 2:]
+
+    def test_results(self):
+        results = SimulationResults([name for name, _ in PLAYERS])
+        results.merge(simulate_games(PLAYERS, 0, 5, seed=0))
+        assert results.num_games == 5
+        assert results.num_tricks == 5 * sum(range(1, 11))
+        assert all(len(results.scores[name]) == 5 for name, _ in PLAYERS)
+        assert all(0 <= accuracy <= 1 for accuracy in results.bet_accuracy('Alice'))
+
+    def test_run_simulation_streams_rows(self, tmp_path):
+        output = str(tmp_path / 'games.csv')
+        results, _ = run_simulation(PLAYERS, 6, output, workers=2, chunk_size=2, seed=1)
+        assert results.num_games == 6
+        with open(output, newline='') as f:
+            rows = list(csv.reader(f))
+        assert tuple(rows[0]) == COLUMNS
+        assert len(rows) == 1 + 6 * 10 * len(PLAYERS)
+
+    def test_csv_writer(self, tmp_path):
+        writer = ColumnWriter(str(tmp_path / 'rows.csv'))
+        writer.write({column: [1] for column in COLUMNS})
+        writer.close()
+        assert (tmp_path / 'rows.csv').read_text().splitlines()[1] == ','.join(['1'] * len(COLUMNS))
+
+    def test_parquet_round_trip(self, tmp_path):
+        pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+
+        output = str(tmp_path / 'games.parquet')
+        run_simulation(PLAYERS, 4, output, workers=1, chunk_size=2, seed=1)
+        table = pyarrow.parquet.read_table(output)
+        assert tuple(table.column_names) == COLUMNS
+        assert table.num_rows == 4 * 10 * len(PLAYERS)
+        assert sorted(set(table.column('game').to_pylist())) == [0, 1, 2, 3]
+
+    def test_parquet_without_pyarrow_fails_before_playing(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        chunks = []
+        with pytest.raises(ImportError, match='.csv'):
+            run_simulation(PLAYERS, 4, str(tmp_path / 'games.parquet'), workers=1, on_chunk=lambda *args: chunks.append(args))
+        assert not chunks
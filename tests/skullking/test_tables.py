@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from skullking.cards import Card
+from skullking.game import Game
+from skullking.player import CPU
+from skullking.tables import (
+    HAND_OFFSETS, MAX_PLAYERS, MAX_ROUND, MIN_PLAYERS, NUM_HANDS, TableCPU, hand_index, hands, play_rounds, trick_probabilities,
+)
+
+
+def ids(*values):
+    return [Card(value).id for value in values]
+
+
+class TestHandIndex:
+    def test_every_hand_has_its_own_index(self):
+        for size in range(1, MAX_ROUND + 1):
+            indices = [hand_index(hand) for group in hands(size).values() for hand in group]
+            assert len(set(indices)) == len(indices)
+            assert HAND_OFFSETS[size - 1] <= min(indices) and max(indices) < HAND_OFFSETS[size]
+
+    def test_order_does_not_matter(self):
+        assert hand_index(ids('pirate', 'yellow-3', 'pirate')) == hand_index(ids('yellow-3', 'pirate', 'pirate'))
+
+    def test_hands_are_grouped_by_suit_renaming(self):
+        groups = hands(1)
+        assert len(groups) == 35
+        assert sorted(len(group) for group in groups.values()).count(3) == 14
+
+
+class TestPlayRounds:
+    def test_escape_never_wins_from_behind(self):
+        rounds = play_rounds(np.array([ids('pass')] * 1000), 2, 1, np.random.default_rng(0))
+        assert not rounds.any()
+
+    def test_skull_king_lead(self):
+        rounds = play_rounds(np.array([ids('skullking', 'black-14')] * 1000), 3, 0, np.random.default_rng(0))
+        assert rounds.max() <= 2
+        assert rounds.mean() > 1.5
+
+    def test_trick_probabilities(self):
+        probabilities = trick_probabilities(1, 4, 2, rollouts=50, seed=0)
+        assert probabilities.shape == (len(hands(1)), 2)
+        assert np.allclose(probabilities.sum(axis=1), 1)
+        assert np.array_equal(probabilities, trick_probabilities(1, 4, 2, rollouts=50, seed=0))
+
+
+class TestTableCPU:
+    def tables(self, tmp_path, probabilities):
+        path = str(tmp_path / 'tables.npy')
+        tables = np.full((MAX_PLAYERS - MIN_PLAYERS + 1, MAX_PLAYERS, NUM_HANDS, MAX_ROUND + 1), np.nan, dtype=np.float16)
+        index = hand_index(ids('pirate', 'yellow-3'))
+        for position, probability in enumerate(probabilities):
+            tables[3 - MIN_PLAYERS, position, index, :3] = probability
+        np.save(path, tables)
+        return path
+
+    def test_bet_by_position(self, tmp_path):
+        path = self.tables(tmp_path, [(0, 0, 1), (0, 1, 0), (1, 0, 0)])
+        player = TableCPU('Alex', [Card('yellow-3'), Card('pirate')], path=path)
+        for position, bet in enumerate((2, 1, 0)):
+            player.position = position
+            assert player.bet(3) == bet and player.current_bet == bet
+        # without a position each number of tricks is as likely, and the bet of 2 scores best on average
+        player.position = None
+        assert player.bet(3) == 2
+
+    def test_later_rounds_bet_like_cpu(self, tmp_path):
+        hand = [Card(card) for card in ('pirate', 'mermaid', 'black-3', 'black-9')]
+        player = TableCPU('Alex', list(hand), path=str(tmp_path / 'missing.npy'))
+        assert player.bet(3) == CPU('Cam', list(hand)).bet(3)
+
+    def test_missing_tables_bet_like_cpu(self, tmp_path):
+        hand = [Card('pirate'), Card('yellow-3')]
+        player = TableCPU('Alex', list(hand), path=str(tmp_path / 'missing.npy'))
+        with pytest.warns(UserWarning, match='skullking tables'):
+            assert player.bet(3) == CPU('Cam', list(hand)).bet(3)
+
+    def test_game_sets_positions(self):
+        players = {name: CPU(name, [Card('pass')]) for name in 'ABC'}
+        game = Game([], players)
+        game.round = 1
+        game.reorder_players('B')
+        game.play_round()
+        assert [players[name].position for name in 'ABC'] == [2, 0, 1]
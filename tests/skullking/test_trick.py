@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+from skullking.cards import Card, deck
+from skullking.game import Game
+from skullking.trick import TrickState, card_ids, resolve_trick, resolve_tricks, trick_win_rates, trump_colors
+
+
+def trick(*cards):
+    return [Card(card) for card in cards]
+
+
+class TestResolveTrick:
+    def test_empty_trick(self):
+        assert resolve_trick([]) is None
+
+    def test_lead_suit_wins(self):
+        assert resolve_trick(trick('pass', 'green-3', 'yellow-14', 'green-9')) == 3
+
+    def test_only_passes(self):
+        assert resolve_trick(trick('pass', 'pass')) == 0
+
+    def test_first_pirate_wins(self):
+        assert resolve_trick(trick('mermaid', 'pirate', 'black-14', 'pirate')) == 1
+
+    def test_mermaid_after_skullking_captures_it(self):
+        assert resolve_trick(trick('pirate', 'skullking', 'mermaid', 'mermaid')) == 2
+        assert resolve_trick(trick('mermaid', 'skullking', 'mermaid')) == 1
+
+    def test_white_whale_highest_number_wins(self):
+        cards = trick('pirate', 'yellow-9', 'white_whale', 'black-3', 'green-9')
+        assert resolve_trick(cards) == 1
+        assert Game.winning_card(cards) == 'yellow-9'
+
+    def test_white_whale_without_numbered_cards(self):
+        assert resolve_trick(trick('skullking', 'white_whale', 'pass')) is None
+
+
+class TestResolveTricks:
+    def test_matches_winning_card_and_trump_color(self):
+        rng = random.Random(0)
+        for num_players in (2, 4, 8):
+            tricks = [rng.sample(deck, num_players) for _ in range(2000)]
+            winners, trumps = resolve_tricks(card_ids(tricks))
+            for cards, winner, trump in zip(tricks, winners, trumps):
+                winning_card = Game.winning_card(cards)
+                assert (cards[winner] if winner >= 0 else None) == winning_card
+                assert trump_colors[trump] == Game.get_trump_color(cards)
+
+    def test_white_whale_and_kraken(self):
+        winners, trumps = resolve_tricks(card_ids([
+            trick('pirate', 'yellow-9', 'white_whale', 'green-9'),
+            trick('skullking', 'white_whale', 'pass', 'pass'),
+            trick('pass', 'green-3', 'kraken', 'pass'),
+        ]))
+        assert winners.tolist() == [1, -1, -1]
+        assert [trump_colors[trump] for trump in trumps] == ['any', 'any', 'green']
+
+    def test_trick_win_rates(self):
+        rates = trick_win_rates(3, num_tricks=5000, rng=np.random.default_rng(0))
+        assert rates.shape == (63, 3)
+        # an escape only wins a trick it leads, when every card of the trick is an escape or a tigress
+        assert (rates[Card('pass').id, 1:] == 0).all()
+        assert resolve_trick([Card('pass'), Card('pass'), Card('pass')]) == 0
+        assert (rates[Card('skullking').id] > 0.5).all()
+
+
+class TestTrickState:
+    def test_matches_resolve_trick(self):
+        rng = random.Random(0)
+        for _ in range(3000):
+            dealt = rng.sample(deck, 9)
+            cards, card = dealt[:rng.randint(0, 7)], dealt[8]
+            state = TrickState(cards)
+            assert state.winner == resolve_trick(cards)
+            assert state.trump == Game.get_trump_color(cards)
+            assert state.takes_lead(card) == (resolve_trick(cards + [card]) == len(cards))
+
+    def test_takes_lead(self):
+        state = TrickState(trick('yellow-5', 'pirate'))
+        assert state.winning_card == 'pirate'
+        assert state.takes_lead(Card('skullking'))
+        assert not state.takes_lead(Card('pirate'))
+        assert not state.takes_lead(Card('black-14'))
+        state.add(Card('skullking'))
+        assert state.winner == 2
+        assert state.takes_lead(Card('mermaid'))
@@ -0,0 +1,20 @@
+from the_great_dalmuti.arena import ArenaResults, play_games
+from the_great_dalmuti.player import CPU, CPU2
+
+
+class TestArena:
+    def test_play_games(self):
+        rank_counts = play_games([('A', CPU), ('B', CPU2), ('C', CPU)], 5, seed=0)
+        assert all(sum(counts) == 5 for counts in rank_counts.values())
+        assert [sum(counts) for counts in zip(*rank_counts.values())] == [5, 5, 5]
+
+    def test_merge(self):
+        results = ArenaResults(['A', 'B'])
+        results.merge({'A': [3, 1], 'B': [1, 3]})
+        results.merge({'A': [2, 2], 'B': [2, 2]})
+        assert results.num_games == 8
+        assert results.rank_counts == {'A': [5, 3], 'B': [3, 5]}
+        mean, half_width = results.mean_rank('A')
+        assert mean == 1.375 and half_width > 0
+        share, low, high = results.rank_share('B', 2)
+        assert share == 0.625 and low < share < high
@@ -0,0 +1,37 @@
+import random
+import numpy as np
+from the_great_dalmuti.batch import deal, play, random_deal, simulate, trade
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.player import CPU
+
+
+class TestBatch:
+    def test_deal(self):
+        hands = random_deal(10, 4, np.random.default_rng(0))
+        assert hands.shape == (10, 4, 13)
+        assert (hands.sum(axis=(1, 2)) == 80).all()
+        assert (hands.sum(axis=1)[:, :12] == np.arange(1, 13)).all()
+
+    def test_trade(self):
+        hands = deal([0, 1, 2], 4)
+        before = hands.copy()
+        trade(hands)
+        assert (hands.sum(axis=1) == before.sum(axis=1)).all()
+        assert (hands.sum(axis=2) == before.sum(axis=2)).all()
+
+    def test_matches_game(self):
+        for num_players in (3, 4, 6):
+            seeds = list(range(30))
+            ranks = simulate(seeds, num_players)
+            for seed, seat_ranks in zip(seeds, ranks):
+                game = Game([CPU(f'P{i}') for i in range(num_players)], show_print=False)
+                random.seed(seed)
+                ranking = game.play()
+                assert [ranking[f'P{i}'] for i in range(num_players)] == seat_ranks.tolist()
+
+    def test_play_does_not_modify_hands(self):
+        hands = deal([5], 4)
+        before = hands.copy()
+        ranks = play(hands)
+        assert (hands == before).all()
+        assert sorted(ranks[0]) == [1, 2, 3, 4]
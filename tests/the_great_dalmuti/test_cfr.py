@@ -0,0 +1,55 @@
+import numpy as np
+from the_great_dalmuti.cfr import (
+    HIGH, LOW, PASS_ACTION, CFRPolicy, CFRTrainer, abstract_moves, info_index, info_key, load_policy, regret_matching,
+)
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import PASS, Move
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import RoundState
+
+
+class TestCFR:
+    def test_abstract_moves(self):
+        state = RoundState([Hand([2, 5, 5, 9, 13]), Hand([1])])
+        assert abstract_moves(state) == [None, Move(9, 1, 0), Move(2, 1, 0)]
+        state = RoundState([Hand([2, 5, 5, 9, 13]), Hand([1])], last_seat=1, trick_rank=10, trick_length=2)
+        assert abstract_moves(state) == [PASS, Move(9, 2, 1), Move(2, 2, 1)]
+        state = RoundState([Hand([11, 12]), Hand([1])], last_seat=1, trick_rank=10, trick_length=1)
+        assert abstract_moves(state) == [PASS, None, None]
+
+    def test_regret_matching(self):
+        assert regret_matching([1.0, -2.0, 3.0], [True, True, True]) == [0.25, 0.0, 0.75]
+        assert regret_matching([1.0, -2.0, 3.0], [False, True, False]) == [0.0, 1.0, 0.0]
+        assert regret_matching([0.0, -1.0, 0.0], [True, True, False]) == [0.5, 0.5, 0.0]
+
+    def test_train_and_checkpoint(self, tmp_path):
+        path = str(tmp_path / 'cfr.npz')
+        trainer = CFRTrainer(3, table_size=1 << 10, seed=0)
+        try:
+            trainer.train(20, batch_size=10, checkpoint=path)
+            assert trainer.iterations == 20 and trainer.strategy_sum.any() and trainer.regrets.any()
+            strategy = trainer.average_strategy()
+            assert np.allclose(strategy.sum(axis=1), 1)
+        finally:
+            trainer.close()
+
+        trainer = CFRTrainer.load(path, seed=1)
+        try:
+            assert trainer.iterations == 20 and np.allclose(trainer.average_strategy(), strategy)
+            trainer.train(4, workers=2, batch_size=2)
+            assert trainer.iterations == 24
+        finally:
+            trainer.close()
+        assert np.allclose(load_policy(path), strategy)
+
+    def test_policy_plays(self):
+        policy = np.zeros((1 << 10, 3))
+        policy[:, LOW] = 1
+        player = CFRPolicy('X', policy)
+        game = Game([player, CPU('A'), CPU('B')], show_print=False)
+        assert sorted(game.play().values()) == [1, 2, 3]
+
+        state = RoundState([Hand([2, 5, 5, 9, 13]), Hand([1])])
+        key = info_key(state, abstract_moves(state), [5, 1])
+        assert 0 <= info_index(key, 1 << 10) < 1 << 10 and policy[info_index(key, 1 << 10), PASS_ACTION] == 0
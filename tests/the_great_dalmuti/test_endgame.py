@@ -0,0 +1,43 @@
+from the_great_dalmuti.endgame import EndgameCPU, EndgameSolver, TranspositionTable, known_state
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import Move
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import RoundState
+
+
+class TestEndgame:
+    def test_table_forgets_least_recently_used(self):
+        table = TranspositionTable(max_entries=2)
+        table.put('a', (0,))
+        table.put('b', (1,))
+        assert table.get('a') == (0,)
+        table.put('c', (2,))
+        assert len(table) == 2 and table.get('b') is None and table.get('a') == (0,)
+
+    def test_solve(self):
+        # only leading the pair of 2s keeps seat 1 from answering and going out first
+        state = RoundState([Hand([2, 2, 9]), Hand([1, 5])], seat=0)
+        solver = EndgameSolver()
+        assert solver.best_move(state) == Move(2, 2, 0)
+        assert solver.solve(state) == (0, 1)
+        assert dict(solver.move_values(state))[Move(9, 1, 0)] == 1
+        assert len(solver.table)
+
+    def test_known_state(self):
+        players = [CPU('A'), CPU('B'), CPU('C')]
+        players[0].add_cards([4, 9])
+        players[1].add_cards([5])
+        players[2].add_cards([8])
+        game_state = GameState(players)
+        game_state.add_to_current_round('C', [10])
+        state = known_state(game_state, players[0], {'B': [5], 'C': [8]})
+        assert state.seat == 0 and state.last_seat == 2 and state.trick_rank == 10
+        # the 4 cannot be beaten and keeps the lead, the 9 lets seat 1 go out first
+        assert EndgameSolver().best_move(state) == Move(4, 1, 0)
+
+    def test_plays_full_games(self):
+        game = Game([EndgameCPU('E', seed=0), CPU('A'), CPU('B'), CPU('C')], show_print=False)
+        for _ in range(2):
+            assert sorted(game.play().values()) == [1, 2, 3, 4]
@@ -0,0 +1,52 @@
+import numpy as np
+from the_great_dalmuti.env import ACTION_INDEX, ACTIONS, DalmutiEnv, SubprocVecEnv, legal_mask
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import moves_against
+
+
+def random_actions(observations, rng):
+    return np.array([rng.choice(np.flatnonzero(mask)) for mask in observations['action_mask']])
+
+
+class TestEnv:
+    def test_mask_matches_moves_against(self):
+        rng = np.random.default_rng(0)
+        env = DalmutiEnv(16, 4, seed=0)
+        observations = env.reset()
+        for _ in range(100):
+            for hand, (rank, length), mask in zip(observations['hand'], observations['last_play'], observations['action_mask']):
+                moves = moves_against(Hand(card for card in range(1, 14) for _ in range(hand[card - 1])), rank, length)
+                assert sorted(ACTION_INDEX[move] for move in moves) == np.flatnonzero(mask).tolist()
+            observations, *_ = env.step(random_actions(observations, rng))
+
+    def test_wilds_alone(self):
+        hands = np.zeros((1, 13), dtype=np.int16)
+        hands[0, 12] = 2
+        mask = legal_mask(hands, np.array([3]), np.array([2]))
+        assert [ACTIONS[i] for i in np.flatnonzero(mask[0])] == [ACTIONS[0], ACTIONS[-1]]
+
+    def test_games_end_and_restart(self):
+        rng = np.random.default_rng(1)
+        env = DalmutiEnv(8, 5, seed=1)
+        observations = env.reset()
+        assert observations['card_counts'].sum(axis=1).tolist() == [80] * 8
+        games = 0
+        for _ in range(400):
+            observations, rewards, dones, info = env.step(random_actions(observations, rng))
+            for ranks, reward in zip(info['ranks'][dones], rewards[dones]):
+                assert sorted(ranks) == [1, 2, 3, 4, 5]
+                assert reward[ranks.argmin()] == 1 and reward[ranks.argmax()] == 0
+            assert not rewards[~dones].any()
+            games += dones.sum()
+        assert games
+        assert (observations['card_counts'].sum(axis=1) + observations['played'].sum(axis=1) == 80).all()
+
+    def test_subproc_vec_env(self):
+        env = SubprocVecEnv(2, 3, seed=0)
+        try:
+            observations = env.reset()
+            assert observations['hand'].shape == (6, 13)
+            observations, rewards, dones, _ = env.step(random_actions(observations, np.random.default_rng(0)))
+            assert rewards.shape == (6, 4) and dones.shape == (6,)
+        finally:
+            env.close()
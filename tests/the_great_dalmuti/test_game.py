@@ -0,0 +1,20 @@
+from the_great_dalmuti.game import Game, next_seat
+from the_great_dalmuti.player import CPU, CPU2
+
+
+class TestGame:
+    def test_next_seat(self):
+        assert next_seat(0b1111, 0) == 1
+        assert next_seat(0b1111, 3) == 0
+        assert next_seat(0b1001, 0) == 3
+        assert next_seat(0b0110, 2) == 1
+        assert next_seat(0b0100, 2) == 2
+
+    def test_play(self):
+        players = [CPU('A'), CPU2('B'), CPU('C'), CPU2('D'), CPU('E')]
+        game = Game(players, show_print=False)
+        for _ in range(5):
+            ranking = game.play()
+            assert sorted(ranking.values()) == [1, 2, 3, 4, 5]
+            assert [player.name for player in game.players] == sorted(ranking, key=ranking.get)
+            assert not any(player.has_cards() for player in game.players)
@@ -0,0 +1,29 @@
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.player import CPU
+
+
+class TestGameState:
+    def test_incremental_public_state(self):
+        player1 = CPU('A')
+        player2 = CPU('B')
+        player1.add_cards([3, 3, 7, 9, 13])
+        player2.add_cards([2, 2, 5, 8])
+        game_state = GameState([player1, player2])
+        assert game_state.get_player_card_count() == {'A': 5, 'B': 4}
+
+        game_state.add_to_current_round('A', player1.play_any())
+        snapshot = game_state.snapshot()
+        assert snapshot is game_state.snapshot()
+        assert snapshot.card_counts == {'A': 4, 'B': 4} == {p.name: p.num_cards for p in game_state.players}
+        assert snapshot.last_played == [9] and snapshot.last_player == 'A' and snapshot.pass_streak == 0
+
+        game_state.add_to_current_round('B', player2.play(game_state))
+        game_state.add_to_current_round('A', [])
+        snapshot = game_state.snapshot()
+        assert snapshot.last_played == [8] and snapshot.last_player == 'B' and snapshot.pass_streak == 1
+        assert snapshot.played_cards[7] == 1 and snapshot.played_cards[8] == 1 and sum(snapshot.played_cards) == 2
+
+        game_state.clear_current_round()
+        snapshot = game_state.snapshot()
+        assert snapshot.last_played is None and snapshot.last_player is None and snapshot.pass_streak == 0
+        assert sum(snapshot.played_cards) == 2
@@ -0,0 +1,39 @@
+import pytest
+from the_great_dalmuti.hand import Hand
+
+
+class TestHand:
+    def test_behaves_like_sorted_list(self):
+        hand = Hand([5, 13, 2, 5, 1])
+        assert hand == [1, 2, 5, 5, 13]
+        assert len(hand) == 5 and hand[0] == 1 and hand[-1] == 13 and hand[3] == 5
+        assert repr(hand) == '[1, 2, 5, 5, 13]'
+        assert 5 in hand and 7 not in hand
+        assert hand.ranks() == [1, 2, 5]
+
+    def test_counts(self):
+        hand = Hand([12, 12, 13, 13, 3])
+        assert hand.count(12) == 2 and hand.count(4) == 0 and hand.num_wilds == 2
+        hand.add(4, 3)
+        assert hand.count(4) == 3 and len(hand) == 8
+        assert hand.take(4, 2) == [4, 4]
+        assert hand.take_all(12) == [12, 12]
+        hand.remove(13)
+        assert hand.num_wilds == 1 and hand == [3, 4, 13]
+        with pytest.raises(ValueError):
+            hand.remove(12)
+
+    def test_pop(self):
+        hand = Hand([7, 1, 13])
+        assert hand.pop(0) == 1
+        assert hand.pop() == 13
+        assert hand == [7]
+        copy = hand.copy()
+        copy.add(2)
+        assert hand == [7] and copy == [2, 7]
+
+    def test_encode(self):
+        assert Hand().encode() == 0
+        assert Hand([1, 1, 3]).encode() == 2 | 1 << 8
+        assert Hand([12] * 12 + [13, 13]).encode() == 12 << 44 | 2 << 48
+        assert Hand([5, 2]).encode() == Hand([2, 5]).encode() != Hand([2, 6]).encode()
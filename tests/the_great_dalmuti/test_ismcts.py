@@ -0,0 +1,77 @@
+import random
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.ismcts import ISMCTS, Node, search
+from the_great_dalmuti.player import CPU
+from the_great_dalmuti.round_state import Observation, RoundState, greedy_move, observe
+
+
+class TestISMCTS:
+    def test_observe(self):
+        players = [CPU('A'), CPU('B'), CPU('C')]
+        players[0].add_cards([1, 2, 2, 5, 13])
+        players[1].add_cards([3, 3, 4])
+        players[2].add_cards([6, 6, 7, 7])
+        game_state = GameState(players)
+        game_state.add_to_current_round('B', players[1].play_any())
+        game_state.add_to_current_round('C', [])
+
+        observation = observe(game_state, players[0])
+        assert observation.seat == 0 and observation.card_counts == [5, 2, 4]
+        assert observation.state.trick_rank == 4 and observation.state.last_seat == 1
+        assert len(observation.unseen) == 80 - 5 - 1
+        state = observation.determinize(random.Random(0))
+        assert [len(hand) for hand in state.hands] == [5, 2, 4]
+        assert state.hands[0] == [1, 2, 2, 5, 13]
+        assert 4 not in state.legal_moves()[-1].cards
+
+    def test_greedy_round(self):
+        rng = random.Random(0)
+        cards = [card for card in range(1, 13) for _ in range(card)] + [13, 13]
+        rng.shuffle(cards)
+        state = RoundState([Hand(cards[i::4]) for i in range(4)])
+        while not state.is_over:
+            move = greedy_move(state)
+            assert move in state.legal_moves()
+            state.apply(move)
+        assert sorted(state.ranks()) == [1, 2, 3, 4]
+
+    def test_search_visits(self):
+        state = RoundState([Hand([1, 5]), Hand([3]), Hand([4, 4])])
+        observation = Observation(state, 0, [3, 4, 4], [2, 1, 2])
+        root = Node(-1)
+        search(observation, root, random.Random(0), iterations=50)
+        assert root.visits == 50
+        assert sum(child.visits for child in root.children.values()) == 50
+
+    def test_search_and_play(self):
+        players = [ISMCTS('I', iterations=20, seed=0), CPU('A'), CPU('B'), CPU('C')]
+        game = Game(players, show_print=False)
+        for _ in range(2):
+            ranking = game.play()
+            assert sorted(ranking.values()) == [1, 2, 3, 4]
+
+    def test_game_closes_pool(self):
+        player = ISMCTS('I', iterations=10, workers=2, seed=0)
+        game = Game([player, CPU('A'), CPU('B')], show_print=False)
+        try:
+            game.play()
+            assert player._executor is not None
+        finally:
+            game.close()
+        assert player._executor is None
+
+    def test_tree_reuse(self):
+        player = ISMCTS('I', iterations=50, seed=0)
+        players = [player, CPU('A'), CPU('B')]
+        player.add_cards([2, 3, 3, 9, 12])
+        players[1].add_cards([5, 6, 6, 7])
+        players[2].add_cards([4, 8, 10, 11])
+        game_state = GameState(players)
+        cards = player.play(game_state)
+        game_state.add_to_current_round(player.name, cards)
+        assert player._root is not None and player._root.visits > 0
+        assert player._reused_root(game_state) is player._root
+        game_state.refresh_card_counts()
+        assert player._reused_root(game_state) is not player._root
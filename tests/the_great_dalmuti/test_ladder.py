@@ -0,0 +1,42 @@
+from the_great_dalmuti.ladder import MU, SIGMA, Rating, RatingStore, choose_table, play_match, rate, run_ladder
+from the_great_dalmuti.player import CPU, CPU2
+
+
+class TestLadder:
+    def test_rate(self):
+        first, middle, last = rate([Rating(), Rating(), Rating()], [1, 2, 3])
+        assert first.mu > MU > last.mu and abs(middle.mu - MU) < 1e-9
+        assert all(rating.sigma < SIGMA for rating in (first, middle, last))
+        # beating a much stronger player moves the rating more than beating a weaker one
+        upset, _ = rate([Rating(20, 3), Rating(30, 3)], [1, 2])
+        expected, _ = rate([Rating(30, 3), Rating(20, 3)], [1, 2])
+        assert upset.mu - 20 > expected.mu - 30 > 0
+
+    def test_store(self, tmp_path):
+        path = str(tmp_path / 'ladder.db')
+        store = RatingStore(path)
+        store.register(['a', 'b', 'c'])
+        updated = store.record(['b', 'a', 'c'])
+        store.close()
+
+        store = RatingStore(path)
+        store.register(['a', 'd'])
+        ratings = store.ratings()
+        assert ratings['b'] == updated['b'] and ratings['d'] == Rating()
+        assert store.games_played() == {'a': 1, 'b': 1, 'c': 1, 'd': 0}
+        store.close()
+
+    def test_choose_table(self):
+        ratings = {'a': Rating(25, 1), 'b': Rating(30, 5), 'c': Rating(20, 2), 'd': Rating(29, 1)}
+        assert choose_table(ratings, 3) == ['b', 'd', 'a']
+        assert choose_table(ratings, 2, busy={'b': 1}) == ['c', 'a']
+
+    def test_run_ladder(self, tmp_path):
+        orders = play_match([('cpu', CPU), ('cpu2', CPU2), ('other', CPU)], 3, seed=0)
+        assert len(orders) == 3 and all(sorted(order) == ['cpu', 'cpu2', 'other'] for order in orders)
+
+        store = RatingStore(str(tmp_path / 'ladder.db'))
+        ratings = run_ladder(store, {'cpu': CPU, 'cpu2': CPU2}, num_matches=2, games_per_match=2, workers=1, seed=0)
+        assert set(ratings) == {'cpu', 'cpu2'} and all(rating.sigma < SIGMA for rating in ratings.values())
+        assert store.games_played() == {'cpu': 4, 'cpu2': 4}
+        store.close()
@@ -0,0 +1,50 @@
+import random
+from the_great_dalmuti.game_state import GameState
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.moves import PASS, Move, legal_moves, play_key
+from the_great_dalmuti.player import CPU
+
+
+def brute_force_moves(player, game_state):
+    moves = set()
+    for rank in range(1, 14):
+        for count in range(1, 15):
+            for wilds in range(3):
+                move = Move(rank, count, wilds)
+                if (rank == 13) != (count == wilds) or wilds > count:
+                    continue
+                if player.valid_play(game_state, move.cards):
+                    moves.add(move)
+    return moves
+
+
+class TestMoves:
+    def test_play_key(self):
+        assert play_key(None) == (0, 0)
+        assert play_key([13, 13]) == (13, 2)
+        assert play_key([13, 7, 7]) == (7, 3)
+        assert Move(7, 3, 1).cards == [7, 7, 13]
+
+    def test_legal_moves(self):
+        hand = Hand([2, 2, 5, 13])
+        assert legal_moves(hand, [6, 6]) == [PASS, Move(2, 2, 0), Move(2, 2, 1), Move(5, 2, 1)]
+        assert legal_moves(hand, [3, 3, 3]) == [PASS, Move(2, 3, 1)]
+        assert legal_moves(hand, [1]) == [PASS, Move(13, 1, 1)]
+        assert legal_moves(hand) == [Move(2, 1, 0), Move(2, 2, 1), Move(2, 2, 0), Move(2, 3, 1), Move(5, 1, 0), Move(5, 2, 1), Move(13, 1, 1)]
+
+    def test_matches_valid_play(self, capsys):
+        rng = random.Random(0)
+        deck = [card for card in range(1, 13) for _ in range(card)] + [13, 13]
+        for _ in range(40):
+            player = CPU('Test')
+            player.add_cards(rng.sample(deck, 20))
+            game_state = GameState([player])
+            last_played = rng.choice([None, [13], [12, 12], [8, 8, 13], [6, 6, 6], [11] * 4])
+            if last_played:
+                game_state.add_to_current_round('Other', last_played)
+            moves = legal_moves(player._cards, last_played)
+            assert len(moves) == len(set(moves))
+            expected = brute_force_moves(player, game_state)
+            if last_played:
+                expected.add(PASS)
+            assert set(moves) == expected
@@ -0,0 +1,32 @@
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.player import CPU, CPU2
+from the_great_dalmuti.replay import PLAY, Recorder, iter_actions, read_games, replay
+
+
+class TestReplay:
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / 'games.dlm')
+        rankings = []
+        with Recorder(path) as recorder:
+            game = Game([CPU('A'), CPU2('B'), CPU('C'), CPU2('D')], show_print=False, recorder=recorder)
+            for _ in range(3):
+                seat_names = [player.name for player in game.players]
+                ranking = game.play()
+                rankings.append((seat_names, ranking))
+
+        records = list(read_games(path))
+        assert len(records) == 3
+        for record, (seat_names, ranking) in zip(records, rankings):
+            assert record.names == seat_names
+            assert [record.names[seat] for seat in record.finishing_seats] == sorted(ranking, key=ranking.get)
+            actions = list(iter_actions(record))
+            assert len(record.actions) < 3 * len(actions)
+
+            state = replay(record)
+            assert state.actions == len(actions)
+            assert not any(state.hands)
+
+            first_play = next(i for i, action in enumerate(actions) if action.kind == PLAY)
+            state = replay(record, first_play + 1)
+            assert state.current_round == [(actions[first_play].seat, actions[first_play].cards)]
+            assert sum(len(hand) for hand in state.hands) == 80 - len(actions[first_play].cards)
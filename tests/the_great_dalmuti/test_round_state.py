@@ -0,0 +1,33 @@
+import random
+from the_great_dalmuti.game import get_cards
+from the_great_dalmuti.hand import Hand
+from the_great_dalmuti.round_state import RoundState, random_move
+
+
+def fields(state):
+    return ([hand.to_list() for hand in state.hands], state.seat, state.active, state.last_seat,
+            state.trick_rank, state.trick_length, state.finished.copy())
+
+
+class TestRoundState:
+    def test_apply_and_undo(self):
+        rng = random.Random(0)
+        cards = get_cards(shuffle_cards=False)
+        rng.shuffle(cards)
+        state = RoundState([Hand(cards[i::4]) for i in range(4)])
+        seen = [fields(state)]
+        while not state.is_over:
+            state.apply(random_move(state, rng))
+            seen.append(fields(state))
+        assert sorted(state.ranks()) == [1, 2, 3, 4]
+        while len(seen) > 1:
+            seen.pop()
+            state.undo()
+            assert fields(state) == seen[-1]
+
+    def test_clone(self):
+        state = RoundState([Hand([1, 5, 5]), Hand([3, 13])])
+        clone = state.clone()
+        clone.apply(clone.legal_moves()[0])
+        assert fields(state) == ([[1, 5, 5], [3, 13]], 0, 3, -1, 0, 0, [])
+        assert fields(clone) != fields(state)
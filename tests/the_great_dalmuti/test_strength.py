@@ -0,0 +1,68 @@
+import numpy as np
+from the_great_dalmuti.game import Game
+from the_great_dalmuti.player import CPU
+import pytest
+
+from the_great_dalmuti import strength as strength_module
+from the_great_dalmuti.strength import HandStrength, StrengthCPU, build_strength, cards_to_give, simulate_ranks
+
+
+class TestStrength:
+    def test_simulate_ranks(self):
+        counts, ranks = simulate_ranks(50, 4, np.random.default_rng(0))
+        assert counts.shape == (200, 13) and ranks.shape == (200,)
+        assert (counts.sum(axis=1) == 20).all() and sorted(set(ranks.tolist())) == [1, 2, 3, 4]
+
+    def test_expected_rank(self, tmp_path):
+        strength = HandStrength(num_games=2000, seed=0)
+        strength.fit(4)
+        strong = [2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 0, 0, 2]
+        weak = [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 4, 4, 0]
+        assert strength.expected_rank(strong, 4) < strength.expected_rank(weak, 4)
+        assert strength.expected_rank(strong, 4) == strength.expected_rank(tuple(strong), 4)
+        assert len(strength._cache) == 2
+
+        path = str(tmp_path / 'strength.npz')
+        strength.save(path)
+        loaded = HandStrength()
+        loaded.load(path)
+        assert np.allclose(loaded.coefficients[4], strength.coefficients[4])
+
+    def test_cards_to_give(self):
+        assert cards_to_give([1, 0, 2] + [0] * 10, 2) == [(1, 3), (3, 3)]
+
+    def test_strength_cpu(self):
+        strength = HandStrength(num_games=2000, seed=0)
+        strength.fit(4)
+        player = StrengthCPU('S', strength)
+        game = Game([player, CPU('A'), CPU('B'), CPU('C')], show_print=False)
+        assert sorted(game.play().values()) == [1, 2, 3, 4]
+        player.add_cards([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 11, 11, 11, 12, 12, 12, 12, 12, 13])
+        given = player.give_any_cards(2)
+        assert 13 not in given and len(given) == 2 and player.num_cards == 18
+
+    def test_strength_cpu_uses_the_table_size(self):
+        strength = HandStrength(num_games=500, seed=0)
+        strength.fit(4)
+        strength.fit(10)
+        player = StrengthCPU('S', strength)
+        players = [player] + [CPU(f'C{i}') for i in range(9)]
+        game = Game(players, show_print=False)
+        game.play()
+        assert player.num_players == 10
+        # with 10 players some hands have 8 cards, which used to read as 10 players and others as 4
+        player.add_cards([1, 2, 3, 4, 5, 6, 12, 12])
+        player.give_any_cards(2)
+        assert all(key[0] == 10 for key in strength._cache)
+
+    def test_build_and_load_default(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'cache' / 'strength.npz')
+        build_strength(path, [4], num_games=200)
+        monkeypatch.setattr(strength_module, 'DEFAULT_PATH', path)
+        monkeypatch.setattr(strength_module, '_default_strength', None)
+        assert list(strength_module.default_strength().coefficients) == [4]
+
+        monkeypatch.setattr(strength_module, 'DEFAULT_PATH', str(tmp_path / 'missing.npz'))
+        monkeypatch.setattr(strength_module, '_default_strength', None)
+        with pytest.warns(UserWarning, match='dalmuti strength'):
+            strength_module.default_strength()
@@ -0,0 +1,77 @@
+import asyncio
+from the_great_dalmuti.table import Table
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestTable:
+    def test_bots_only(self):
+        async def play():
+            tables = [Table(num_players=4, num_games=2) for _ in range(20)]
+            results = await asyncio.gather(*(table.start() for table in tables))
+            return results
+
+        for scores in run(play()):
+            assert len(scores) == 4 and sum(scores.values()) == 2 * (1 + 2 + 3 + 4)
+
+    def test_remote_player(self):
+        async def play():
+            table = Table(num_players=3, num_games=1)
+            received = []
+            errors = []
+
+            async def send(message):
+                received.append(message)
+                if message['type'] == 'error':
+                    errors.append(message)
+                elif message['type'] == 'give':
+                    asyncio.get_running_loop().call_soon(table.submit, player, {'cards': message['hand'][:message['count']]})
+                elif message['type'] == 'turn':
+                    hand, last_played = message['hand'], message['last_played']
+                    if last_played:
+                        answer = {'cards': []}
+                    else:
+                        # the first lead asks for one card too many, the table sends an error and asks again
+                        count = hand.count(hand[0]) + (not errors)
+                        answer = {'cards': [hand[0]] * count}
+                    asyncio.get_running_loop().call_soon(table.submit, player, answer)
+
+            player = table.join('Remote', send)
+            scores = await table.start()
+            return player, received, scores
+
+        player, received, scores = run(play())
+        assert any(message['type'] == 'error' for message in received)
+        assert sorted(scores) == sorted(['Remote', 'CPU2', 'CPU3'])
+        types = {message['type'] for message in received}
+        assert {'turn', 'state', 'play', 'ranking', 'end'} <= types
+        assert any(message['type'] == 'play' and message['player'] == 'Remote' and message['cards'] for message in received)
+        assert all(message['type'] != 'state' or len(message['hand']) == message['card_counts']['Remote'] for message in received)
+
+    def test_join_and_timeout(self):
+        async def play():
+            table = Table(num_players=3, turn_timeout=0.01)
+
+            async def send(message):
+                pass
+
+            table.join('A', send)
+            try:
+                table.join('A', send)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError('duplicate names are refused')
+            table.join('B', send)
+            table.join('C', send)
+            try:
+                table.join('D', send)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError('full tables are refused')
+            return await table.start()
+
+        assert sorted(run(play()).values()) == [1, 2, 3]